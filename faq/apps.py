@@ -6,4 +6,7 @@ class FaqConfig(AppConfig):
     name = 'faq'
 
     def ready(self):
-        import faq.signals 
\ No newline at end of file
+        import faq.signals
+        from django.core import checks
+        from faq_common.upload_guard import check_middleware
+        checks.register(check_middleware, checks.Tags.security) 
\ No newline at end of file
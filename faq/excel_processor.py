@@ -1,91 +1,221 @@
 import os
-import shutil
-from django.core.files import File
+import itertools
+from decimal import Decimal
+from django.db import transaction
 import pandas as pd
+from openpyxl import load_workbook
+from faq_common.media_store import media_storage
 from .models import Menu, Store
+from .menu_price import patch_menu_price
 import logging
-import json  # JSON 변환을 위한 import
-from django.conf import settings
 
 # 디버깅을 위한 로거 설정
 logger = logging.getLogger('faq')
 
-def process_excel_and_save_to_db(file_path, store_id):
+# 엑셀 열 이름 → Menu 필드 ('사진' 열은 선택 항목)
+MENU_COLUMNS = {
+    '메뉴명': 'name',
+    '가격': 'price',
+    '카테고리': 'category',
+    '간단한 소개(50자 이내)': 'menu_introduction',
+    '맵기': 'spicy',
+    '알레르기 유발물질': 'allergy',
+    '원산지': 'origin',
+}
+IMAGE_COLUMN = '사진'
+
+# 엑셀 시트에서 데이터가 시작되는 행 번호 (첫 번째 행은 제목, 두 번째 행은 헤더)
+FIRST_DATA_ROW = 3
+
+# 한 번에 읽어 검증하고 bulk_create로 저장하는 행 수
+BULK_BATCH_SIZE = 500
+
+# Menu.price(max_digits=10, decimal_places=2)에 저장할 수 있는 최대값
+MAX_PRICE = 10 ** 8
+
+SPICY_LEVELS = {code for code, _ in Menu.SPICY_CATEGORIES}
+
+# 숫자로 읽을 수 있는 셀 값 (1, 1.0, 1e3 등)
+NUMBER_PATTERN = r'[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?'
+
+
+def _text_column(df, column):
     """
-    엑셀 파일을 읽어와서 DB에 저장하는 함수.
-    엑셀 파일에 이미지 경로가 포함되어 있다면 해당 이미지를 /media/menu_images/로 복사하여 DB에 저장.
+    열을 문자열로 변환 (없는 열과 빈 값은 빈 문자열, 1.0처럼 읽힌 정수는 1로).
     """
-    try:
-        # 엑셀 파일을 읽어오기 (첫 번째 시트를 기준으로, 첫 번째 행은 헤더로 처리)
+    if column not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    values = df[column].astype(object)
+    text = values.where(values.notna(), '').astype(str).str.strip()
+    # 숫자 모양의 값만 숫자로 변환 (메뉴명 같은 문자열 셀마다 숫자 변환을 시도하지 않음)
+    candidates = text.str.fullmatch(NUMBER_PATTERN)
+    if candidates.any():
+        numeric = pd.to_numeric(text[candidates], errors='coerce')
+        integral = numeric[numeric == numeric.round()]
+        text[integral.index] = integral.astype('int64').astype(str)
+    return text
+
+
+def validate_menu_rows(df, first_row_number=FIRST_DATA_ROW):
+    """
+    엑셀 데이터를 열 단위로 검증/변환하여 (저장할 행 DataFrame, 오류 목록)을 반환.
+    - 메뉴명이 없는 행은 건너뛴다.
+    - 가격은 쉼표와 '원'을 제거하고 숫자로 변환하며, 변환할 수 없거나 범위를 벗어나면 오류로 기록하고 건너뛴다.
+    - 맵기는 0~5 중 하나로 변환하며, 비어 있거나 올바르지 않으면 0으로 저장한다.
+    오류의 row는 엑셀 시트의 행 번호 (df의 첫 행이 first_row_number).
+    """
+    missing = [column for column in ('메뉴명', '가격') if column not in df.columns]
+    if missing:
+        raise ValueError(f"엑셀 파일에 필수 열이 없습니다: {', '.join(missing)}")
+
+    rows = pd.DataFrame({field: _text_column(df, column) for column, field in MENU_COLUMNS.items()})
+    rows['row'] = range(first_row_number, first_row_number + len(df))
+    rows['image'] = _text_column(df, IMAGE_COLUMN)
+    errors = []
+
+    # 메뉴명이 없는 행은 기존과 같이 오류 없이 건너뜀
+    rows = rows[rows['name'] != '']
+
+    price_text = rows['price'].str.replace(r'[,\s원]', '', regex=True)
+    price = pd.to_numeric(price_text, errors='coerce').round(2)
+    invalid_price = price.isna() | (price < 0) | (price >= MAX_PRICE)
+    for row, value in zip(rows.loc[invalid_price, 'row'], rows.loc[invalid_price, 'price']):
+        errors.append({'row': int(row), 'message': f"가격 값이 올바르지 않습니다: {value!r}"})
+    rows = rows[~invalid_price].copy()
+    rows['price'] = price[~invalid_price]
+
+    spicy = rows['spicy'].replace('', '0')
+    invalid_spicy = ~spicy.isin(SPICY_LEVELS)
+    for row, value in zip(rows.loc[invalid_spicy, 'row'], rows.loc[invalid_spicy, 'spicy']):
+        errors.append({'row': int(row), 'message': f"맵기 값이 올바르지 않아 0으로 저장합니다: {value!r}"})
+    rows['spicy'] = spicy.where(~invalid_spicy, '0')
+
+    return rows, errors
+
+
+def _build_menu(store, row):
+    menu = Menu(
+        store=store,
+        name=row.name,
+        price=Decimal(str(row.price)),
+        category=row.category,
+        menu_introduction=row.menu_introduction,
+        spicy=row.spicy,
+        allergy=row.allergy,
+        origin=row.origin,
+    )
+
+    # 이미지 경로가 있을 경우 내용 해시 이름으로 저장 (같은 사진은 한 번만 저장되며, 가능하면 하드 링크 사용)
+    if row.image and os.path.exists(row.image):
+        menu.image = media_storage.save_local_file(row.image, 'menu_images')
+    return menu
+
+
+def iter_excel_batches(file_path, batch_size=BULK_BATCH_SIZE):
+    """
+    엑셀 파일의 첫 번째 시트를 batch_size행씩 읽어 (시작 행 번호, DataFrame)으로 반환하는 제너레이터.
+    xlsx 파일은 읽기 전용 모드로 행을 순서대로 읽으므로 행 수와 관계없이 메모리 사용량이 일정하며,
+    시트에 포함된 이미지도 불러오지 않는다. (xls 파일은 openpyxl이 지원하지 않아 한 번에 읽음)
+    """
+    if file_path.lower().endswith('.xls'):
         df = pd.read_excel(file_path, header=1)
-        logger.debug(f"df.head(): {df.head()}")
-
-        # NaN 값을 빈 문자열("")로 대체
-        df = df.fillna("")  
-        logger.debug(f"NaN 값을 빈 문자열로 대체한 데이터프레임: {df.head()}")
-
-        # store 객체 가져오기
-        store = Store.objects.get(store_id=store_id)
-
-        # 기존의 menu_price 데이터를 불러오기 (비어있을 경우 빈 리스트로 처리)
-        if store.menu_price:
-            try:
-                menu_list = json.loads(store.menu_price)
-            except json.JSONDecodeError:
-                logger.error("menu_price 필드가 유효한 JSON 형식이 아닙니다. 빈 리스트로 초기화합니다.")
-                menu_list = []
-        else:
-            menu_list = []
-
-        # 엑셀 데이터 행별로 처리하여 Menu 테이블에 저장
-        for _, row in df.iterrows():
-            logger.debug(f"Processing row: {row}")  # 각 행의 데이터 출력
-            if row['메뉴명'] == "":
-                continue  # '메뉴명'이 없는 경우 해당 행을 건너뜀
-
-            menu = Menu(
-                store=store,
-                name=row['메뉴명'],
-                price=row['가격'],
-                category=row['카테고리'],
-                menu_introduction=row['간단한 소개(50자 이내)'],
-                spicy=row['맵기'],
-                allergy=row['알레르기 유발물질'],
-                origin=row['원산지']
-            )
-
-            # 이미지 경로가 있을 경우 처리
-            image_path = row.get('사진', None)  # '사진' 열에서 이미지 경로를 가져옴
-            if pd.notna(image_path) and isinstance(image_path, str) and os.path.exists(image_path):
-                # 이미지 파일을 /media/menu_images/로 복사하여 Django ImageField에 저장
-                new_image_path = os.path.join('menu_images', os.path.basename(image_path))
-                destination_path = os.path.join(settings.MEDIA_ROOT, new_image_path)
-                
-                # 이미지 복사
-                shutil.copy(image_path, destination_path)
-
-                # 파일을 ImageField에 저장
-                with open(destination_path, 'rb') as image_file:
-                    menu.image.save(os.path.basename(image_path), File(image_file), save=False)
-
-            # 메뉴 객체를 저장
-            menu.save()
-            logger.debug(f"Saved menu: {menu}")
-
-            # 새로운 메뉴 정보를 리스트에 추가
-            menu_list.append({
-                'name': menu.name,
-                'price': menu.price,
-                'category': menu.category,
-                'allergy': menu.allergy
-            })
-
-        # 업데이트된 메뉴 리스트를 JSON으로 변환하여 store의 menu_price에 저장
-        store.menu_price = json.dumps(menu_list, ensure_ascii=False)
-        store.save()
-        logger.debug(f"메뉴 정보를 store.menu_price에 저장: {store.menu_price}")
-
-        logger.debug(f"엑셀 데이터를 성공적으로 처리하고 저장했습니다.")
+        for start in range(0, len(df), batch_size):
+            yield FIRST_DATA_ROW + start, df.iloc[start:start + batch_size]
+        return
 
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        next(rows, None)  # 제목 행
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [
+            str(value).strip() if value is not None else f'Unnamed: {index}'
+            for index, value in enumerate(header)
+        ]
+
+        row_number = FIRST_DATA_ROW
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            # 뒤쪽 빈 셀이 생략된 행은 헤더 길이에 맞춤
+            batch = [(tuple(row) + (None,) * len(columns))[:len(columns)] for row in batch]
+            yield row_number, pd.DataFrame(batch, columns=columns)
+            row_number += len(batch)
+    finally:
+        workbook.close()
+
+
+def excel_row_count(file_path):
+    """
+    진행률 표시에 사용할 데이터 행 수 (시트 정보에 크기가 없으면 0).
+    """
+    if file_path.lower().endswith('.xls'):
+        return 0
+    workbook = load_workbook(file_path, read_only=True)
+    try:
+        max_row = workbook.worksheets[0].max_row
+    finally:
+        workbook.close()
+    return max(max_row - FIRST_DATA_ROW + 1, 0) if max_row else 0
+
+
+def import_menu_rows(store, batches, total=0, progress=None):
+    """
+    엑셀 배치를 검증하여 Menu 객체를 만들고 한 트랜잭션 안에서 배치마다 bulk_create로 저장한 뒤,
+    store.menu_price에 새 메뉴 정보를 추가한다. (읽은 행 수, 저장한 메뉴 수, 오류 목록)을 반환한다.
+    progress(처리한 행 수, 전체 행 수, 메시지)가 주어지면 배치마다 호출한다.
+
+    가져오기는 오래 걸리는 작업이므로 시작할 때의 menu_price나 Store 객체를 다시 저장하지 않는다.
+    모든 배치를 저장한 뒤 patch_menu_price로 스토어 행을 잠그고 최신 값에 새 메뉴만 한 번에 추가하므로,
+    그 사이 다른 요청에서 바뀐 메뉴나 매장 정보가 덮어쓰이지 않는다.
+    (배치마다 갱신하면 커지는 menu_price 전체를 배치 수만큼 다시 직렬화하고, 스토어 행도 처음부터 잠그게 됨)
+    """
+    processed = 0
+    errors = []
+    created_menus = []
+    with transaction.atomic():
+        for first_row_number, df in batches:
+            rows, batch_errors = validate_menu_rows(df, first_row_number)
+            errors.extend(batch_errors)
+
+            menus = [_build_menu(store, row) for row in rows.itertuples(index=False)]
+            Menu.objects.bulk_create(menus)
+            created_menus.extend(menus)
+            processed += len(df)
+            if progress:
+                progress(processed, max(total, processed), f"{processed}행 처리, {len(created_menus)}개 메뉴 저장")
+        if created_menus:
+            patch_menu_price(store, upserted=created_menus)
+    return processed, len(created_menus), errors
+
+
+def import_menu_excel(file_path, store_id, progress=None):
+    """
+    엑셀 파일의 메뉴를 검증하여 저장하고 {'created', 'skipped', 'errors'}를 반환 (오류는 그대로 발생).
+    """
+    # store 객체 가져오기
+    store = Store.objects.get(store_id=store_id)
+
+    total = excel_row_count(file_path) if progress else 0
+    processed, created, errors = import_menu_rows(store, iter_excel_batches(file_path), total, progress)
+
+    for error in errors:
+        logger.warning(f"엑셀 {error['row']}행: {error['message']}")
+    logger.debug(f"엑셀 데이터를 성공적으로 처리하고 저장했습니다: {created}개 메뉴, 오류 {len(errors)}건")
+    return {'created': created, 'skipped': processed - created, 'errors': errors}
+
+
+def process_excel_and_save_to_db(file_path, store_id, progress=None):
+    """
+    엑셀 파일을 읽어와서 DB에 저장하는 함수.
+    엑셀 파일에 이미지 경로가 포함되어 있다면 해당 이미지를 /media/menu_images/에 저장.
+    처리 결과를 {'created', 'skipped', 'errors'} 형식으로 반환한다 (파일을 처리하지 못하면 None).
+    """
+    try:
+        return import_menu_excel(file_path, store_id, progress)
     except Exception as e:
         logger.error(f"엑셀 파일 처리 중 오류 발생: {e}")
+        return None
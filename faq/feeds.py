@@ -0,0 +1,205 @@
+import os
+import uuid
+import base64
+import binascii
+import logging
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.db.models import Q
+from PIL import Image
+from faq_common.image_variants import feed_variant_base, variant_urls, variant_urls_many, delete_variants
+from .models import FeedImage
+
+logger = logging.getLogger('faq')
+
+# 피드에 표시하는 이미지 확장자
+FEED_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif')
+
+# 피드 목록을 나누어 조회할 때의 기본/최대 페이지 크기
+FEED_PAGE_SIZE = getattr(settings, 'FEED_PAGE_SIZE', 20)
+FEED_MAX_PAGE_SIZE = getattr(settings, 'FEED_MAX_PAGE_SIZE', 100)
+
+
+def feed_dir(store_id):
+    return os.path.join(settings.MEDIA_ROOT, 'uploads', f'store_{store_id}/feed')
+
+
+def new_feed_file_name(file_name):
+    """
+    업로드한 파일 이름으로 (고유 ID, 저장할 파일 이름 <이름>_<UUID><확장자>)를 만든다.
+    """
+    original_name, ext = os.path.splitext(os.path.basename(file_name))
+    new_id = str(uuid.uuid4())
+    return new_id, f"{original_name}_{new_id}{ext}"
+
+
+def parse_feed_file_name(file_name):
+    """
+    저장된 파일 이름(<이름>_<UUID><확장자>)을 (이름, UUID, 확장자)로 분리 (UUID가 없으면 ('Unnamed', '', 확장자)).
+    """
+    base_name, ext = os.path.splitext(file_name)
+    parts = base_name.rsplit('_', 1)  # 마지막 '_' 기준으로 분리
+    if len(parts) > 1:
+        return parts[0], parts[1], ext
+    return 'Unnamed', '', ext
+
+
+def _image_size(path):
+    # 헤더만 읽어 이미지 크기를 확인 (이미지가 아니면 None)
+    try:
+        with Image.open(path) as image:
+            return image.size
+    except Exception:
+        return None, None
+
+
+def index_feed_file(store_id, file_name, created_at=None):
+    """
+    피드 폴더에 저장된 파일을 FeedImage 목록에 추가하거나 갱신하고 반환.
+    """
+    path = os.path.join(feed_dir(store_id), file_name)
+    name, uuid, ext = parse_feed_file_name(file_name)
+    width, height = _image_size(path)
+    values = {
+        'uuid': uuid,
+        'name': name,
+        'ext': ext,
+        'size': os.path.getsize(path),
+        'width': width,
+        'height': height,
+    }
+    if created_at:
+        values['created_at'] = created_at
+    image, _ = FeedImage.objects.update_or_create(store_id=store_id, file_name=file_name, defaults=values)
+    return image
+
+
+def rename_feed_file(store_id, old_file_name, new_file_name):
+    """
+    이름이 바뀐 피드 파일을 목록에 반영 (UUID와 등록 시각은 유지).
+    """
+    name, _, _ = parse_feed_file_name(new_file_name)
+    updated = FeedImage.objects.filter(store_id=store_id, file_name=old_file_name).update(
+        file_name=new_file_name, name=name
+    )
+    if not updated:
+        index_feed_file(store_id, new_file_name)
+
+
+def remove_feed_file(store_id, file_name):
+    FeedImage.objects.filter(store_id=store_id, file_name=file_name).delete()
+    _, image_uuid, _ = parse_feed_file_name(file_name)
+    if image_uuid:
+        delete_variants(feed_variant_base(store_id, image_uuid))
+
+
+def sync_feed_dir(store_id):
+    """
+    피드 폴더의 파일과 FeedImage 목록을 맞춤 (기존에 업로드된 파일 등록용).
+    등록 시각은 파일 수정 시각을 사용한다. (추가한 수, 삭제한 수)를 반환.
+    """
+    try:
+        files = {file for file in os.listdir(feed_dir(store_id)) if file.lower().endswith(FEED_IMAGE_EXTENSIONS)}
+    except FileNotFoundError:
+        files = set()
+
+    indexed = set(FeedImage.objects.filter(store_id=store_id).values_list('file_name', flat=True))
+    for file_name in sorted(files - indexed):
+        mtime = os.path.getmtime(os.path.join(feed_dir(store_id), file_name))
+        index_feed_file(store_id, file_name, datetime.fromtimestamp(mtime, tz=dt_timezone.utc))
+    removed, _ = FeedImage.objects.filter(store_id=store_id, file_name__in=indexed - files).delete()
+    return len(files - indexed), removed
+
+
+def feed_image_entry(image, variants=None):
+    """
+    variants: feed_image_entries가 한 번에 조회한 변형 이미지 URL (없으면 이미지마다 조회).
+    """
+    if not image.uuid:
+        variants = {}
+    elif variants is None:
+        variants = variant_urls(feed_variant_base(image.store_id, image.uuid))
+    return {
+        'id': image.uuid or None,
+        'name': image.name,
+        'path': image.path,
+        'ext': image.ext,
+        'size': image.size,
+        'width': image.width,
+        'height': image.height,
+        'created_at': image.created_at.isoformat(),
+        # 너비별 WebP/JPEG 변형 이미지 URL (아직 만들어지지 않았으면 빈 dict)
+        'variants': variants,
+    }
+
+
+def feed_image_entries(images):
+    # 변형 이미지 목록을 한 번의 캐시 조회로 가져와 목록을 만듦
+    images = list(images)
+    bases = {image.id: feed_variant_base(image.store_id, image.uuid) for image in images if image.uuid}
+    variants = variant_urls_many(bases.values())
+    return [feed_image_entry(image, variants.get(bases.get(image.id))) for image in images]
+
+
+def list_feed_images(store_id):
+    """
+    매장 피드 이미지 목록 [{'id', 'name', 'path', 'ext', 'size', 'width', 'height', 'created_at', 'variants'}] (최신순).
+    FeedImage 목록에서 조회하며 피드 폴더는 읽지 않는다.
+    """
+    images = FeedImage.objects.filter(store_id=store_id).order_by('-created_at', '-id')
+    return feed_image_entries(images)
+
+
+def encode_cursor(image):
+    """
+    다음 페이지 조회 위치 (마지막 이미지의 등록 시각과 ID).
+    """
+    value = f'{image.created_at.isoformat()}|{image.id}'
+    return base64.urlsafe_b64encode(value.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    cursor를 (등록 시각, ID)로 변환. 올바르지 않으면 ValueError.
+    """
+    try:
+        value = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        created_at, image_id = value.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(image_id)
+    except (TypeError, UnicodeDecodeError, binascii.Error) as e:
+        raise ValueError(f"잘못된 cursor 값입니다: {cursor}") from e
+
+
+def parse_page_size(value):
+    """
+    요청한 페이지 크기를 1~FEED_MAX_PAGE_SIZE로 제한 (없으면 FEED_PAGE_SIZE). 숫자가 아니면 ValueError.
+    """
+    if value in (None, ''):
+        return FEED_PAGE_SIZE
+    return min(max(int(value), 1), FEED_MAX_PAGE_SIZE)
+
+
+def feed_page(store_id, cursor=None, page_size=FEED_PAGE_SIZE, with_total=False):
+    """
+    매장 피드 이미지를 최신순으로 page_size개씩 조회 {'images', 'next_cursor', 'has_more'}.
+    cursor 이후의 이미지를 (store, -created_at, -id) 인덱스로 바로 찾으므로 페이지 위치와 관계없이 비용이 같다.
+    with_total이면 전체 이미지 수('total')를 함께 반환한다 (전체 수는 매번 세어야 하므로 필요한 경우에만 사용).
+    """
+    images = FeedImage.objects.filter(store_id=store_id)
+    if cursor:
+        created_at, image_id = decode_cursor(cursor)
+        images = images.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=image_id))
+
+    # 한 개 더 조회하여 다음 페이지가 있는지 확인
+    page = list(images.order_by('-created_at', '-id')[:page_size + 1])
+    has_more = len(page) > page_size
+    page = page[:page_size]
+
+    result = {
+        'images': feed_image_entries(page),
+        'next_cursor': encode_cursor(page[-1]) if has_more else None,
+        'has_more': has_more,
+    }
+    if with_total:
+        result['total'] = FeedImage.objects.filter(store_id=store_id).count()
+    return result
@@ -0,0 +1,34 @@
+import os
+import logging
+from django.core.management.base import BaseCommand
+from faq_common.conversation_store import ConversationStore
+
+logger = logging.getLogger('faq')
+
+
+class Command(BaseCommand):
+    help = 'conversation_history의 CSV 파일을 열 지향 저장소로 적재하고 조각 파일을 압축합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--root', default='conversation_history', help='사용자별 대화 기록 폴더의 상위 경로')
+        parser.add_argument('--user-id', help='특정 사용자 폴더만 처리')
+
+    def handle(self, *args, **options):
+        root = options['root']
+        if not os.path.isdir(root):
+            self.stderr.write(f"{root} 경로가 존재하지 않습니다.")
+            return
+
+        user_ids = [options['user_id']] if options['user_id'] else sorted(os.listdir(root))
+        for user_id in user_ids:
+            folder_path = os.path.join(root, str(user_id))
+            if not os.path.isdir(folder_path):
+                continue
+            try:
+                store = ConversationStore(folder_path)
+                added = store.ingest()
+                compacted = store.compact()
+                self.stdout.write(f"{folder_path}: {added}행 적재, {compacted}개 그룹 압축")
+            except Exception as e:
+                logger.error(f"대화 기록 압축 중 오류 발생: {folder_path}, 오류 메시지: {e}")
+                self.stderr.write(f"{folder_path}: 오류 발생 ({e})")
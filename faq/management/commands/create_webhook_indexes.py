@@ -0,0 +1,22 @@
+import logging
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+from faq_common.webhook_questions import create_agent_index, webhook_db_alias
+
+logger = logging.getLogger('faq')
+
+
+class Command(BaseCommand):
+    help = 'webhook_questionlog의 agent_id별 조회 인덱스를 생성합니다. (배포할 때 migrate 후 한 번 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', help='webhook_questionlog가 있는 데이터베이스 별칭 (기본값: WEBHOOK_DB_ALIAS)')
+
+    def handle(self, *args, **options):
+        alias = webhook_db_alias(options['database'])
+        try:
+            create_agent_index(alias)
+        except DatabaseError as e:
+            logger.error(f"webhook_questionlog 인덱스 생성 중 오류 발생: {e}")
+            raise CommandError(f"인덱스를 생성하지 못했습니다 ({alias}): {e}")
+        self.stdout.write(f"webhook_questionlog 인덱스 확인 완료 ({alias})")
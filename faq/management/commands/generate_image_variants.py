@@ -0,0 +1,43 @@
+import logging
+from django.core.management.base import BaseCommand
+from faq.models import Menu, Store, FeedImage
+from faq_common.image_variants import (
+    variant_base, feed_variant_base, has_variants, build_variants, enqueue_image_variants
+)
+
+logger = logging.getLogger('faq')
+
+
+class Command(BaseCommand):
+    help = '이미 저장된 메뉴 사진, 매장 배너, 피드 이미지의 변형 이미지(썸네일 등)를 만듭니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sync', action='store_true', help='작업 큐에 넣지 않고 바로 생성')
+        parser.add_argument('--force', action='store_true', help='이미 만들어진 변형 이미지도 다시 생성')
+
+    def sources(self):
+        # (원본 이름, 변형 이미지 이름 앞부분, variants_generated signal로 전달할 context)
+        names = set(Menu.objects.exclude(image='').exclude(image=None).values_list('image', flat=True))
+        names.update(Store.objects.exclude(banner='').exclude(banner=None).values_list('banner', flat=True))
+        for name in sorted(names):
+            yield name, variant_base(name), None
+        for image in FeedImage.objects.exclude(uuid='').iterator():
+            yield image.path, feed_variant_base(image.store_id, image.uuid), {'feed_store_id': image.store_id}
+
+    def handle(self, *args, **options):
+        queued = 0
+        for source_name, base, context in self.sources():
+            if not options['force'] and has_variants(base):
+                continue
+            if not options['sync']:
+                queued += bool(enqueue_image_variants(source_name, base, context))
+                continue
+            try:
+                build_variants(source_name, base, context)
+                self.stdout.write(f"{source_name}: 변형 이미지 생성")
+            except Exception as e:
+                logger.error(f"변형 이미지 생성 중 오류 발생: {source_name}, 오류 메시지: {e}")
+                self.stderr.write(f"{source_name}: 오류 발생 ({e})")
+
+        if not options['sync']:
+            self.stdout.write(f"{queued}개 이미지의 변형 이미지 생성 작업을 등록했습니다.")
@@ -0,0 +1,27 @@
+import logging
+from django.core.management.base import BaseCommand
+from faq.feeds import sync_feed_dir
+from faq.models import Store
+
+logger = logging.getLogger('faq')
+
+
+class Command(BaseCommand):
+    help = '매장 피드 폴더의 이미지 파일을 FeedImage 목록에 등록하고, 파일이 없는 항목을 정리합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--store-id', type=int, help='특정 매장만 처리')
+
+    def handle(self, *args, **options):
+        stores = Store.objects.all()
+        if options['store_id']:
+            stores = stores.filter(store_id=options['store_id'])
+
+        for store_id in stores.values_list('store_id', flat=True).iterator():
+            try:
+                added, removed = sync_feed_dir(store_id)
+                if added or removed:
+                    self.stdout.write(f"store_{store_id}: {added}개 등록, {removed}개 정리")
+            except Exception as e:
+                logger.error(f"피드 이미지 목록 갱신 중 오류 발생: store_{store_id}, 오류 메시지: {e}")
+                self.stderr.write(f"store_{store_id}: 오류 발생 ({e})")
@@ -0,0 +1,21 @@
+import logging
+from django.core.management.base import BaseCommand
+from faq_common.jobs import run_worker
+
+logger = logging.getLogger('faq')
+
+
+class Command(BaseCommand):
+    help = 'redis 작업 큐에서 작업(통계 생성 등)을 꺼내 실행하는 워커를 시작합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queue', action='append', dest='queues',
+            help='처리할 큐 이름 (여러 번 지정 가능, 기본값: statistics, imports, images, default)',
+        )
+        parser.add_argument('--burst', action='store_true', help='큐가 비면 워커를 종료')
+
+    def handle(self, *args, **options):
+        queues = options['queues'] or ['statistics', 'imports', 'images', 'default']
+        self.stdout.write(f"작업 워커 시작: {', '.join(queues)}")
+        run_worker(queues=queues, burst=options['burst'])
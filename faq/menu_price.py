@@ -0,0 +1,74 @@
+import json
+import logging
+from django.db import transaction
+from django.utils import timezone
+from .models import Store, Menu
+from .store_cache import invalidate_store_menus
+
+logger = logging.getLogger('faq')
+
+
+# Store.menu_price에 저장되는 메뉴 한 개의 정보
+def menu_price_entry(menu):
+    return {
+        'menu_number': menu.menu_number,
+        'name': menu.name,
+        'price': float(menu.price),
+        'category': menu.category,
+        'image': str(menu.image.url) if menu.image else None,  # 이미지가 있을 경우 URL로 변환
+        'allergy': menu.allergy if menu.allergy is not None else ""  # 기본값 처리
+    }
+
+
+def _save_menu_price(store, entries):
+    store.menu_price = json.dumps(entries, ensure_ascii=False)
+    store.updated_at = timezone.now()
+    # menu_price만 바뀌므로 다른 필드는 다시 저장하지 않음
+    Store.objects.filter(pk=store.pk).update(menu_price=store.menu_price, updated_at=store.updated_at)
+    # 메뉴가 바뀌었으므로 캐시된 손님용 메뉴 응답을 무효화
+    invalidate_store_menus(store)
+
+
+def rebuild_menu_price(store):
+    """
+    스토어의 모든 메뉴로 menu_price를 다시 만든다.
+    """
+    entries = [menu_price_entry(menu) for menu in Menu.objects.filter(store=store).order_by('menu_number')]
+    _save_menu_price(store, entries)
+    return entries
+
+
+def patch_menu_price(store, upserted=(), deleted=()):
+    """
+    변경된 메뉴만 menu_price에 반영한다.
+    upserted: 생성/수정된 Menu 객체, deleted: 삭제된 menu_number 목록.
+    저장된 정보에 menu_number가 없으면(이전 형식) 한 번 전체를 다시 만든다.
+    """
+    with transaction.atomic():
+        # 동시에 수정되는 경우 변경 내용이 사라지지 않도록 스토어 행을 잠그고 최신 값을 읽음
+        current = Store.objects.select_for_update().filter(pk=store.pk).values_list('menu_price', flat=True).first()
+        try:
+            entries = json.loads(current) if current else []
+        except json.JSONDecodeError:
+            logger.error("menu_price 필드가 유효한 JSON 형식이 아닙니다. 전체 메뉴로 다시 만듭니다.")
+            return rebuild_menu_price(store)
+
+        if not isinstance(entries, list) or any(
+            not isinstance(entry, dict) or entry.get('menu_number') is None for entry in entries
+        ):
+            return rebuild_menu_price(store)
+
+        deleted = {int(menu_number) for menu_number in deleted}
+        changes = {menu.menu_number: menu_price_entry(menu) for menu in upserted}
+
+        patched = []
+        for entry in entries:
+            menu_number = entry['menu_number']
+            if menu_number in deleted:
+                continue
+            patched.append(changes.pop(menu_number, entry))
+        # 새 메뉴는 menu_number 순서대로 뒤에 추가
+        patched.extend(changes[menu_number] for menu_number in sorted(changes))
+
+        _save_menu_price(store, patched)
+        return patched
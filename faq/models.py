@@ -1,8 +1,10 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.text import slugify
 from django.conf import settings
 import os
 import json
+from faq_common.media_store import media_storage
 
 # User 모델을 관리하는 매니저 클래스 및 커스텀 User 모델
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
@@ -68,7 +70,7 @@ class Store(models.Model):
     store_name = models.CharField(max_length=20, unique=True)
     store_address = models.TextField(blank=True, null=True)
     store_tel = models.TextField(blank=True, null=True)
-    banner = models.ImageField(upload_to='banners/', blank=True, null=True)
+    banner = models.ImageField(upload_to='banners/', storage=media_storage, blank=True, null=True)  # 내용 해시 이름으로 중복 없이 저장
     menu_price = models.TextField(blank=True, null=True)
     opening_hours = models.TextField(blank=True, null=True)
     qr_code = models.CharField(max_length=100, blank=True, null=True)
@@ -143,7 +145,7 @@ class Menu(models.Model):
     name = models.CharField(max_length=255)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     category = models.CharField(max_length=100)
-    image = models.ImageField(upload_to='menu_images/', blank=True, null=True)
+    image = models.ImageField(upload_to='menu_images/', storage=media_storage, blank=True, null=True)  # 내용 해시 이름으로 중복 없이 저장
     created_at = models.DateTimeField(auto_now_add=True, blank=True, null=True)
     updated_at = models.DateTimeField(auto_now=True, blank=True, null=True)
     spicy = models.CharField(max_length=50, choices=SPICY_CATEGORIES, default='0')
@@ -151,3 +153,32 @@ class Menu(models.Model):
     menu_introduction = models.TextField(blank=True, null=True)
     origin = models.TextField(blank=True, null=True)
 
+
+# 매장 피드 이미지 목록 (파일은 uploads/store_<store_id>/feed/<이름>_<UUID><확장자>로 저장)
+# 조회 시 폴더를 읽지 않도록 업로드/삭제/이름 변경 시 함께 갱신
+class FeedImage(models.Model):
+    store = models.ForeignKey(Store, related_name='feed_images', on_delete=models.CASCADE)
+    uuid = models.CharField(max_length=64, blank=True)  # 파일 이름의 고유 ID (이름 변경 시에도 유지)
+    name = models.CharField(max_length=255)  # 표시 이름
+    ext = models.CharField(max_length=10)
+    file_name = models.CharField(max_length=400)  # 저장된 파일 이름
+    size = models.PositiveBigIntegerField(default=0)
+    width = models.PositiveIntegerField(blank=True, null=True)
+    height = models.PositiveIntegerField(blank=True, null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['store', 'file_name'], name='unique_feed_image_file'),
+        ]
+        indexes = [
+            # 매장별 최신순 목록 조회
+            models.Index(fields=['store', '-created_at', '-id'], name='feed_image_store_created'),
+        ]
+
+    @property
+    def path(self):
+        return f'uploads/store_{self.store_id}/feed/{self.file_name}'
+
+    def __str__(self):
+        return self.file_name
@@ -3,6 +3,11 @@ from .models import User, Store, Edit, Menu
 from rest_framework.exceptions import ValidationError
 from django.contrib.auth.hashers import make_password
 from django.conf import settings
+from django.db.models import Manager
+from faq_common.image_variants import variant_base, variant_urls, variant_urls_many
+from faq_common.upload_guard import (
+    IMAGE_EXTENSIONS, IMAGE_MAX_FILE_SIZE, MENU_IMAGE_MAX_FILE_SIZE, EDIT_FILE_EXTENSIONS, EDIT_MAX_FILE_SIZE
+)
 import re
 import logging
 
@@ -19,7 +24,7 @@ def validate_file(value, allowed_extensions, max_file_size, error_message_prefix
     
     # 파일 크기 확인
     if value.size > max_file_size:
-        return f"{error_message_prefix} 파일 크기는 {max_file_size // (1000 * 1024 * 1024)}MB 이하이어야 합니다."
+        return f"{error_message_prefix} 파일 크기는 {max_file_size // (1024 * 1024)}MB 이하이어야 합니다."
     
     return None  # 오류가 없는 경우
 
@@ -58,7 +63,7 @@ class UserSerializer(serializers.ModelSerializer):
     
     # 프로필 사진 검증 (파일 형식과 크기)
     def validate_profile_photo(self, value):
-        error_message = validate_file(value, ['png', 'jpg', 'jpeg'], 1000 * 1024 * 1024, "프로필 사진")
+        error_message = validate_file(value, IMAGE_EXTENSIONS, IMAGE_MAX_FILE_SIZE, "프로필 사진")
         if error_message:
             raise serializers.ValidationError(error_message)
         return value
@@ -80,11 +85,17 @@ class StoreSerializer(serializers.ModelSerializer):
         if value in [None, '']:
             return value
         
-        error_message = validate_file(value, ['png', 'jpg', 'jpeg'], 1000 * 1024 * 1024, "배너 사진")
+        error_message = validate_file(value, IMAGE_EXTENSIONS, IMAGE_MAX_FILE_SIZE, "배너 사진")
         if error_message:
             raise serializers.ValidationError({"banner": error_message})
         return value
 
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        # 너비별 WebP/JPEG 배너 변형 이미지 URL (없거나 아직 만들어지지 않았으면 빈 dict)
+        representation['banner_variants'] = variant_urls(variant_base(instance.banner.name)) if instance.banner else {}
+        return representation
+
 
 # 로그인 요청에 사용하는 시리얼라이저
 class LoginSerializer(serializers.Serializer):
@@ -146,16 +157,9 @@ class EditSerializer(serializers.ModelSerializer):
         if value is None:
             return value  # 파일이 없으면 검증을 건너뜁니다.
 
-        allowed_extensions = [
-            'pdf', 'docx', 'doc', 'txt', 'xlsx', 'xls', 'csv', 'hwp', 'pptx', 'ppt',
-            'jpg', 'jpeg', 'png', 'gif', 'zip'
-        ]
-        max_file_size = 1000 * 1024 * 1024  # 1000MB
-        
-        # 압축 파일은 크기 제한을 다르게 설정
-        if value.name.split('.')[-1].lower() in ['zip']:
-            max_file_size = 1000 * 1024 * 1024  # 1000MB
-        
+        allowed_extensions = EDIT_FILE_EXTENSIONS
+        max_file_size = EDIT_MAX_FILE_SIZE
+
         # 파일 확장자 검사
         file_extension = value.name.split('.')[-1].lower()
         if file_extension not in allowed_extensions:
@@ -168,12 +172,32 @@ class EditSerializer(serializers.ModelSerializer):
         return value
     
 
+class MenuListSerializer(serializers.ListSerializer):
+    """
+    메뉴 목록 직렬화. 메뉴 사진의 변형 이미지 목록을 메뉴마다 조회하지 않고 목록 전체에 대해 한 번에 조회한다.
+    """
+
+    def to_representation(self, data):
+        menus = list(data.all() if isinstance(data, Manager) else data)
+        self.child.prefetched_variants = variant_urls_many(
+            variant_base(menu.image.name) for menu in menus if menu.image
+        )
+        try:
+            return [self.child.to_representation(menu) for menu in menus]
+        finally:
+            self.child.prefetched_variants = None
+
+
 class MenuSerializer(serializers.ModelSerializer):
     store = serializers.PrimaryKeyRelatedField(queryset=Store.objects.all())
     image = serializers.ImageField(required=False, allow_null=True, use_url=True)
 
+    # MenuListSerializer가 목록 전체에 대해 미리 조회한 변형 이미지 URL {base: URL 목록}
+    prefetched_variants = None
+
     class Meta:
         model = Menu
+        list_serializer_class = MenuListSerializer
         fields = ['menu_number', 'name', 'price', 'category', 'store', 'image', 'spicy', 'allergy', 'menu_introduction', 'origin']
 
     def validate_image(self, value):
@@ -181,9 +205,11 @@ class MenuSerializer(serializers.ModelSerializer):
             logger.debug("Image field is None")
             return None
         
-        # 이미지 크기 제한 (예: 5MB 이하)
-        if value.size > 5 * 1024 * 1024 * 1024:
-            raise serializers.ValidationError("이미지 파일 크기는 5MB를 초과할 수 없습니다.")
+        # 이미지 크기 제한
+        if value.size > MENU_IMAGE_MAX_FILE_SIZE:
+            raise serializers.ValidationError(
+                f"이미지 파일 크기는 {MENU_IMAGE_MAX_FILE_SIZE // (1024 * 1024)}MB를 초과할 수 없습니다."
+            )
 
         # 지원하지 않는 형식 확인 (예: JPG, PNG만 허용)
         if not value.content_type in ["image/jpeg", "image/png"]:
@@ -198,6 +224,17 @@ class MenuSerializer(serializers.ModelSerializer):
         if instance.image:
             # 이미지 URL에 MEDIA_URL을 추가하여 반환
             representation['image'] = f"{settings.MEDIA_URL}{instance.image}"
+        # 너비별 WebP/JPEG 변형 이미지 URL (없거나 아직 만들어지지 않았으면 빈 dict)
+        representation['image_variants'] = self.image_variants(instance.image.name) if instance.image else {}
         return representation
 
+    def image_variants(self, name):
+        base = variant_base(name)
+        if self.prefetched_variants is not None and base in self.prefetched_variants:
+            return self.prefetched_variants[base]
+        return variant_urls(base)
+
 
+# 메뉴 일괄 생성/수정에 사용하는 시리얼라이저 (스토어는 뷰에서 한 번에 조회하여 지정)
+class MenuBatchSerializer(MenuSerializer):
+    store = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -1,10 +1,12 @@
 # signals.py
-import os
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
-from .models import User, Edit
+from .models import User, Store, Menu
 import requests, logging
-from .excel_processor import process_excel_and_save_to_db  # 엑셀 처리 함수 import
+from faq_common.media_store import media_storage
+from faq_common.image_variants import variants_generated
+from .store_cache import bump_menu_version, forget_menu_version, touch_store, invalidate_media_references
 
 # 디버깅을 위한 로거 설정
 logger = logging.getLogger('faq')
@@ -23,16 +25,63 @@ def send_notification(sender, instance, created, **kwargs):
             logger.debug(f"Slack webhook failed: {response.status_code}, {response.text}")
 
 
-@receiver(post_save, sender=Edit)
-def handle_file_upload(sender, instance, created, **kwargs):
-    if created and instance.file:
-        try:
-            file_path = instance.file.path
-            # 파일 이름이 '무물_초기_데이터_입력_양식'으로 시작하는지 확인
-            if os.path.basename(file_path).startswith('무물_초기_데이터_입력_양식'):
-                store_id = instance.user.stores.first().store_id
-                process_excel_and_save_to_db(file_path, store_id)
-                logger.debug(f"Excel file processed for store_id: {store_id}")
-        except Exception as e:
-            logger.error(f"Error processing Excel file: {e}")
+# 메뉴 이미지/매장 배너가 바뀌거나 삭제되면, 더 이상 참조되지 않는 파일을 정리
+MEDIA_FIELDS = {Menu: 'image', Store: 'banner'}
 
+
+@receiver(pre_save, sender=Menu)
+@receiver(pre_save, sender=Store)
+def remember_previous_media(sender, instance, **kwargs):
+    field = MEDIA_FIELDS[sender]
+    instance._previous_media = None
+    instance._previous_slug = None
+    if instance.pk:
+        # 스토어는 slug 변경도 확인해야 하므로 같은 쿼리로 함께 조회
+        fields = (field, 'slug') if sender is Store else (field,)
+        previous = sender.objects.filter(pk=instance.pk).values_list(*fields).first()
+        if previous:
+            instance._previous_media = previous[0]
+            instance._previous_slug = previous[1] if sender is Store else None
+
+
+@receiver(post_save, sender=Menu)
+@receiver(post_save, sender=Store)
+def release_replaced_media(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_media', None)
+    if previous and previous != getattr(instance, MEDIA_FIELDS[sender]).name:
+        transaction.on_commit(lambda: media_storage.release(previous))
+
+
+@receiver(post_delete, sender=Menu)
+@receiver(post_delete, sender=Store)
+def release_deleted_media(sender, instance, **kwargs):
+    name = getattr(instance, MEDIA_FIELDS[sender]).name
+    if name:
+        transaction.on_commit(lambda: media_storage.release(name))
+
+
+# 스토어의 slug가 바뀌거나 스토어가 삭제되면 이전 slug로 캐시된 손님용 메뉴 응답을 더 이상 사용하지 않음
+@receiver(post_save, sender=Store)
+def reset_renamed_store_menus(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_slug', None)
+    if previous and previous != instance.slug:
+        transaction.on_commit(lambda: forget_menu_version(previous))
+        # 새 slug를 이전에 다른 스토어가 사용했을 수 있으므로 새 버전으로 시작
+        slug = instance.slug
+        transaction.on_commit(lambda: bump_menu_version(slug))
+
+
+@receiver(post_delete, sender=Store)
+def reset_deleted_store_menus(sender, instance, **kwargs):
+    slug = instance.slug
+    transaction.on_commit(lambda: forget_menu_version(slug))
+
+
+@receiver(variants_generated)
+def refresh_image_responses(sender, source_name, context, **kwargs):
+    # 변형 이미지 URL이 포함되도록, 피드 이미지는 매장 페이지를, 메뉴 사진/배너는 그 파일을 사용하는 매장의 응답을 갱신
+    feed_store_id = context.get('feed_store_id')
+    if feed_store_id:
+        touch_store(feed_store_id)
+    else:
+        invalidate_media_references(source_name)
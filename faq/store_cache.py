@@ -0,0 +1,156 @@
+import uuid
+import logging
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from faq_common.http_cache import make_etag
+from .models import Store, Menu
+from .feeds import feed_page
+from .serializers import StoreSerializer, MenuSerializer
+
+logger = logging.getLogger('faq')
+
+# 미리 직렬화한 손님용 응답을 캐시에 보관하는 시간(초)
+PAYLOAD_TIMEOUT = getattr(settings, 'STORE_PAYLOAD_CACHE_TIMEOUT', 60 * 60)
+
+# 메뉴 버전을 캐시에 보관하는 시간(초). 만료되면 새 버전으로 다시 만들어지므로 이전 응답은 사용되지 않는다.
+VERSION_TIMEOUT = getattr(settings, 'MENU_VERSION_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def _version_key(slug):
+    return f'menu_version:{slug}'
+
+
+def menu_version(slug):
+    """
+    스토어 메뉴의 현재 버전 (slug에 해당하는 스토어가 없으면 None). 메뉴가 바뀔 때마다 새 값으로 바뀌며,
+    캐시에서 사라진 경우에도 이전 버전과 겹치지 않도록 임의의 값을 사용한다.
+    버전은 스토어를 확인한 뒤에만 만들므로, 없는 slug로 요청해도 캐시 키가 생기지 않는다.
+    """
+    version = cache.get(_version_key(slug))
+    if version is None:
+        if not Store.objects.filter(slug=slug).exists():
+            return None
+        cache.add(_version_key(slug), uuid.uuid4().hex, timeout=VERSION_TIMEOUT)
+        version = cache.get(_version_key(slug))
+    return version
+
+
+def bump_menu_version(slug):
+    cache.set(_version_key(slug), uuid.uuid4().hex, timeout=VERSION_TIMEOUT)
+
+
+def forget_menu_version(slug):
+    """
+    slug가 바뀌거나 스토어가 삭제되었을 때 이전 slug의 버전을 삭제.
+    다음 요청은 스토어를 다시 확인하므로, 캐시된 응답 대신 404를 반환한다.
+    """
+    cache.delete(_version_key(slug))
+
+
+def invalidate_store_menus(store):
+    """
+    스토어의 메뉴가 바뀌었음을 기록. 트랜잭션 안이면 커밋된 뒤에 버전을 바꾼다.
+    """
+    slug = store.slug
+    transaction.on_commit(lambda: bump_menu_version(slug))
+
+
+def menu_payload_key(slug, version):
+    return f'menus:{slug}:{version}'
+
+
+def get_payload(key):
+    return cache.get(key)
+
+
+def set_payload(key, payload):
+    cache.set(key, payload, timeout=PAYLOAD_TIMEOUT)
+
+
+def grouped_menus_key(slug, version):
+    return f'menus_grouped:{slug}:{version}'
+
+
+def category_index(slug):
+    """
+    스토어의 카테고리별 메뉴 수 {'user_id', 'categories': [{'category', 'count'}]} (스토어가 없으면 None).
+    카테고리는 처음 등록된 메뉴 순서로 정렬하며, 메뉴 버전별로 캐시하므로 메뉴가 바뀐 뒤 처음 조회할 때 다시 만든다.
+    """
+    version = menu_version(slug)
+    if version is None:
+        return None
+    key = f'categories:{slug}:{version}'
+    index = cache.get(key)
+    if index is None:
+        store = Store.objects.filter(slug=slug).values('store_id', 'user_id').first()
+        if store is None:
+            return None
+        rows = (
+            Menu.objects.filter(store_id=store['store_id'])
+            .values('category')
+            .annotate(count=Count('menu_number'), first_menu=Min('menu_number'))
+            .order_by('first_menu')
+        )
+        index = {
+            'user_id': store['user_id'],
+            'categories': [{'category': row['category'], 'count': row['count']} for row in rows],
+        }
+        cache.set(key, index, timeout=PAYLOAD_TIMEOUT)
+    return index
+
+
+def store_page_etag(store_id, updated_at):
+    # 다른 조건부 조회와 같은 make_etag 형식 (수정 시각은 마이크로초 단위)
+    return make_etag('store', store_id, int(updated_at.timestamp() * 1000000))
+
+
+def store_page_validators(slug):
+    """
+    공개 매장 페이지의 (store_id, updated_at). 응답을 만들지 않고 변경 여부를 확인할 때 사용 (매장이 없으면 None).
+    """
+    return Store.objects.filter(slug=slug).values_list('store_id', 'updated_at').first()
+
+
+def store_page_key(slug, updated_at):
+    return f'store_page:{slug}:{updated_at.timestamp()}'
+
+
+def touch_store(store_id):
+    """
+    메뉴 외의 매장 공개 정보(피드 등)가 바뀌었을 때 updated_at을 갱신하여 공개 매장 페이지를 다시 만들도록 함.
+    """
+    Store.objects.filter(store_id=store_id).update(updated_at=timezone.now())
+
+
+def invalidate_media_references(name):
+    """
+    메뉴 사진/배너로 name을 사용하는 매장의 캐시된 메뉴 응답과 공개 매장 페이지를 갱신 (변형 이미지가 만들어진 뒤 호출).
+    """
+    store_ids = set(Menu.objects.filter(image=name).values_list('store_id', flat=True))
+    store_ids.update(Store.objects.filter(banner=name).values_list('store_id', flat=True))
+    if not store_ids:
+        return
+    for slug in Store.objects.filter(store_id__in=store_ids).values_list('slug', flat=True):
+        bump_menu_version(slug)
+    Store.objects.filter(store_id__in=store_ids).update(updated_at=timezone.now())
+
+
+def build_store_page(store):
+    """
+    공개 매장 페이지 응답 {'store', 'menus', 'feeds', 'feeds_next_cursor'}를 JSON으로 직렬화하여 캐시에 저장하고 반환.
+    키에 Store.updated_at이 포함되므로 매장 정보가 바뀌면 새로운 키로 다시 만든다.
+    """
+    # 피드는 첫 페이지만 포함하고, 나머지는 feeds_next_cursor로 FeedListView에서 이어서 조회
+    feeds = feed_page(store.store_id)
+    payload = JSONRenderer().render({
+        'store': StoreSerializer(store).data,
+        'menus': MenuSerializer(Menu.objects.filter(store=store).order_by('menu_number'), many=True).data,
+        'feeds': feeds['images'],
+        'feeds_next_cursor': feeds['next_cursor'],
+    })
+    set_payload(store_page_key(store.slug, store.updated_at), payload)
+    return payload
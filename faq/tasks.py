@@ -0,0 +1,29 @@
+import logging
+from faq_common.jobs import enqueue, get_job
+from .excel_processor import import_menu_excel
+
+logger = logging.getLogger('faq')
+
+
+def import_menu_excel_job(job, file_path, store_id):
+    """
+    작업 큐에서 실행되는 엑셀 메뉴 등록 작업 (Edit 업로드 시 등록).
+    """
+    return import_menu_excel(file_path, store_id, progress=job.progress)
+
+
+def enqueue_menu_import(user_id, file_path, store_id):
+    """
+    엑셀 메뉴 등록 작업을 imports 큐에 넣고 작업 ID를 반환.
+    """
+    return enqueue(
+        'faq.tasks.import_menu_excel_job', {'file_path': file_path, 'store_id': store_id},
+        owner=f'faq:{user_id}', queue='imports',
+    )
+
+
+def get_menu_import_job(user_id, job_id):
+    """
+    사용자의 엑셀 메뉴 등록 작업 정보를 반환 (없거나 다른 사용자의 작업이면 None).
+    """
+    return get_job(job_id, owner=f'faq:{user_id}')
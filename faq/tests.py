@@ -1,3 +1,698 @@
-from django.test import TestCase
+import os
+import json
+import hashlib
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import force_authenticate
+from .models import User, Store, Menu, FeedImage
+from .feeds import feed_dir, sync_feed_dir, rename_feed_file, remove_feed_file, list_feed_images
+from .menu_price import rebuild_menu_price
+from .views import (
+    MenuListView, FeedListView, ChunkedUploadInitView, ChunkedUploadView, ChunkedUploadChunkView,
+    ChunkedUploadFinalizeView, FeedUploadView, StatisticsView,
+)
+from faq_common.conversation_store import ConversationStore
+from faq_common.testing import APIViewTestMixin, MediaRootMixin, png_bytes, temp_dir_setting
+from faq_common.chunked_upload import MIN_CHUNK_SIZE, MAX_CHUNK_SIZE
+from faq_common.upload_guard import UploadGuardMiddleware, FEED_UPLOAD_EXTENSIONS, MIDDLEWARE_PATH, _rule, check_middleware
 
-# Create your tests here.
+
+def create_user(username, phone):
+    # 가입 알림(Slack) 요청을 보내지 않도록 signal의 requests.post를 대체
+    with mock.patch('faq.signals.requests.post') as post:
+        post.return_value.status_code = 200
+        return User.objects.create_user(username=username, password='password1!', phone=phone)
+
+
+def menu_price_of(store):
+    return json.loads(Store.objects.get(pk=store.pk).menu_price or '[]')
+
+
+class MenuTestCase(APIViewTestMixin, TestCase):
+    """
+    MenuListView 테스트 공통 설정 (사용자 두 명, 첫 번째 사용자의 매장 두 개와 다른 사용자의 매장 한 개).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner', '010-0000-0001')
+        cls.other = create_user('other', '010-0000-0002')
+        cls.store = Store.objects.create(user=cls.owner, store_name='가게', slug='store-a')
+        cls.second_store = Store.objects.create(user=cls.owner, store_name='두번째 가게', slug='store-b')
+        cls.other_store = Store.objects.create(user=cls.other, store_name='다른 가게', slug='store-c')
+
+    def post(self, data, user=None, format='multipart'):
+        request = self.factory.post('/api/menu-details/', data, format=format)
+        if user is not None:
+            force_authenticate(request, user=user)
+        # 메뉴 캐시 무효화는 커밋 후에 실행되므로 테스트 트랜잭션 안에서도 바로 실행
+        with self.captureOnCommitCallbacks(execute=True):
+            response = MenuListView.as_view()(request)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def add_menus(self, store, *names):
+        menus = [Menu.objects.create(store=store, name=name, price=1000, category='메인') for name in names]
+        rebuild_menu_price(store)
+        return menus
+
+
+class MenuBatchTests(MenuTestCase):
+
+    def test_create_menus_for_several_stores(self):
+        response = self.post({
+            'action': 'create',
+            'menus[0][slug]': 'store-a', 'menus[0][name]': '김밥', 'menus[0][price]': 3000, 'menus[0][category]': '분식',
+            'menus[1][slug]': 'store-b', 'menus[1][name]': '라면', 'menus[1][price]': 4000, 'menus[1][category]': '분식',
+            'menus[2][slug]': 'store-a', 'menus[2][name]': '떡볶이', 'menus[2][price]': 5000, 'menus[2][category]': '분식',
+        }, user=self.owner)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data['created_menus']), 3)
+        self.assertEqual([result['status'] for result in response.data['results']], ['created'] * 3)
+        self.assertEqual(
+            [result['menu_number'] for result in response.data['results']],
+            [menu['menu_number'] for menu in response.data['created_menus']]
+        )
+        self.assertEqual([entry['name'] for entry in menu_price_of(self.store)], ['김밥', '떡볶이'])
+        self.assertEqual([entry['name'] for entry in menu_price_of(self.second_store)], ['라면'])
+        # menu_price 항목은 menu_number로 찾을 수 있어야 함
+        numbers = set(Menu.objects.filter(store=self.store).values_list('menu_number', flat=True))
+        self.assertEqual({entry['menu_number'] for entry in menu_price_of(self.store)}, numbers)
+
+    def test_create_rejects_store_of_other_user(self):
+        response = self.post({
+            'action': 'create',
+            'menus[0][slug]': 'store-a', 'menus[0][name]': '김밥', 'menus[0][price]': 3000, 'menus[0][category]': '분식',
+            'menus[1][slug]': 'store-c', 'menus[1][name]': '라면', 'menus[1][price]': 4000, 'menus[1][category]': '분식',
+        }, user=self.owner)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Menu.objects.exists())
+        self.assertEqual(menu_price_of(self.store), [])
+        # 배치는 all-or-nothing: 거부 원인이 된 항목만 error, 나머지는 skipped
+        self.assertEqual([result['status'] for result in response.data['results']], ['skipped', 'error'])
+        self.assertEqual(response.data['results'][1]['index'], 1)
+        self.assertIn('store-c', response.data['results'][1]['error'])
+
+    def test_create_reports_every_invalid_item(self):
+        response = self.post({
+            'action': 'create',
+            'menus[0][slug]': 'store-a', 'menus[0][name]': '', 'menus[0][price]': 3000, 'menus[0][category]': '분식',
+            'menus[1][slug]': 'store-a', 'menus[1][name]': '라면', 'menus[1][price]': 4000, 'menus[1][category]': '분식',
+            'menus[2][slug]': 'store-c', 'menus[2][name]': '우동', 'menus[2][price]': 5000, 'menus[2][category]': '분식',
+        }, user=self.owner)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([result['status'] for result in response.data['results']], ['error', 'skipped', 'error'])
+        self.assertIn('name', response.data['results'][0]['error'])
+        self.assertFalse(Menu.objects.exists())
+
+    def test_update_patches_menu_price_in_place(self):
+        first, second, third = self.add_menus(self.store, '김밥', '라면', '떡볶이')
+
+        response = self.post({
+            'action': 'update',
+            'menus[0][slug]': 'store-a', 'menus[0][menu_number]': second.menu_number,
+            'menus[0][name]': '치즈라면', 'menus[0][price]': 4500, 'menus[0][category]': '분식',
+        }, user=self.owner)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [
+            {'index': 0, 'menu_number': second.menu_number, 'status': 'updated', 'error': None},
+        ])
+        second.refresh_from_db()
+        self.assertEqual(second.name, '치즈라면')
+        entries = menu_price_of(self.store)
+        self.assertEqual([entry['name'] for entry in entries], ['김밥', '치즈라면', '떡볶이'])
+        self.assertEqual(entries[1]['price'], 4500.0)
+
+    def test_update_rejects_menu_of_other_store(self):
+        other_menu, = self.add_menus(self.other_store, '비빔밥')
+
+        response = self.post({
+            'action': 'update',
+            'menus[0][slug]': 'store-a', 'menus[0][menu_number]': other_menu.menu_number,
+            'menus[0][name]': '바뀐 이름', 'menus[0][price]': 1, 'menus[0][category]': '분식',
+        }, user=self.owner)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data['results'][0]['status'], 'error')
+        other_menu.refresh_from_db()
+        self.assertEqual(other_menu.name, '비빔밥')
+
+    def test_delete_removes_menus_and_menu_price_entries(self):
+        first, second = self.add_menus(self.store, '김밥', '라면')
+        kept, = self.add_menus(self.second_store, '우동')
+
+        response = self.post({'action': 'delete', 'menus': [
+            {'slug': 'store-a', 'menu_number': first.menu_number},
+            {'slug': 'store-a', 'menu_number': second.menu_number},
+        ]}, user=self.owner, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Menu.objects.filter(store=self.store).exists())
+        self.assertEqual(menu_price_of(self.store), [])
+        self.assertEqual([entry['name'] for entry in menu_price_of(self.second_store)], ['우동'])
+        self.assertTrue(Menu.objects.filter(pk=kept.pk).exists())
+
+    def test_delete_rejects_menu_of_other_store(self):
+        own, = self.add_menus(self.store, '김밥')
+        other_menu, = self.add_menus(self.other_store, '비빔밥')
+
+        response = self.post({'action': 'delete', 'menus': [
+            {'slug': 'store-a', 'menu_number': own.menu_number},
+            {'slug': 'store-a', 'menu_number': other_menu.menu_number},
+        ]}, user=self.owner, format='json')
+
+        self.assertEqual(response.status_code, 404)
+        # 하나라도 찾을 수 없으면 아무것도 삭제하지 않음
+        self.assertEqual(Menu.objects.count(), 2)
+        self.assertEqual(len(menu_price_of(self.store)), 1)
+        self.assertEqual(response.data['results'], [
+            {'index': 0, 'menu_number': own.menu_number, 'status': 'skipped', 'error': None},
+            {'index': 1, 'menu_number': other_menu.menu_number, 'status': 'error',
+             'error': f'{other_menu.menu_number}에 해당하는 메뉴를 찾을 수 없습니다.'},
+        ])
+
+
+class CustomerMenuCacheTests(MenuTestCase):
+
+    def view(self, slug='store-a'):
+        return self.post({'action': 'view', 'slug': slug, 'type': 'customer'}, format='json')
+
+    def menu_names(self, response):
+        return sorted(menu['name'] for menu in json.loads(response.content))
+
+    def test_cached_menus_are_served_without_queries(self):
+        self.add_menus(self.store, '김밥')
+        self.assertEqual(self.menu_names(self.view()), ['김밥'])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.menu_names(self.view()), ['김밥'])
+
+    def test_menu_writes_invalidate_cached_menus(self):
+        first, = self.add_menus(self.store, '김밥')
+        self.assertEqual(self.menu_names(self.view()), ['김밥'])
+
+        self.post({
+            'action': 'create',
+            'menus[0][slug]': 'store-a', 'menus[0][name]': '라면', 'menus[0][price]': 4000, 'menus[0][category]': '분식',
+        }, user=self.owner)
+        self.assertEqual(self.menu_names(self.view()), ['김밥', '라면'])
+
+        self.post({
+            'action': 'update',
+            'menus[0][slug]': 'store-a', 'menus[0][menu_number]': first.menu_number,
+            'menus[0][name]': '참치김밥', 'menus[0][price]': 3500, 'menus[0][category]': '분식',
+        }, user=self.owner)
+        self.assertEqual(self.menu_names(self.view()), ['라면', '참치김밥'])
+
+        self.post({'action': 'delete', 'menus': [{'slug': 'store-a', 'menu_number': first.menu_number}]},
+                  user=self.owner, format='json')
+        self.assertEqual(self.menu_names(self.view()), ['라면'])
+
+    def test_other_store_cache_is_kept(self):
+        self.add_menus(self.second_store, '우동')
+        self.view('store-b')
+
+        self.post({
+            'action': 'create',
+            'menus[0][slug]': 'store-a', 'menus[0][name]': '라면', 'menus[0][price]': 4000, 'menus[0][category]': '분식',
+        }, user=self.owner)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.menu_names(self.view('store-b')), ['우동'])
+
+    def test_unknown_slug_returns_404_without_cache_entry(self):
+        response = self.view('no-such-store')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertIsNone(cache.get('menu_version:no-such-store'))
+
+    def test_renamed_store_old_slug_returns_404(self):
+        self.add_menus(self.store, '김밥')
+        self.view()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.store.slug = 'store-renamed'
+            self.store.save()
+
+        self.assertEqual(self.view().status_code, 404)
+        self.assertEqual(self.menu_names(self.view('store-renamed')), ['김밥'])
+
+
+class FeedIndexTests(MediaRootMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner', '010-0000-0001')
+        cls.store = Store.objects.create(user=cls.owner, store_name='가게', slug='store-a')
+
+    def write_feed_file(self, file_name):
+        os.makedirs(feed_dir(self.store.store_id), exist_ok=True)
+        with open(os.path.join(feed_dir(self.store.store_id), file_name), 'wb') as f:
+            f.write(png_bytes())
+
+    def test_sync_feed_dir_indexes_existing_files(self):
+        self.write_feed_file('사진_11111111-1111-1111-1111-111111111111.png')
+        self.write_feed_file('메모.txt')
+
+        self.assertEqual(sync_feed_dir(self.store.store_id), (1, 0))
+        image = FeedImage.objects.get(store=self.store)
+        self.assertEqual((image.name, image.uuid, image.ext), ('사진', '11111111-1111-1111-1111-111111111111', '.png'))
+        self.assertEqual((image.width, image.height), (40, 30))
+        # 이미 등록된 파일은 다시 등록하지 않음
+        self.assertEqual(sync_feed_dir(self.store.store_id), (0, 0))
+
+    def test_sync_feed_dir_removes_missing_files(self):
+        self.write_feed_file('사진_1.png')
+        sync_feed_dir(self.store.store_id)
+        os.remove(os.path.join(feed_dir(self.store.store_id), '사진_1.png'))
+
+        self.assertEqual(sync_feed_dir(self.store.store_id), (0, 1))
+        self.assertFalse(FeedImage.objects.exists())
+
+    def test_rename_and_remove_keep_index_in_sync(self):
+        self.write_feed_file('사진_abc.png')
+        sync_feed_dir(self.store.store_id)
+        created_at = FeedImage.objects.get().created_at
+
+        rename_feed_file(self.store.store_id, '사진_abc.png', '간판_abc.png')
+        image = FeedImage.objects.get()
+        self.assertEqual((image.file_name, image.name, image.uuid), ('간판_abc.png', '간판', 'abc'))
+        self.assertEqual(image.created_at, created_at)
+
+        remove_feed_file(self.store.store_id, '간판_abc.png')
+        self.assertEqual(list_feed_images(self.store.store_id), [])
+
+
+class FeedPagingTests(APIViewTestMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner', '010-0000-0001')
+        cls.store = Store.objects.create(user=cls.owner, store_name='가게', slug='store-a')
+        # 같은 등록 시각의 이미지가 있어도 ID로 순서가 정해지는지 확인하도록 5개씩 같은 시각으로 등록
+        base = timezone.now()
+        FeedImage.objects.bulk_create([
+            FeedImage(
+                store=cls.store, uuid=f'{index:04d}', name=f'사진{index}', ext='.png',
+                file_name=f'사진{index}_{index:04d}.png', created_at=base - timedelta(minutes=index // 5),
+            )
+            for index in range(25)
+        ])
+
+    def get(self, **params):
+        request = self.factory.get('/api/feed/', {'slug': 'store-a', **params})
+        response = FeedListView.as_view()(request)
+        response.render()
+        return response
+
+    def expected_order(self):
+        return list(
+            FeedImage.objects.filter(store=self.store).order_by('-created_at', '-id').values_list('uuid', flat=True)
+        )
+
+    def test_pages_cover_all_images_in_order(self):
+        seen = []
+        cursor = None
+        while True:
+            params = {'page_size': 10}
+            if cursor:
+                params['cursor'] = cursor
+            data = self.get(**params).data['data']
+            seen.extend(image['id'] for image in data['images'])
+            cursor = data['next_cursor']
+            self.assertEqual(data['has_more'], cursor is not None)
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, self.expected_order())
+
+    def test_new_image_does_not_shift_next_page(self):
+        first = self.get(page_size=10).data['data']
+        FeedImage.objects.create(store=self.store, uuid='new', name='새 사진', ext='.png', file_name='새 사진_new.png')
+
+        second = self.get(page_size=10, cursor=first['next_cursor']).data['data']
+        self.assertEqual(
+            [image['id'] for image in first['images'] + second['images']], self.expected_order()[1:21]
+        )
+
+    def test_with_total(self):
+        data = self.get(page_size=5, with_total='true').data['data']
+        self.assertEqual(len(data['images']), 5)
+        self.assertEqual(data['total'], 25)
+
+    def test_page_size_is_limited(self):
+        data = self.get(page_size=100000).data['data']
+        self.assertEqual(len(data['images']), 25)
+        self.assertFalse(data['has_more'])
+
+    def test_bad_cursor_returns_400(self):
+        for cursor in ('not-a-cursor', 'bm90LWEtY3Vyc29y', '%%%'):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.get(cursor=cursor).status_code, 400)
+
+    def test_bad_page_size_returns_400(self):
+        self.assertEqual(self.get(page_size='ten').status_code, 400)
+
+
+class ChunkedUploadTests(MediaRootMixin, APIViewTestMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner', '010-0000-0001')
+        cls.other = create_user('other', '010-0000-0002')
+        cls.store = Store.objects.create(user=cls.owner, store_name='가게', slug='store-a')
+
+    def setUp(self):
+        super().setUp()
+        temp_dir_setting(self, 'CHUNKED_UPLOAD_DIR')
+        # 이미지 조각 3개 (마지막 조각은 짧음)
+        self.content = png_bytes() + b'\0' * (MIN_CHUNK_SIZE * 2 + 1000)
+
+    def call(self, view, request, user=None, **kwargs):
+        force_authenticate(request, user=user or self.owner)
+        response = view.as_view()(request, **kwargs)
+        response.render()
+        return response
+
+    def init(self, size=None, file_name='사진.png', **data):
+        request = self.factory.post('/api/uploads/', {
+            'purpose': 'feed', 'store_id': self.store.store_id, 'file_name': file_name,
+            'size': len(self.content) if size is None else size, 'chunk_size': MIN_CHUNK_SIZE, **data,
+        }, format='json')
+        return self.call(ChunkedUploadInitView, request)
+
+    def put_chunk(self, upload_id, index, data=None, checksum=None, user=None):
+        if data is None:
+            data = self.content[index * MIN_CHUNK_SIZE:(index + 1) * MIN_CHUNK_SIZE]
+        headers = {'HTTP_X_CHUNK_CHECKSUM': checksum} if checksum else {}
+        request = self.factory.put(
+            f'/api/uploads/{upload_id}/chunks/{index}/', data, content_type='application/octet-stream', **headers
+        )
+        return self.call(ChunkedUploadChunkView, request, user=user, upload_id=upload_id, index=index)
+
+    def finalize(self, upload_id, checksum=None):
+        request = self.factory.post(f'/api/uploads/{upload_id}/finalize/', {
+            'checksum': checksum or hashlib.sha256(self.content).hexdigest(),
+        }, format='json')
+        return self.call(ChunkedUploadFinalizeView, request, upload_id=upload_id)
+
+    def status(self, upload_id):
+        request = self.factory.get(f'/api/uploads/{upload_id}/')
+        return self.call(ChunkedUploadView, request, upload_id=upload_id)
+
+    def test_chunks_in_any_order_are_assembled(self):
+        response = self.init()
+        self.assertEqual(response.status_code, 201)
+        upload_id = response.data['upload_id']
+        self.assertEqual(response.data['missing_chunks'], [0, 1, 2])
+
+        self.assertEqual(self.put_chunk(upload_id, 2).data['missing_chunks'], [0, 1])
+        chunk = self.content[:MIN_CHUNK_SIZE]
+        self.assertEqual(self.put_chunk(upload_id, 0, checksum=hashlib.sha256(chunk).hexdigest()).status_code, 200)
+        self.assertEqual(self.status(upload_id).data['received_chunks'], [0, 2])
+        self.assertEqual(self.put_chunk(upload_id, 1).data['missing_chunks'], [])
+
+        with mock.patch('faq.views.enqueue_image_variants'):
+            response = self.finalize(upload_id)
+        self.assertEqual(response.status_code, 201)
+        with open(os.path.join(self.media_root, response.data['file_path']), 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertEqual(FeedImage.objects.get(store=self.store).file_name, response.data['stored_name'])
+        # 완료된 업로드는 삭제됨
+        self.assertEqual(self.status(upload_id).status_code, 404)
+
+    def test_oversize_and_wrong_extension_are_rejected_at_init(self):
+        self.assertEqual(self.init(size=200 * 1024 * 1024).status_code, 400)
+        self.assertEqual(self.init(file_name='문서.pdf').status_code, 400)
+        self.assertEqual(self.init(size=0).status_code, 400)
+
+    def test_wrong_chunk_length_is_rejected(self):
+        upload_id = self.init().data['upload_id']
+
+        self.assertEqual(self.put_chunk(upload_id, 0, data=self.content[:MIN_CHUNK_SIZE + 1]).status_code, 400)
+        self.assertEqual(self.put_chunk(upload_id, 2, data=self.content[-10:]).status_code, 400)
+        self.assertEqual(self.put_chunk(upload_id, 3, data=b'x').status_code, 400)
+        self.assertEqual(self.status(upload_id).data['received_chunks'], [])
+
+    def test_chunk_checksum_mismatch_is_rejected(self):
+        upload_id = self.init().data['upload_id']
+
+        response = self.put_chunk(upload_id, 1, checksum=hashlib.sha256(b'other').hexdigest())
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.status(upload_id).data['missing_chunks'], [0, 1, 2])
+
+    def test_content_not_matching_extension_is_rejected(self):
+        upload_id = self.init().data['upload_id']
+
+        response = self.put_chunk(upload_id, 0, data=b'GIF89a' + self.content[6:MIN_CHUNK_SIZE])
+        self.assertEqual(response.status_code, 400)
+        # 형식이 다른 파일의 업로드는 바로 삭제됨
+        self.assertEqual(self.status(upload_id).status_code, 404)
+
+    def test_finalize_requires_all_chunks_and_matching_checksum(self):
+        upload_id = self.init().data['upload_id']
+        self.put_chunk(upload_id, 0)
+        self.put_chunk(upload_id, 1)
+
+        self.assertEqual(self.finalize(upload_id).status_code, 400)
+
+        self.put_chunk(upload_id, 2)
+        self.assertEqual(self.finalize(upload_id, checksum=hashlib.sha256(b'other').hexdigest()).status_code, 400)
+        self.assertFalse(FeedImage.objects.exists())
+        self.assertEqual(self.status(upload_id).data['missing_chunks'], [])
+
+    def test_upload_of_other_user_is_not_found(self):
+        upload_id = self.init().data['upload_id']
+
+        self.assertEqual(self.put_chunk(upload_id, 0, user=self.other).status_code, 404)
+
+
+# 피드 업로드 파일은 1KB까지, 요청 본문은 1MB까지 허용 (업로드 중 크기 검사 확인용)
+SMALL_FEED_RULES = ((r'^/api/feed-upload/$', _rule(FEED_UPLOAD_EXTENSIONS, 1024, 1024 * 1024)),)
+
+
+class UploadGuardTests(MediaRootMixin, APIViewTestMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner', '010-0000-0001')
+        cls.store = Store.objects.create(user=cls.owner, store_name='가게', slug='store-a')
+
+    def setUp(self):
+        super().setUp()
+        self.view = mock.Mock(side_effect=self.feed_upload)
+
+    def feed_upload(self, request):
+        force_authenticate(request, user=self.owner)
+        with mock.patch('faq.views.enqueue_image_variants'):
+            return FeedUploadView.as_view()(request)
+
+    def upload(self, content, name='사진.png', content_type='image/png', **extra):
+        request = self.factory.post('/api/feed-upload/', {
+            'store_id': self.store.store_id, 'file': SimpleUploadedFile(name, content, content_type=content_type),
+        }, format='multipart', **extra)
+        response = UploadGuardMiddleware(self.view)(request)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def feed_files(self):
+        return os.listdir(feed_dir(self.store.store_id)) if os.path.isdir(feed_dir(self.store.store_id)) else []
+
+    def test_valid_image_is_saved(self):
+        response = self.upload(png_bytes())
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.feed_files(), [response.data['stored_name']])
+
+    def test_oversize_content_length_is_rejected_before_view(self):
+        with self.assertLogs('faq', 'WARNING'):
+            response = self.upload(png_bytes(), CONTENT_LENGTH=str(100 * 1024 * 1024))
+
+        self.assertEqual(response.status_code, 413)
+        self.view.assert_not_called()
+
+    def test_oversize_file_is_rejected_while_reading(self):
+        with override_settings(UPLOAD_GUARD_RULES=SMALL_FEED_RULES):
+            response = self.upload(png_bytes() + b'\0' * 2048)
+
+        self.assertEqual(response.status_code, 413)
+        self.assertIn('error', json.loads(response.content))
+        self.assertEqual(self.feed_files(), [])
+
+    def test_wrong_extension_is_rejected(self):
+        response = self.upload(b'MZ' + b'\0' * 100, name='설치.exe', content_type='application/octet-stream')
+
+        self.assertEqual(response.status_code, 415)
+        self.assertEqual(self.feed_files(), [])
+
+    def test_content_type_not_matching_extension_is_rejected(self):
+        response = self.upload(png_bytes(), content_type='text/html')
+
+        self.assertEqual(response.status_code, 415)
+
+    def test_content_not_matching_extension_is_rejected(self):
+        response = self.upload(b'<html><script></script></html>')
+
+        self.assertEqual(response.status_code, 415)
+        self.assertEqual(self.feed_files(), [])
+
+    def test_missing_middleware_is_an_error_unless_debug(self):
+        with override_settings(MIDDLEWARE=[], DEBUG=False):
+            self.assertEqual([error.id for error in check_middleware(None)], ['faq_common.E001'])
+        with override_settings(MIDDLEWARE=[], DEBUG=True):
+            self.assertEqual([error.id for error in check_middleware(None)], ['faq_common.W001'])
+        with override_settings(MIDDLEWARE=[MIDDLEWARE_PATH]):
+            self.assertEqual(check_middleware(None), [])
+
+    def test_oversize_chunk_is_rejected(self):
+        request = self.factory.put(
+            '/api/uploads/abc/chunks/0/', b'x', content_type='application/octet-stream',
+            CONTENT_LENGTH=str(MAX_CHUNK_SIZE + 1),
+        )
+        with self.assertLogs('faq', 'WARNING'):
+            response = UploadGuardMiddleware(self.view)(request)
+
+        self.assertEqual(response.status_code, 413)
+        self.view.assert_not_called()
+
+
+class ConversationStoreTests(TestCase):
+
+    def setUp(self):
+        self.folder_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder_path, ignore_errors=True)
+        # webhook 질문은 테스트마다 지정 (기본은 없음)
+        self.webhook_rows = []
+        patcher = mock.patch(
+            'faq_common.conversation_store.fetch_webhook_questions', side_effect=lambda agent_id, using: self.webhook_rows
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.store = ConversationStore(self.folder_path)
+
+    def write_csv(self, name, rows, mode='w'):
+        # 2번째 열이 agent_id, 6번째 열이 사용자 발화인 대화 기록 형식
+        with open(os.path.join(self.folder_path, name), mode, encoding='utf-8') as f:
+            if mode == 'w':
+                f.write('id,agent_id,a,b,c,user_utterances\n')
+            for agent_id, utterance in rows:
+                f.write(f'1,{agent_id},a,b,c,{utterance}\n')
+
+    def top(self, agent_id='agent', **kwargs):
+        return {item['utterance']: item['count'] for item in self.store.top_utterances(agent_id, **kwargs)}
+
+    def test_only_new_rows_are_ingested(self):
+        self.write_csv('history_2024-01-01.csv', [('agent', '영업시간'), ('agent', '주차'), ('agent', '영업시간')])
+
+        self.assertEqual(self.store.ingest(), 3)
+        self.assertEqual(self.store.ingest(), 0)
+
+        self.write_csv('history_2024-01-01.csv', [('agent', '주차'), ('other', '메뉴')], mode='a')
+        self.assertEqual(self.store.ingest(), 2)
+        self.assertEqual(self.top(), {'영업시간': 2, '주차': 2})
+        self.assertEqual(self.store.statistics()['rows'], 5)
+
+    def test_rewritten_file_replaces_its_rows(self):
+        self.write_csv('history_2024-01-01.csv', [('agent', '영업시간'), ('agent', '주차')])
+        self.write_csv('history_2024-01-02.csv', [('agent', '메뉴')])
+        self.store.ingest()
+
+        self.write_csv('history_2024-01-01.csv', [('agent', '예약')])
+        self.assertEqual(self.store.ingest(), 1)
+        self.assertEqual(self.top(), {'메뉴': 1, '예약': 1})
+
+    def test_rewritten_larger_file_is_read_again(self):
+        self.write_csv('history_2024-01-01.csv', [('agent', '영업시간'), ('agent', '주차')])
+        self.store.ingest()
+
+        # 앞부분이 바뀐 파일은 크기가 커졌더라도 이어 읽지 않고 처음부터 다시 적재
+        self.write_csv('history_2024-01-01.csv', [('agent', '예약'), ('agent', '메뉴'), ('agent', '포장 가능')])
+        self.assertEqual(self.store.ingest(), 3)
+        self.assertEqual(self.top(), {'메뉴': 1, '예약': 1, '포장 가능': 1})
+        self.assertEqual(self.store.statistics()['rows'], 3)
+
+    def test_top_utterances_by_day(self):
+        self.write_csv('history_2024-01-01.csv', [('agent', '영업시간')])
+        self.write_csv('history_2024-01-02.csv', [('agent', '주차'), ('agent', '주차')])
+        self.store.ingest()
+
+        self.assertEqual(self.top(start_date='2024-01-02', end_date='2024-01-02'), {'주차': 2})
+        self.assertEqual(self.top(end_date='2024-01-01'), {'영업시간': 1})
+
+    def test_webhook_questions_are_ingested_once(self):
+        self.write_csv('history_2024-01-01.csv', [('agent', '영업시간')])
+        self.webhook_rows = [(1, json.dumps([{'question': '주차'}]))]
+        self.assertEqual(self.store.ingest(), 2)
+        self.assertEqual(self.store.ingest(), 0)
+
+        # 같은 행에 질문이 추가되면 추가된 질문만 적재
+        self.webhook_rows = [(1, json.dumps([{'question': '주차'}, {'question': '주차'}]))]
+        self.assertEqual(self.store.ingest(), 1)
+        self.assertEqual(self.top(), {'영업시간': 1, '주차': 2})
+
+    def test_webhook_questions_that_are_not_strings(self):
+        self.write_csv('history_2024-01-01.csv', [('agent', '영업시간')])
+        self.webhook_rows = [(1, json.dumps([{'question': '주차'}, {'question': None}, {'question': 3}, {}]))]
+
+        self.assertEqual(self.store.ingest(), 5)
+        self.assertEqual(self.top(), {'3': 1, '영업시간': 1, '주차': 1})
+
+    def test_export_merged_csv(self):
+        self.write_csv('history_2024-01-01.csv', [('agent', '영업시간'), ('other', '메뉴')])
+        self.store.ingest()
+
+        output_path = self.store.export_merged_csv()
+        with open(output_path, encoding='utf-8-sig') as f:
+            self.assertEqual(sorted(f.read().splitlines()), ['agent,영업시간', 'agent_id,user_utterances', 'other,메뉴'])
+        # 병합 결과 파일은 다시 입력으로 적재하지 않음
+        self.assertEqual(self.store.ingest(), 0)
+
+
+class StatisticsViewTests(APIViewTestMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner', '010-0000-0001')
+
+    def setUp(self):
+        super().setUp()
+        # 사용자 폴더 대신 임시 폴더 사용
+        self.folder_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder_path, ignore_errors=True)
+        patcher = mock.patch.object(StatisticsView, 'folder_path', return_value=self.folder_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, data):
+        request = self.factory.post('/api/statistics/', data, format='json')
+        force_authenticate(request, user=self.owner)
+        with mock.patch('faq_common.statistics_views.enqueue_statistics', return_value='job') as enqueue:
+            response = StatisticsView.as_view()(request)
+        return response, enqueue
+
+    def test_enqueues_statistics_job(self):
+        response, enqueue = self.post({'limit': '5', 'start_date': '2024-01-01'})
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status_url'], '/api/statistics/status/job/')
+        tenant, params = enqueue.call_args[0]
+        self.assertEqual((tenant, params['limit'], params['start_date']), ('faq', 5, '2024-01-01'))
+
+    def test_invalid_limit_returns_400(self):
+        for limit in ('ten', 0, 1000):
+            with self.subTest(limit=limit):
+                response, enqueue = self.post({'limit': limit})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('limit', response.data)
+                enqueue.assert_not_called()
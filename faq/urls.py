@@ -5,11 +5,12 @@ from .views import (
     SignupView, LoginView, UsernameCheckView, 
     SendVerificationCodeView, VerifyCodeView, 
     UserStoresListView, UserStoreDetailView, 
-    EditView, PasswordResetView, UserProfileView,
+    EditView, MenuImportStatusView, PasswordResetView, UserProfileView,
     UserProfilePhotoUpdateView, CustomerStoreView,
     GenerateQrCodeView, QrCodeImageView, MenuListView,
-    DeactivateAccountView, StatisticsView, 
+    DeactivateAccountView, StatisticsView, StatisticsStatusView,
     FeedListView, FeedUploadView, FeedDeleteView, FeedRenameView,
+    ChunkedUploadInitView, ChunkedUploadView, ChunkedUploadChunkView, ChunkedUploadFinalizeView,
     PushTokenView, SendPushNotificationView
 )
 
@@ -22,6 +23,7 @@ urlpatterns = [
     path('user-stores/', UserStoresListView.as_view(), name='user-stores'),  # 모든 스토어
     path('user-stores/<int:store_id>/', UserStoreDetailView.as_view(), name='user_store_detail'),
     path('edit/', EditView.as_view(), name='edit-request'),
+    path('edit/import-status/<str:job_id>/', MenuImportStatusView.as_view(), name='edit-import-status'),
     path('reset-password/', PasswordResetView.as_view(), name='reset-password'),
     path('user-profile/', UserProfileView.as_view(), name='user-profile'),
     path('update-profile-photo/', UserProfilePhotoUpdateView.as_view(), name='update-profile-photo'),
@@ -30,10 +32,15 @@ urlpatterns = [
     path('qrCodeImage/', QrCodeImageView.as_view(), name='qr_code_image'),
     path('menu-details/', MenuListView.as_view(), name='menu-details'),
     path('statistics/', StatisticsView.as_view(), name='statistics'),
+    path('statistics/status/<str:job_id>/', StatisticsStatusView.as_view(), name='statistics_status'),
     path('feed/', FeedListView.as_view(), name='feed_list'),
     path('feed-upload/', FeedUploadView.as_view(), name='feed_upload'),
     path('feed-delete/', FeedDeleteView.as_view(), name='feed_delete'),
     path('feed-rename/', FeedRenameView.as_view(), name='feed_rename'),
+    path('uploads/', ChunkedUploadInitView.as_view(), name='chunked_upload_init'),
+    path('uploads/<str:upload_id>/', ChunkedUploadView.as_view(), name='chunked_upload'),
+    path('uploads/<str:upload_id>/chunks/<int:index>/', ChunkedUploadChunkView.as_view(), name='chunked_upload_chunk'),
+    path('uploads/<str:upload_id>/finalize/', ChunkedUploadFinalizeView.as_view(), name='chunked_upload_finalize'),
     path('deactivate-account/', DeactivateAccountView.as_view(), name='deactivate-account'),
     path('register-push-token/', PushTokenView.as_view(), name='register_push_token'),
     path('send-push-notification/', SendPushNotificationView.as_view(), name='send_push_notification'),
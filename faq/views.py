@@ -6,15 +6,22 @@ from django.shortcuts import get_object_or_404
 from django.utils.text import slugify
 from urllib.parse import unquote, quote
 from django.utils import timezone 
+from django.core.files import File
+from django.http import HttpResponse
 from rest_framework import status
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 import requests, random, logging, json, os, shutil
 from exponent_server_sdk import PushClient, PushMessage
-from .merged_csv import merge_csv_files
+from faq_common.jobs import DONE, FAILED
+from faq_common.statistics_views import BaseStatisticsView, BaseStatisticsStatusView
+from .tasks import enqueue_menu_import, get_menu_import_job
+from .excel_processor import process_excel_and_save_to_db
+from redis.exceptions import RedisError
 from datetime import datetime
 import uuid
 
@@ -26,12 +33,27 @@ from django.utils.decorators import method_decorator
 
 # 모델과 시리얼라이저 임포트
 from .models import User, Store, Edit, Menu
+from .menu_price import patch_menu_price
+from .store_cache import (
+    menu_version, menu_payload_key, grouped_menus_key, get_payload, set_payload,
+    category_index,
+    store_page_validators, store_page_etag, store_page_key, build_store_page, touch_store
+)
+from .feeds import (
+    feed_dir, list_feed_images, index_feed_file, rename_feed_file, remove_feed_file,
+    feed_page, decode_cursor, parse_page_size, new_feed_file_name
+)
+from faq_common.http_cache import make_etag, epoch, not_modified, set_validators, conditional_response
+from faq_common.media_store import media_storage
+from faq_common.chunked_upload import ChunkedUpload, UploadError
+from faq_common.upload_guard import FEED_UPLOAD_EXTENSIONS, FEED_MAX_FILE_SIZE, EDIT_FILE_EXTENSIONS, EDIT_MAX_FILE_SIZE
+from faq_common.image_variants import feed_variant_base, enqueue_image_variants
 from .serializers import (
     UserSerializer, 
     StoreSerializer, 
     UsernameCheckSerializer, 
     PasswordCheckSerializer,
-    EditSerializer, MenuSerializer
+    EditSerializer, MenuSerializer, MenuBatchSerializer
 )
 
 # 디버깅을 위한 로거 설정
@@ -367,6 +389,60 @@ class UserStoreDetailView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
    
 
+# 이 이름으로 시작하는 첨부 파일은 메뉴 엑셀 양식으로 보고 메뉴를 등록
+MENU_TEMPLATE_PREFIX = '무물_초기_데이터_입력_양식'
+
+
+def start_menu_import(edit):
+    """
+    수정 요청에 메뉴 엑셀 양식이 첨부되었으면 메뉴 등록 작업을 큐에 넣고 작업 ID를 반환 (아니면 None).
+    작업 큐를 사용할 수 없으면 요청 안에서 바로 처리하고 None을 반환한다.
+    """
+    file_path = edit.file.path
+    if not os.path.basename(file_path).startswith(MENU_TEMPLATE_PREFIX):
+        return None
+
+    store = edit.user.stores.first()
+    if store is None:
+        logger.error(f"Error processing Excel file: 사용자의 매장이 없습니다 ({edit.user.user_id})")
+        return None
+
+    try:
+        job_id = enqueue_menu_import(edit.user.user_id, file_path, store.store_id)
+        logger.debug(f"Excel import queued for store_id: {store.store_id} ({job_id})")
+        return job_id
+    except RedisError as e:
+        # 작업 큐를 사용할 수 없으면 기존과 같이 바로 처리
+        logger.warning(f"작업 큐를 사용할 수 없어 엑셀 파일을 바로 처리합니다: {e}")
+        process_excel_and_save_to_db(file_path, store.store_id)
+        logger.debug(f"Excel file processed for store_id: {store.store_id}")
+        return None
+
+
+def save_edit_file(user, title, content, file):
+    """
+    파일이 첨부된 수정 요청을 저장하고 (응답 데이터, 검증 오류)를 반환.
+    """
+    edit_serializer = EditSerializer(data={
+        'user': user.user_id,
+        'title': title,
+        'content': content,
+        'file': file
+    })
+    if not edit_serializer.is_valid():
+        logger.debug(f"에러 메시지 : {edit_serializer.errors}")
+        return None, edit_serializer.errors
+
+    edit = edit_serializer.save()
+    edit_data = dict(edit_serializer.data)
+    # 메뉴 엑셀 양식은 작업 큐에서 처리되므로 진행 상황 조회 경로를 함께 반환
+    import_job_id = start_menu_import(edit)
+    if import_job_id:
+        edit_data['import_job_id'] = import_job_id
+        edit_data['import_status_url'] = f"/api/edit/import-status/{import_job_id}/"
+    return edit_data, None
+
+
 # 사용자 게시물 등록 API
 class EditView(APIView):
     # 이 뷰는 로그인된 사용자만 접근 가능하도록 설정
@@ -389,21 +465,12 @@ class EditView(APIView):
         # 클라이언트에서 전달받은 데이터를 사용하여 'Edit' 객체를 생성
         if files:
             for file in files:
-                data = {
-                    'user': request.user.user_id,
-                    'title': request.data.get('title', ''),
-                    'content': request.data.get('content', ''),
-                    'file': file  # 각각의 파일을 데이터에 추가
-                }
-
-                edit_serializer = EditSerializer(data=data)
-                
-                if edit_serializer.is_valid():
-                    edit_serializer.save()
-                    saved_data.append(edit_serializer.data)
-                else:
-                    logger.debug(f"에러 메시지 : {edit_serializer.errors}")
-                    return Response(edit_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+                edit_data, errors = save_edit_file(
+                    request.user, request.data.get('title', ''), request.data.get('content', ''), file
+                )
+                if errors:
+                    return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+                saved_data.append(edit_data)
         else:
             # 파일이 없을 경우, 제목과 내용만 처리
             data = {
@@ -424,6 +491,43 @@ class EditView(APIView):
         return Response(saved_data, status=status.HTTP_201_CREATED)
 
 
+# 엑셀 메뉴 등록 작업의 진행 상황과 결과를 조회하는 API
+class MenuImportStatusView(APIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]  # 인증된 사용자만 접근 가능
+
+    def get(self, request, job_id, *args, **kwargs):
+        try:
+            job = get_menu_import_job(request.user.user_id, job_id)
+        except RedisError as e:
+            logger.error(f"작업 큐 조회 중 오류 발생: {e}")
+            return Response({"status": "error", "message": "작업 상태를 조회할 수 없습니다."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        # 다른 사용자의 작업은 조회할 수 없음
+        if job is None:
+            return Response({"status": "not found", "message": "작업을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+
+        response_data = {
+            "status": job['status'],
+            "job_id": job_id,
+            "progress": job['progress'],
+            "rows_processed": job['current'],
+            "total_rows": job['total'],
+            "message": job['message'],
+            "errors": [],
+        }
+
+        if job['status'] == FAILED:
+            response_data['message'] = job['error']
+        elif job['status'] == DONE and job['result']:
+            response_data['status'] = "success"
+            response_data['rows_processed'] = job['result']['created']
+            response_data['skipped'] = job['result']['skipped']
+            response_data['errors'] = job['result']['errors']
+
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
 # 사용자 프로필 조회 및 업데이트 API
 class UserProfileView(APIView):
     # 이 뷰는 인증된 사용자만 접근할 수 있도록 설정
@@ -536,10 +640,9 @@ class CustomerStoreView(APIView):
     permission_classes = [AllowAny]  # 인증 없이 접근 가능하도록 설정
 
     def dispatch(self, request, *args, **kwargs):
-        data = json.loads(request.body)
-        user_type = data.get('type')  # JSON 본문에서 'type'을 추출합니다.
-        #logger.debug(f"Received type: {user_type}, slug: {slug}")
-
+        # 요청 값은 여기서 한 번만 파싱하여 get/post에서 사용
+        self.params = self.parse_params(request)
+        user_type = self.params.get('type')  # 'type' 값을 추출합니다.
 
         if user_type == 'owner':
             self.authentication_classes = [JWTAuthentication]
@@ -547,28 +650,54 @@ class CustomerStoreView(APIView):
 
         return super().dispatch(request, *args, **kwargs)
 
-    def post(self, request):
-        # 요청에서 'type'과 'slug' 가져오기
-        data = json.loads(request.body)
-        slug = data.get('slug')
-        #logger.debug(f"Post method - Received type: {user_type}, slug: {slug}")
-
+    def parse_params(self, request):
+        """
+        GET은 쿼리 파라미터, POST는 JSON 본문에서 'type'과 'slug'를 가져옴
+        """
+        if request.method in ('GET', 'HEAD'):
+            return request.GET
         try:
-            # slug에 해당하는 공공기관 정보 가져오기
-            store = Store.objects.get(slug=slug)
-            #logger.debug(f"Public institution found: {public}")
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
 
-            # 공공기관 데이터 직렬화
-            store_data = StoreSerializer(store).data
+    def get(self, request):
+        return self.store_page(request, self.params.get('slug'))
 
-            # 응답 데이터 생성
-            response_data = {
-                "store": store_data
-            }
-            return Response(response_data, status=status.HTTP_200_OK)
+    def post(self, request):
+        return self.store_page(request, self.params.get('slug'))
+
+    def store_page(self, request, slug):
+        """
+        공개 매장 페이지(매장 정보, 메뉴, 피드 목록)를 미리 직렬화된 JSON으로 반환.
+        ETag/Last-Modified는 Store.updated_at으로 계산하므로, 변경이 없으면 응답을 만들지 않고 304를 반환한다.
+        """
+        try:
+            validators = store_page_validators(slug)
+            if validators is None:
+                raise Store.DoesNotExist
+            store_id, updated_at = validators
+            etag = store_page_etag(store_id, updated_at)
+
+            response = not_modified(request, etag, epoch(updated_at))
+            if response is not None:
+                return response
+
+            payload = get_payload(store_page_key(slug, updated_at))
+            if payload is None:
+                store = Store.objects.get(slug=slug)
+                payload = build_store_page(store)
+                updated_at = store.updated_at
+                etag = store_page_etag(store.store_id, updated_at)
+
+            response = HttpResponse(payload, content_type='application/json')
+            return set_validators(
+                response, etag, epoch(updated_at), private=self.params.get('type') == 'owner'
+            )
 
         except Store.DoesNotExist:
-            logger.error(f"No public institution found for slug: {slug}")
+            logger.error(f"No store found for slug: {slug}")
             return Response({"error": "해당 매장 정보를 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             logger.error(f"Server error occurred: {str(e)}")
@@ -671,25 +800,6 @@ class QrCodeImageView(APIView):
         except Exception as e:
             return Response({'error': 'An unexpected error occurred.'}, status=500)
 
-# Store 모델의 menu_price 필드를 업데이트하는 헬퍼 함수
-def update_menu_price_field(store):
-    menus = Menu.objects.filter(store=store)
-    logger.debug(f'메뉴 데이터 : {menus}')
-    # 메뉴의 이미지, 이름, 가격, 카테고리를 리스트 형식으로 저장
-    menu_price_data = [
-        {
-            'name': menu.name,
-            'price': float(menu.price),
-            'category': menu.category,
-            'image': str(menu.image.url) if menu.image else None,  # 이미지가 있을 경우 URL로 변환
-            'allergy': menu.allergy if menu.allergy is not None else ""  # 기본값 처리
-        }
-        for menu in menus
-    ]
-    # menu_price 필드를 JSON 문자열로 저장
-    store.menu_price = json.dumps(menu_price_data, ensure_ascii=False)
-    store.save()
-
 # 메뉴 상세 조회, 수정 및 삭제 API
 class MenuListView(APIView):
     authentication_classes = [JWTAuthentication]
@@ -697,27 +807,44 @@ class MenuListView(APIView):
 
     def get_permissions(self):
         """
-        POST 요청의 action과 type 파라미터에 따라 권한을 설정.
-        'view' 액션 및 'customer' 타입의 경우 인증 없이 접근 가능하도록 설정.
+        요청의 action과 type 파라미터에 따라 권한을 설정 (GET은 쿼리 파라미터, POST는 요청 본문).
+        'view', 'view_grouped' 액션 및 'customer' 타입의 경우 인증 없이 접근 가능하도록 설정.
         """
-        if self.request.method == 'POST':
-            action = self.request.data.get('action')
-            type = self.request.data.get('type')
+        if self.request.method in ('GET', 'HEAD', 'POST'):
+            params = self.request.data if self.request.method == 'POST' else self.request.query_params
+            action = params.get('action', 'view' if self.request.method != 'POST' else None)
+            type = params.get('type')
             
-            # action이 'view'이고 type이 'customer'인 경우 인증 불필요
-            if action == 'view' and type == 'customer':
+            # action이 'view' 또는 'view_grouped'이고 type이 'customer'인 경우 인증 불필요
+            if action in ('view', 'view_grouped') and type == 'customer':
                 return []
         
         # 그 외의 경우는 기본 권한 설정
         return super().get_permissions()
 
+    def get(self, request):
+        """
+        조회 action('view', 'view_grouped', 'view_category')을 쿼리 파라미터로 처리.
+        POST 조회와 같은 응답이며, ETag로 조건부 요청을 지원하므로 브라우저/CDN이 캐시할 수 있다.
+        """
+        action = request.query_params.get('action', 'view')
+        slug = request.query_params.get('slug')
+        type_ = request.query_params.get('type')
+
+        if action == 'view':
+            return self.view_menus(request, slug, type_)
+        if action == 'view_grouped':
+            return self.view_grouped_menus(request, slug, type_)
+        if action == 'view_category':
+            return self.view_category(request, slug)
+        return Response({'error': '유효하지 않은 요청입니다.'}, status=status.HTTP_400_BAD_REQUEST)
 
     def post(self, request):
         """
         POST 요청을 처리하여 메뉴를 조회, 생성, 수정, 삭제 또는 카테고리 보기.
         요청 데이터의 'action'에 따라 적절한 메서드를 호출하여 처리.
         """
-        action = request.data.get('action')  # 'create', 'update', 'delete', 'view', 'view_category'
+        action = request.data.get('action')  # 'create', 'update', 'delete', 'view', 'view_category', 'view_grouped'
 
         # 각 action에 따라 적절한 메서드를 호출
         if action == 'view':
@@ -729,6 +856,11 @@ class MenuListView(APIView):
             slug = request.data.get('slug')
             return self.view_category(request, slug)
 
+        if action == 'view_grouped':
+            slug = request.data.get('slug')
+            type_ = request.data.get('type')
+            return self.view_grouped_menus(request, slug, type_)
+
         if action == 'delete':
             menus = request.data.get('menus', [])
             return self.delete_menus(request, menus)
@@ -792,160 +924,290 @@ class MenuListView(APIView):
         #logger.debug(f"추출된 메뉴 데이터: {menus}")
         return menus
 
-    def create_menus(self, request, menus):
+    def resolve_stores(self, request, menus, errors):
         """
-        메뉴 생성 
+        요청한 slug의 스토어를 한 번의 쿼리로 조회하여 {slug: Store}로 반환.
+        사용자의 스토어가 아닌 slug를 가진 항목은 errors[index]에 404 오류로 기록.
         """
-        created_menus = []
-
-        #logger.debug(f"create : {request.data}")
-
-        with transaction.atomic():  # 트랜잭션 범위 설정
-            for menu_data in menus:
-                store_slug = unquote(menu_data.get('slug'))
-                try:
-                    store = Store.objects.get(slug=store_slug, user=request.user)
-                except Store.DoesNotExist:
-                    return Response(
-                        {'error': f'{store_slug}에 해당하는 스토어를 찾을 수 없습니다.'},
-                        status=status.HTTP_404_NOT_FOUND
-                    )
+        slugs = [unquote(menu_data.get('slug') or '') for menu_data in menus]
+        stores = {store.slug: store for store in Store.objects.filter(slug__in=set(slugs), user=request.user)}
+        for index, store_slug in enumerate(slugs):
+            if store_slug not in stores:
+                errors.setdefault(index, (status.HTTP_404_NOT_FOUND, f'{store_slug}에 해당하는 스토어를 찾을 수 없습니다.'))
+        return stores
+
+    def resolve_menus(self, stores, menus, errors):
+        """
+        각 항목의 (slug, menu_number) 메뉴를 한 번의 쿼리로 조회하여 {index: Menu}로 반환.
+        찾을 수 없거나 다른 스토어의 메뉴인 항목은 errors[index]에 404 오류로 기록.
+        """
+        numbers = set()
+        for menu_data in menus:
+            try:
+                numbers.add(int(menu_data.get('menu_number')))
+            except (TypeError, ValueError):
+                pass
+        found = {menu.menu_number: menu for menu in Menu.objects.filter(menu_number__in=numbers)}
+
+        targets = {}
+        for index, menu_data in enumerate(menus):
+            if index in errors:
+                continue
+            store = stores[unquote(menu_data.get('slug'))]
+            menu_number = menu_data.get('menu_number')
+            try:
+                menu = found.get(int(menu_number))
+            except (TypeError, ValueError):
+                menu = None
+            if menu is None or menu.store_id != store.store_id:
+                errors[index] = (status.HTTP_404_NOT_FOUND, f'{menu_number}에 해당하는 메뉴를 찾을 수 없습니다.')
+                continue
+            menu.store = store
+            targets[index] = menu
+        return targets
+
+    def batch_results(self, menus, errors, result_status, menu_numbers=None):
+        """
+        항목별 결과 목록 [{index, menu_number, status, error}]을 생성.
+        오류가 있으면 배치 전체가 반영되지 않으므로 오류 항목은 'error', 나머지 항목은 'skipped'로 표시.
+        """
+        results = []
+        for index, menu_data in enumerate(menus):
+            menu_number = menu_numbers[index] if menu_numbers else menu_data.get('menu_number')
+            if index in errors:
+                results.append({'index': index, 'menu_number': menu_number, 'status': 'error', 'error': errors[index][1]})
+            else:
+                results.append({
+                    'index': index, 'menu_number': menu_number,
+                    'status': 'skipped' if errors else result_status, 'error': None,
+                })
+        return results
 
-                last_menu = Menu.objects.filter(store=store).order_by('-menu_number').first()
-                new_menu_number = last_menu.menu_number + 1 if last_menu else 1
-                logger.debug(f"New menu_number: {new_menu_number} for store: {store_slug}")
+    def reject_batch(self, menus, errors):
+        """
+        배치는 전부 반영되거나 전혀 반영되지 않음 (all-or-nothing).
+        첫 번째 오류 항목의 상태 코드와 메시지로 응답하고, results에 거부 원인이 된 항목을 표시.
+        """
+        index = min(errors)
+        http_status, error = errors[index]
+        logger.debug(f"메뉴 배치 거부 (index {index}): {error}")
+        return Response(
+            {'error': error, 'results': self.batch_results(menus, errors, None)},
+            status=http_status
+        )
 
-                menu_data['store'] = store.store_id
-                menu_data['menu_number'] = new_menu_number
+    def create_menus(self, request, menus):
+        """
+        메뉴 생성 (모든 메뉴를 검증한 뒤 한 트랜잭션에서 bulk_create로 저장).
+        하나라도 실패하면 아무것도 저장하지 않고 results에 실패한 항목을 표시.
+        """
+        errors = {}
+        stores = self.resolve_stores(request, menus, errors)
+
+        new_menus = []
+        for index, menu_data in enumerate(menus):
+            serializer = MenuBatchSerializer(data=menu_data)
+            if not serializer.is_valid():
+                logger.debug(f"Menu serializer errors: {serializer.errors}")
+                errors.setdefault(index, (status.HTTP_400_BAD_REQUEST, serializer.errors))
+            elif index not in errors:
+                new_menus.append(Menu(store=stores[unquote(menu_data.get('slug'))], **serializer.validated_data))
+        if errors:
+            return self.reject_batch(menus, errors)
 
-                serializer = MenuSerializer(data=menu_data)
-                if serializer.is_valid():
-                    logger.debug("Serializer is valid, saving the menu")
-                    menu = serializer.save()
-                    logger.debug(f"Menu saved: {menu}")
-                    created_menus.append(serializer.data)
-                else:
-                    logger.debug(f"Menu serializer errors: {serializer.errors}")
-                    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():  # 트랜잭션 범위 설정
+            Menu.objects.bulk_create(new_menus)
 
-            # Store의 menu_price 필드 업데이트
-            update_menu_price_field(store)
+            # Store의 menu_price 필드에 새 메뉴만 추가
+            for store in stores.values():
+                patch_menu_price(store, upserted=[menu for menu in new_menus if menu.store_id == store.store_id])
 
-        return Response({'created_menus': created_menus}, status=status.HTTP_201_CREATED)
+        created_menus = MenuBatchSerializer(new_menus, many=True).data
+        results = self.batch_results(menus, errors, 'created', [menu.menu_number for menu in new_menus])
+        return Response({'created_menus': created_menus, 'results': results}, status=status.HTTP_201_CREATED)
 
     
     def update_menus(self, request, menus):
         """
-        메뉴 수정
+        메뉴 수정 (대상 메뉴를 한 번에 조회하고, 검증 후 한 트랜잭션에서 bulk_update로 저장).
+        하나라도 실패하면 아무것도 수정하지 않고 results에 실패한 항목을 표시.
         """
-        updated_menus = []
-
-        for menu_data in menus:
-            store_slug = unquote(menu_data.get('slug'))
-            try:
-                store = Store.objects.get(slug=store_slug, user=request.user)
-            except Store.DoesNotExist:
-                return Response(
-                    {'error': f'{store_slug}에 해당하는 스토어를 찾을 수 없습니다.'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-
-            menu_number = menu_data.get('menu_number')
-            try:
-                menu = Menu.objects.get(store=store, menu_number=menu_number)
-            except Menu.DoesNotExist:
-                return Response(
-                    {'error': f'{menu_number}에 해당하는 메뉴를 찾을 수 없습니다.'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-
+        errors = {}
+        stores = self.resolve_stores(request, menus, errors)
+        targets = self.resolve_menus(stores, menus, errors)
+
+        fields = set()
+        images = []
+        changes = []
+        for index, menu in targets.items():
+            menu_data = menus[index]
             # 이미지 파일이 존재하면 업데이트, 그렇지 않으면 기존 이미지 유지
-            if 'image' in request.FILES:
-                menu_data['image'] = request.FILES['image']
-            else:
+            if menu_data.get('image') is None:
                 menu_data.pop('image', None)  # 이미지가 없으면 해당 필드 삭제
 
-            serializer = MenuSerializer(menu, data=menu_data, partial=True)
-
-            if serializer.is_valid():
-                updated_menu = serializer.save()
-                updated_menus.append(serializer.data)
-            else:
-                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-            
-        # Store의 menu_price 필드 업데이트
-        update_menu_price_field(store)
-
-        return Response({'updated_menus': updated_menus}, status=status.HTTP_200_OK)
+            serializer = MenuBatchSerializer(menu, data=menu_data, partial=True)
+            if not serializer.is_valid():
+                errors[index] = (status.HTTP_400_BAD_REQUEST, serializer.errors)
+                continue
+            changes.append((menu, serializer.validated_data))
+        if errors:
+            return self.reject_batch(menus, errors)
+
+        # 모든 항목이 유효할 때만 메뉴 객체에 변경 사항을 적용
+        for menu, validated_data in changes:
+            for attr, value in validated_data.items():
+                if attr == 'image':
+                    images.append((menu, value))
+                else:
+                    setattr(menu, attr, value)
+                fields.add(attr)
+
+        updated = list({menu.menu_number: menu for menu in targets.values()}.values())
+        with transaction.atomic():
+            # 새 이미지는 storage에 저장하고, 더 이상 참조되지 않는 이전 이미지는 커밋 후 정리
+            for menu, image in images:
+                previous = menu.image.name
+                menu.image.save(image.name, image, save=False)
+                if previous and previous != menu.image.name:
+                    transaction.on_commit(lambda name=previous: media_storage.release(name))
+
+            now = timezone.now()
+            for menu in updated:
+                menu.updated_at = now
+            Menu.objects.bulk_update(updated, list(fields | {'updated_at'}))
+
+            # Store의 menu_price 필드에서 수정된 메뉴만 갱신
+            for store in stores.values():
+                patch_menu_price(store, upserted=[menu for menu in updated if menu.store_id == store.store_id])
+
+        updated_menus = MenuBatchSerializer(list(targets.values()), many=True).data
+        results = self.batch_results(menus, errors, 'updated', [menu.menu_number for menu in targets.values()])
+        return Response({'updated_menus': updated_menus, 'results': results}, status=status.HTTP_200_OK)
 
     
     def delete_menus(self, request, menus):
         """
-        메뉴 삭제 
+        메뉴 삭제 (대상 메뉴를 한 번에 조회하고 한 번의 쿼리로 삭제).
+        하나라도 실패하면 아무것도 삭제하지 않고 results에 실패한 항목을 표시.
         """
-        deleted_menus = []
+        errors = {}
+        for index, menu_data in enumerate(menus):
+            if not menu_data.get('slug') or not menu_data.get('menu_number'):
+                errors[index] = (status.HTTP_400_BAD_REQUEST, 'Slug 또는 menu_number가 제공되지 않았습니다.')
 
-        for menu_data in menus:
-            store_slug = unquote(menu_data.get('slug'))
-            menu_number = menu_data.get('menu_number')
+        stores = self.resolve_stores(request, menus, errors)
+        targets = self.resolve_menus(stores, menus, errors)
+        if errors:
+            return self.reject_batch(menus, errors)
 
-            if not store_slug or not menu_number:
-                return Response(
-                    {'error': 'Slug 또는 menu_number가 제공되지 않았습니다.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+        deleted_numbers = {menu.menu_number for menu in targets.values()}
+        with transaction.atomic():
+            Menu.objects.filter(menu_number__in=deleted_numbers).delete()
 
-            try:
-                store = Store.objects.get(slug=store_slug, user=request.user)
-            except Store.DoesNotExist:
-                return Response(
-                    {'error': f'{store_slug}에 해당하는 스토어를 찾을 수 없습니다.'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
+            # Store의 menu_price 필드에서 삭제된 메뉴만 제거
+            for store in stores.values():
+                patch_menu_price(store, deleted=[menu.menu_number for menu in targets.values() if menu.store_id == store.store_id])
 
-            try:
-                menu = Menu.objects.get(store=store, menu_number=menu_number)
-                menu.delete()
-                deleted_menus.append(menu_number)
-            except Menu.DoesNotExist:
-                return Response(
-                    {'error': f'{menu_number}에 해당하는 메뉴를 찾을 수 없습니다.'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-            
-        # Store의 menu_price 필드 업데이트
-        update_menu_price_field(store)
+        deleted_menus = [menu_data.get('menu_number') for menu_data in menus]
+        results = self.batch_results(menus, errors, 'deleted')
+        return Response({'deleted_menus': deleted_menus, 'results': results}, status=status.HTTP_200_OK)
 
-        return Response({'deleted_menus': deleted_menus}, status=status.HTTP_200_OK)
-
-    def view_menus(self, request, slug, type_):
+    def get_menu_store(self, request, slug, type_):
         """
-        특정 스토어의 메뉴 목록을 조회
+        메뉴를 조회할 스토어를 찾고 권한을 확인하여 (store, 오류 응답)을 반환
         """
-        store_slug = slug
-
         try:
             # store를 조회 (소유자 상관 없이 모든 사용자에게 보여줌)
-            store = Store.objects.get(slug=store_slug)
+            store = Store.objects.get(slug=slug)
         except Store.DoesNotExist:
-            return Response(
-                {'error': f'{store_slug}에 해당하는 스토어를 찾을 수 없습니다.'},
+            return None, Response(
+                {'error': f'{slug}에 해당하는 스토어를 찾을 수 없습니다.'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
         # type이 'owner'일 경우에만 권한 체크
         if type_ == 'owner':
             if not request.user.is_authenticated:
-                return Response({'error': '인증이 필요합니다.'}, status=status.HTTP_401_UNAUTHORIZED)
+                return None, Response({'error': '인증이 필요합니다.'}, status=status.HTTP_401_UNAUTHORIZED)
 
             # 인증된 경우에도 store 소유자인지 확인
             if store.user != request.user:
-                return Response({'error': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
+                return None, Response({'error': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
+
+        return store, None
+
+    def versioned_menu_response(self, request, slug, type_, kind, payload_key, build_data):
+        """
+        메뉴 버전으로 ETag를 계산하여 조건부 요청을 처리 (메뉴가 바뀌면 버전이 바뀜).
+        손님용 조회는 버전별로 미리 직렬화된 응답을 사용하므로, 변경이 없으면 DB를 조회하지 않는다.
+        """
+        version = menu_version(slug)
+        if version is None:
+            return Response(
+                {'error': f'{slug}에 해당하는 스토어를 찾을 수 없습니다.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        etag = make_etag(kind, version)
+
+        if type_ == 'customer':
+            response = not_modified(request, etag)
+            if response is not None:
+                return response
+
+            key = payload_key(slug, version)
+            payload = get_payload(key)
+            if payload is None:
+                store, error = self.get_menu_store(request, slug, type_)
+                if error:
+                    return error
+                payload = JSONRenderer().render(build_data(store))
+                set_payload(key, payload)
+            return set_validators(HttpResponse(payload, content_type='application/json'), etag)
+
+        # 소유자 조회는 권한을 확인한 뒤 조건부 요청을 처리
+        store, error = self.get_menu_store(request, slug, type_)
+        if error:
+            return error
+        return conditional_response(
+            request, lambda: Response(build_data(store), status=status.HTTP_200_OK), etag, private=True
+        )
 
+    def view_menus(self, request, slug, type_):
+        """
+        특정 스토어의 메뉴 목록을 조회
+        """
         # 메뉴 목록 조회 (type이 'customer'일 경우 권한 체크 없이 조회 가능)
-        menus = Menu.objects.filter(store=store)
-        serializer = MenuSerializer(menus, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.versioned_menu_response(
+            request, slug, type_, 'menus', menu_payload_key,
+            lambda store: MenuSerializer(Menu.objects.filter(store=store), many=True).data
+        )
+
+    def view_grouped_menus(self, request, slug, type_):
+        """
+        카테고리 목록과 카테고리별 메뉴 목록을 한 번에 조회
+        (카테고리 조회와 메뉴 조회를 따로 요청하지 않도록 함)
+        """
+        return self.versioned_menu_response(
+            request, slug, type_, 'menus_grouped', grouped_menus_key, self.grouped_menu_data
+        )
+
+    def grouped_menu_data(self, store):
+        # 메뉴를 등록 순서대로 카테고리별로 묶음 (카테고리도 처음 등록된 메뉴 순서)
+        groups = {}
+        menus = MenuSerializer(Menu.objects.filter(store=store).order_by('menu_number'), many=True).data
+        for menu in menus:
+            groups.setdefault(menu['category'], []).append(menu)
+
+        return {
+            'categories': [
+                {'value': category, 'label': category, 'count': len(items)}
+                for category, items in groups.items() if category
+            ],
+            'menus': [
+                {'category': category, 'menus': items}
+                for category, items in groups.items()
+            ],
+        }
 
         
     def view_category(self, request, slug):
@@ -954,75 +1216,57 @@ class MenuListView(APIView):
         주어진 스토어의 카테고리 목록을 조회하여 반환
         """
         store_slug = (slug)
-        try:
-            # 해당 가게를 조회
-            store = Store.objects.get(slug=store_slug, user=request.user)
-        except Store.DoesNotExist:
+
+        # 카테고리별 메뉴 수 인덱스 (메뉴가 바뀌지 않았으면 캐시에서 가져오므로 메뉴를 다시 조회하지 않음)
+        index = category_index(store_slug)
+        if index is None or index['user_id'] != request.user.pk:
             return Response(
                 {'error': f'{store_slug}에 해당하는 스토어를 찾을 수 없습니다.'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # store와 연결된 메뉴들을 필터링하여 메뉴 목록을 가져옴
-        menus = Menu.objects.filter(store=store)
-
-        # 메뉴에서 카테고리 리스트 추출 및 중복 제거
-        categories = menus.values_list('category', flat=True).distinct()
-
-        # 카테고리 옵션을 프론트엔드에 맞게 변환
-        category_options = [{'value': category, 'label': category} for category in categories if category]
+        # 카테고리 옵션을 프론트엔드에 맞게 변환 (count: 카테고리의 메뉴 수)
+        category_options = [
+            {'value': entry['category'], 'label': entry['category'], 'count': entry['count']}
+            for entry in index['categories'] if entry['category']
+        ]
 
         # 카테고리 리스트 반환
-        return Response(category_options, status=status.HTTP_200_OK)
+        return conditional_response(
+            request, lambda: Response(category_options, status=status.HTTP_200_OK),
+            make_etag('categories', menu_version(store_slug)), private=True
+        )
     
 
 
-class StatisticsView(APIView):
-    authentication_classes = [JWTAuthentication] 
-    permission_classes = [IsAuthenticated]  # 인증된 사용자만 접근 가능
-
-    def post(self, request, *args, **kwargs):
-        try:
-            # 사용자별 CSV 파일 폴더 경로 지정
-            folder_path = f'conversation_history/{request.user.user_id}'
-
-            # 사용자 폴더가 존재하는지 확인
-            if not os.path.exists(folder_path):
-                #logger.debug(f"{folder_path} 경로가 존재하지 않습니다.")
-                return Response({"status": "no folder", "message": "사용자 데이터 폴더가 존재하지 않습니다."})
-            
-            # CSV 파일 병합 함수 호출
-            merged_file_path = merge_csv_files(folder_path)
-            
-            # 병합된 파일이 없으면 파일 없음 메시지 반환
-            if not merged_file_path or not os.path.exists(merged_file_path):
-                #logger.debug("병합된 파일이 존재하지 않습니다.")
-                return Response({"status": "no file", "message": "해당 파일이 존재하지 않습니다."}, status=status.HTTP_404_NOT_FOUND)
+class StatisticsView(BaseStatisticsView):
+    authentication_classes = [JWTAuthentication]
+    tenant = 'faq'
+    status_url = '/api/statistics/status/{job_id}/'
 
 
-            # 이미지 URL을 응답에 포함
-            response_data = {
-                "status": "success",
-                "data": "",
-                "image_url": f"/media/statistics/{request.user.user_id}/most_common_utterances.png"
-            }
+class StatisticsStatusView(BaseStatisticsStatusView):
+    authentication_classes = [JWTAuthentication]
+    tenant = 'faq'
 
-            return Response(response_data, status=status.HTTP_200_OK)
-
-        except Exception as e:
-            # 오류 메시지 로그 출력
-            logger.error(f"오류 발생: {str(e)}")
-            return Response({"status": "error", "message": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        
 
 class FeedListView(APIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [AllowAny]
 
+    def get(self, request):
+        # POST 조회와 같은 응답을 쿼리 파라미터로 조회 (브라우저/CDN 캐시 가능)
+        return self.feed_list(request, request.query_params)
+
     def post(self, request):
         try:
-            print(f"Request body: {request.body}")
             data = json.loads(request.body)
+        except ValueError:
+            return Response({'error': '요청 본문이 올바른 JSON 형식이 아닙니다.'}, status=400)
+        return self.feed_list(request, data)
+
+    def feed_list(self, request, data):
+        try:
             slug = data.get('slug')
             store_id = data.get('store_id')
 
@@ -1034,60 +1278,50 @@ class FeedListView(APIView):
                 if not request.user.is_authenticated:
                     return Response({'error': '인증이 필요합니다.'}, status=401)
 
-                # 인증된 사용자만 store_id 접근 허용
-                print(f"Authenticated user: {request.user.username}")
-                print(f"Using provided store_id: {store_id}")
-
-            # slug를 기반으로 store_id 조회
+            # slug 또는 store_id로 매장의 수정 시각 조회 (피드가 바뀌면 updated_at이 갱신됨)
             if slug:
-                try:
-                    store = Store.objects.get(slug=slug)
-                    store_id = store.store_id
-                    print(f"Found store_id from slug: {store_id}")
-                except Store.DoesNotExist:
-                    print(f"Store with slug '{slug}' not found.")
+                validators = Store.objects.filter(slug=slug).values_list('store_id', 'updated_at').first()
+                if validators is None:
+                    logger.debug(f"Store with slug '{slug}' not found.")
                     return Response({'error': f'슬러그 "{slug}"에 해당하는 매장을 찾을 수 없습니다.'}, status=404)
+            else:
+                validators = Store.objects.filter(store_id=store_id).values_list('store_id', 'updated_at').first()
 
-            # store_id에 해당하는 디렉토리 경로
-            store_dir = os.path.join(settings.MEDIA_ROOT, 'uploads', f'store_{store_id}/feed')
-            print(f"Generated store directory: {store_dir}")
-
-            # 디렉토리 존재 여부 확인
-            if not os.path.exists(store_dir):
-                print(f"Directory does not exist. Creating directory: {store_dir}")
-                os.makedirs(store_dir, exist_ok=True)  # 디렉토리 생성
+            etag, last_modified = None, None
+            if validators:
+                store_id, updated_at = validators
+                etag, last_modified = make_etag('feed', store_id, int(updated_at.timestamp() * 1000000)), epoch(updated_at)
 
-            # 디렉토리 내 파일 목록 가져오기
-            files = os.listdir(store_dir)
-            print(f"Files in directory: {files}")
+            # cursor 또는 page_size가 있으면 나누어 조회 (없으면 기존과 같이 전체 목록)
+            if data.get('cursor') or data.get('page_size'):
+                try:
+                    cursor = data.get('cursor')
+                    if cursor:
+                        decode_cursor(cursor)
+                    page_size = parse_page_size(data.get('page_size'))
+                except ValueError:
+                    return Response({'error': '잘못된 cursor 또는 page_size 값입니다.'}, status=400)
+                with_total = str(data.get('with_total', '')).lower() in ('1', 'true')
+                build = lambda: Response(
+                    {'success': True, 'data': feed_page(store_id, cursor, page_size, with_total)}, status=200
+                )
+            else:
+                build = lambda: self.feed_response(store_id)
 
-            # 파일 정보를 파싱하여 ID, 이름, 경로로 매핑
-            image_files = []
-            for file in files:
-                if file.lower().endswith(('.png', '.jpg', '.jpeg', '.gif')):
-                    # 파일 이름에서 ID와 이름 추출
-                    base_name, ext = os.path.splitext(file)
-                    parts = base_name.rsplit('_', 1)  # 마지막 '_' 기준으로 분리
-                    name = parts[0] if len(parts) > 1 else 'Unnamed'
-                    file_id = parts[1] if len(parts) > 1 else None
+            return conditional_response(request, build, etag, last_modified, private=not slug)
 
-                    image_files.append({
-                        'id': file_id,
-                        'name': name,
-                        'path': os.path.join('uploads', f"store_{store_id}/feed", file).replace("\\", "/"),
-                        'ext' : ext
-                    })
+        except Exception as e:
+            logger.error(f"피드 목록 조회 중 오류 발생: {str(e)}")
+            return Response({'error': f'오류가 발생했습니다: {str(e)}'}, status=500)
 
-            print(f"Image files: {image_files}")
+    def feed_response(self, store_id):
+        # 피드 폴더의 이미지 목록 (조회 시에는 폴더를 만들지 않음)
+        image_files = list_feed_images(store_id)
 
-            if not image_files:
-                return Response({'message': f'{store_id}번 매장에서 이미지 파일을 찾을 수 없습니다.'}, status=200)
+        if not image_files:
+            return Response({'message': f'{store_id}번 매장에서 이미지 파일을 찾을 수 없습니다.'}, status=200)
 
-            return Response({'success': True, 'data': {'images': image_files}}, status=200)
-
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            return Response({'error': f'오류가 발생했습니다: {str(e)}'}, status=500)
+        return Response({'success': True, 'data': {'images': image_files}}, status=200)
 
 
 class FeedUploadView(APIView):
@@ -1099,7 +1333,10 @@ class FeedUploadView(APIView):
         if not store_id:
             return Response({'error': 'store_id가 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        upload_dir = os.path.join(settings.MEDIA_ROOT, f"uploads/store_{store_id}/feed")
+        if not Store.objects.filter(store_id=store_id).exists():
+            return Response({'error': '매장을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+
+        upload_dir = feed_dir(store_id)
 
         # 폴더가 없으면 생성
         os.makedirs(upload_dir, exist_ok=True)
@@ -1108,31 +1345,35 @@ class FeedUploadView(APIView):
         if not file:
             return Response({'error': '파일이 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        original_name = os.path.splitext(file.name)[0]  # 파일명에서 확장자를 제외한 원래 이름
-        _, ext = os.path.splitext(file.name)  # 확장자 분리
-
-        # 고유 ID 생성 (UUID 사용)
-        new_id = str(uuid.uuid4())  # UUID를 문자열로 변환
-
-        # 고유 파일 이름 생성
-        unique_filename = f"{original_name}_{new_id}{ext}"  # 원래 이름 + 고유 ID + 확장자
-
+        new_id, unique_filename = new_feed_file_name(file.name)  # 원래 이름 + 고유 ID + 확장자
         file_path = os.path.join(upload_dir, unique_filename)
 
         with open(file_path, 'wb+') as destination:
             for chunk in file.chunks():
                 destination.write(chunk)
 
-        relative_path = os.path.relpath(file_path, settings.MEDIA_ROOT).replace("\\", "/")  # MEDIA_ROOT 기준 상대 경로 반환
+        return Response(publish_feed_file(store_id, new_id, unique_filename), status=status.HTTP_201_CREATED)
+
+
+def publish_feed_file(store_id, new_id, unique_filename):
+    """
+    피드 폴더에 저장된 파일을 피드 목록에 등록하고 업로드 응답 데이터를 반환.
+    """
+    file_path = os.path.join(feed_dir(store_id), unique_filename)
+    relative_path = os.path.relpath(file_path, settings.MEDIA_ROOT).replace("\\", "/")  # MEDIA_ROOT 기준 상대 경로 반환
+    index_feed_file(store_id, unique_filename)  # 피드 이미지 목록에 추가
+    enqueue_image_variants(relative_path, feed_variant_base(store_id, new_id), {'feed_store_id': store_id})  # 썸네일 등 생성
+    touch_store(store_id)  # 공개 매장 페이지의 피드 목록 갱신
+
+    return {
+        'success': True,
+        'message': '이미지 업로드 성공',
+        'id': new_id,  # UUID를 ID로 반환
+        'file_path': relative_path,  # 저장된 상대 경로
+        'stored_name': unique_filename,  # 저장된 파일 이름
+        'ext': os.path.splitext(unique_filename)[1]  # 확장자
+    }
 
-        return Response({
-            'success': True,
-            'message': '이미지 업로드 성공',
-            'id': new_id,  # UUID를 ID로 반환
-            'file_path': relative_path,  # 저장된 상대 경로
-            'stored_name': unique_filename,  # 저장된 파일 이름
-            'ext' : ext # 확장자 
-        }, status=status.HTTP_201_CREATED)
 
 class FeedDeleteView(APIView):
     authentication_classes = [JWTAuthentication] 
@@ -1162,10 +1403,13 @@ class FeedDeleteView(APIView):
             if os.path.exists(file_path):
                 print(f"File exists. Deleting file: {file_path}")
                 os.remove(file_path)  # 파일 삭제
+                remove_feed_file(store_id, image_id)  # 피드 이미지 목록에서 삭제
+                touch_store(store_id)  # 공개 매장 페이지의 피드 목록 갱신
                 print("File deleted successfully.")
                 return Response({'success': True, 'message': '이미지 삭제 성공'}, status=status.HTTP_200_OK)
             else:
                 print("Error: File does not exist.")
+                remove_feed_file(store_id, image_id)  # 파일이 없으면 목록에 남은 항목도 정리
                 return Response({'success': False, 'message': '이미지를 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
 
         except Exception as e:
@@ -1200,7 +1444,7 @@ class FeedRenameView(APIView):
             )
 
         # 경로 디버깅
-        base_dir = os.path.join(settings.MEDIA_ROOT, f"uploads/store_{store_id}/feed")
+        base_dir = feed_dir(store_id)
         #print(f"Base directory: {base_dir}")
         
         old_file_path = os.path.join(base_dir, image_id)
@@ -1220,6 +1464,8 @@ class FeedRenameView(APIView):
             if os.path.exists(old_file_path):
                 #print("Old file exists. Proceeding to rename.")
                 os.rename(old_file_path, new_file_path)  # 파일 이름 변경
+                rename_feed_file(store_id, image_id, new_file_name)  # 피드 이미지 목록에 반영
+                touch_store(store_id)  # 공개 매장 페이지의 피드 목록 갱신
                 #print("File renamed successfully.")
                 return Response(
                     {
@@ -1243,6 +1489,159 @@ class FeedRenameView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+# 조각 업로드 용도별 허용 확장자와 최대 크기
+CHUNKED_UPLOAD_PURPOSES = {
+    'feed': {'extensions': FEED_UPLOAD_EXTENSIONS, 'max_size': FEED_MAX_FILE_SIZE},
+    'edit': {'extensions': EDIT_FILE_EXTENSIONS, 'max_size': EDIT_MAX_FILE_SIZE},
+}
+
+
+def chunked_upload_owner(user):
+    return f'faq:{user.user_id}'
+
+
+def get_chunked_upload(request, upload_id):
+    """
+    요청한 사용자의 업로드를 반환 (없거나 다른 사용자의 업로드이면 UploadError).
+    """
+    upload = ChunkedUpload(upload_id)
+    upload.check_owner(chunked_upload_owner(request.user))
+    return upload
+
+
+def chunked_upload_status(upload):
+    data = upload.status()
+    data['chunk_url'] = f"/api/uploads/{upload.upload_id}/chunks/{{index}}/"
+    data['finalize_url'] = f"/api/uploads/{upload.upload_id}/finalize/"
+    return data
+
+
+# 피드 이미지/수정 요청 파일을 조각으로 나누어 올리는 API (init → 조각 PUT → finalize)
+class ChunkedUploadInitView(APIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        업로드를 시작. purpose('feed' 또는 'edit'), file_name, size(바이트)와 선택 항목 chunk_size,
+        feed는 store_id, edit은 title/content를 받는다. 확장자와 크기는 조각을 받기 전에 확인한다.
+        """
+        purpose = request.data.get('purpose')
+        config = CHUNKED_UPLOAD_PURPOSES.get(purpose)
+        if config is None:
+            return Response({'error': "purpose는 'feed' 또는 'edit'이어야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if purpose == 'feed':
+            store_id = request.data.get('store_id')
+            if not store_id or not Store.objects.filter(store_id=store_id, user=request.user).exists():
+                return Response({'error': '매장을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+            extra = {'store_id': int(store_id)}
+        else:
+            extra = {'title': request.data.get('title', ''), 'content': request.data.get('content', '')}
+
+        try:
+            upload = ChunkedUpload.create(
+                chunked_upload_owner(request.user), purpose,
+                request.data.get('file_name', ''), request.data.get('size'),
+                config['max_size'], config['extensions'],
+                chunk_size=request.data.get('chunk_size'), extra=extra,
+            )
+        except UploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(chunked_upload_status(upload), status=status.HTTP_201_CREATED)
+
+
+class ChunkedUploadView(APIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, upload_id):
+        """
+        업로드 상태 (받은 조각과 다시 보내야 하는 조각 목록). 연결이 끊긴 뒤 이어 올릴 때 사용.
+        """
+        try:
+            upload = get_chunked_upload(request, upload_id)
+            return Response(chunked_upload_status(upload), status=status.HTTP_200_OK)
+        except UploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+    def delete(self, request, upload_id):
+        """
+        업로드를 취소하고 받은 조각을 삭제.
+        """
+        try:
+            get_chunked_upload(request, upload_id).delete()
+        except UploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'message': '업로드를 취소했습니다.'}, status=status.HTTP_200_OK)
+
+
+class ChunkedUploadChunkView(APIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def put(self, request, upload_id, index):
+        """
+        index번 조각을 요청 본문(application/octet-stream) 그대로 받아 파일에 바로 기록.
+        X-Chunk-Checksum 헤더(조각의 sha256)가 있으면 함께 확인한다. 같은 조각을 다시 보내도 된다.
+        """
+        try:
+            upload = get_chunked_upload(request, upload_id)
+        except UploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+        stream = request.stream
+        if stream is None:
+            return Response({'error': '조각 데이터가 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            data = upload.write_chunk(
+                index, stream, request.META.get('CONTENT_LENGTH') or None, request.META.get('HTTP_X_CHUNK_CHECKSUM')
+            )
+        except UploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {'index': index, 'missing_chunks': data['missing_chunks']}, status=status.HTTP_200_OK
+        )
+
+
+class ChunkedUploadFinalizeView(APIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, upload_id):
+        """
+        모든 조각을 받았는지와 파일 전체의 checksum(sha256)을 확인한 뒤 피드 이미지 또는 수정 요청으로 저장.
+        """
+        try:
+            upload = get_chunked_upload(request, upload_id)
+            file_path = upload.finalize(request.data.get('checksum'))
+        except UploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        meta = upload.meta
+        try:
+            if meta['purpose'] == 'feed':
+                store_id = meta['extra']['store_id']
+                new_id, unique_filename = new_feed_file_name(meta['file_name'])
+                os.makedirs(feed_dir(store_id), exist_ok=True)
+                shutil.move(file_path, os.path.join(feed_dir(store_id), unique_filename))
+                response_data = publish_feed_file(store_id, new_id, unique_filename)
+            else:
+                with open(file_path, 'rb') as f:
+                    response_data, errors = save_edit_file(
+                        request.user, meta['extra']['title'], meta['extra']['content'],
+                        File(f, name=meta['file_name'])
+                    )
+                if errors:
+                    return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        finally:
+            upload.delete()
+
+        return Response(response_data, status=status.HTTP_201_CREATED)
+
+
 # 계정 비활성화
 class DeactivateAccountView(APIView):
     """
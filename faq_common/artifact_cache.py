@@ -0,0 +1,194 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+from django.conf import settings
+from .merged_csv import list_conversation_files
+from .webhook_questions import latest_webhook_row_id
+
+logger = logging.getLogger('faq')
+
+# 통계 산출물 캐시의 기본 경로와 최대 디스크 사용량(바이트)
+DEFAULT_CACHE_DIR = 'statistics_cache'
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# 파일을 해시할 때 한 번에 읽는 크기
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """
+    통계 결과와 산출물(병합 CSV, 차트 이미지)을 입력 지문(fingerprint)별로 보관하는 디스크 캐시.
+
+    캐시는 namespace(테넌트 종류: faq, faq_public)별 하위 폴더로 나뉜다.
+
+    - entries/<key>.json: 응답 데이터와 산출물 이름별 blob 해시를 담은 항목
+    - blobs/<해시 앞 2자리>/<해시>: 내용 해시로 저장된 산출물 (같은 내용은 한 번만 저장)
+
+    항목 파일의 수정 시각을 최근 사용 시각으로 사용하며, 전체 크기가 max_bytes를 넘으면
+    가장 오래 사용하지 않은 항목부터 삭제하고 더 이상 참조되지 않는 blob을 정리한다.
+    """
+
+    def __init__(self, namespace='faq', root=None, max_bytes=None):
+        self.namespace = namespace
+        self.root = os.path.join(root or getattr(settings, 'STATISTICS_CACHE_DIR', DEFAULT_CACHE_DIR), namespace)
+        self.max_bytes = max_bytes or getattr(settings, 'STATISTICS_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+        self.entries_dir = os.path.join(self.root, 'entries')
+        self.blobs_dir = os.path.join(self.root, 'blobs')
+
+    def fingerprint(self, folder_path, agent_ids=(), using=None, **params):
+        """
+        입력 집합(대화 기록 파일 목록, 크기, 수정 시각, agent_ids 각각의 webhook_questionlog 최근 행 id)과
+        조회 조건(params)으로 캐시 키를 만든다.
+        """
+        files = []
+        for path in list_conversation_files(folder_path):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append([os.path.basename(path), stat.st_size, stat.st_mtime_ns])
+
+        payload = json.dumps({
+            'files': files,
+            'webhook_row_ids': {agent_id: latest_webhook_row_id(agent_id, using) for agent_id in agent_ids},
+            'params': params,
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.entries_dir, f'{key}.json')
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blobs_dir, digest[:2], digest)
+
+    def get(self, key):
+        """
+        캐시 항목({'result', 'artifacts'})을 반환 (없으면 None). 조회된 항목은 최근 사용으로 갱신된다.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        # 산출물 중 하나라도 정리되었다면 항목 전체를 무효로 처리
+        if not all(os.path.exists(self._blob_path(digest)) for digest in entry['artifacts'].values()):
+            return None
+
+        try:
+            os.utime(entry_path)
+        except FileNotFoundError:
+            return None
+        return entry
+
+    def put(self, key, result, artifacts=None):
+        """
+        결과와 산출물 파일(이름 → 경로)을 key로 저장하고, 용량 제한을 넘으면 오래된 항목을 정리.
+        """
+        digests = {}
+        for name, path in (artifacts or {}).items():
+            if not path or not os.path.exists(path):
+                continue
+            digest = _file_digest(path)
+            blob_path = self._blob_path(digest)
+            if not os.path.exists(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                temp_path = f'{blob_path}.{os.getpid()}.part'
+                shutil.copyfile(path, temp_path)
+                os.replace(temp_path, blob_path)
+            digests[name] = digest
+
+        os.makedirs(self.entries_dir, exist_ok=True)
+        entry_path = self._entry_path(key)
+        temp_path = f'{entry_path}.{os.getpid()}.part'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'result': result, 'artifacts': digests, 'created_at': time.time()}, f, ensure_ascii=False)
+        os.replace(temp_path, entry_path)
+
+        self.evict()
+
+    def restore(self, entry, name, dest_path):
+        """
+        캐시 항목의 산출물을 dest_path로 복원. 해당 산출물이 없으면 False를 반환한다.
+        """
+        digest = entry['artifacts'].get(name)
+        if digest is None:
+            return False
+        os.makedirs(os.path.dirname(dest_path) or '.', exist_ok=True)
+        temp_path = f'{dest_path}.part'
+        try:
+            shutil.copyfile(self._blob_path(digest), temp_path)
+            os.replace(temp_path, dest_path)
+        except FileNotFoundError:
+            return False
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return True
+
+    def evict(self):
+        """
+        전체 크기가 max_bytes 이하가 될 때까지 가장 오래 사용하지 않은 항목부터 삭제.
+        """
+        if not os.path.isdir(self.entries_dir):
+            return
+
+        entries = []
+        for name in os.listdir(self.entries_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.entries_dir, name)
+            try:
+                with open(path, encoding='utf-8') as f:
+                    artifacts = json.load(f)['artifacts']
+                stat = os.stat(path)
+            except (FileNotFoundError, json.JSONDecodeError, KeyError):
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size, set(artifacts.values())))
+
+        blob_sizes = {}
+        for _, _, _, digests in entries:
+            for digest in digests:
+                if digest not in blob_sizes:
+                    try:
+                        blob_sizes[digest] = os.path.getsize(self._blob_path(digest))
+                    except FileNotFoundError:
+                        blob_sizes[digest] = 0
+
+        # 각 blob을 참조하는 항목 수 (참조가 모두 사라진 blob만 삭제)
+        references = {}
+        for _, _, _, digests in entries:
+            for digest in digests:
+                references[digest] = references.get(digest, 0) + 1
+
+        total = sum(size for _, _, size, _ in entries) + sum(blob_sizes.values())
+        entries.sort()
+        for _, path, size, digests in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            for digest in digests:
+                references[digest] -= 1
+                if references[digest] == 0:
+                    try:
+                        os.remove(self._blob_path(digest))
+                    except FileNotFoundError:
+                        pass
+                    total -= blob_sizes[digest]
+            logger.debug(f"통계 캐시 항목 삭제: {path}")
@@ -0,0 +1,229 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import hashlib
+import logging
+from django.conf import settings
+from .file_signatures import SNIFF_LENGTH, file_extension, matches_signature
+
+logger = logging.getLogger('faq')
+
+# 업로드 중인 파일을 보관하는 기본 경로 (MEDIA_ROOT 밖에 두어 완료 전 파일이 공개되지 않도록 함)
+DEFAULT_UPLOAD_DIR = 'chunked_uploads'
+
+# 조각 크기 (클라이언트가 지정하지 않으면 기본값, 지정한 값은 최소/최대 범위로 제한)
+DEFAULT_CHUNK_SIZE = 5 * 1024 * 1024
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 16 * 1024 * 1024
+
+# 마지막 조각을 받은 뒤 이 시간(초)이 지나면 완료되지 않은 업로드를 삭제
+UPLOAD_EXPIRY = 60 * 60 * 24
+
+# 요청 본문을 읽어 파일에 쓰는 크기
+BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """
+    업로드 요청이 올바르지 않을 때 발생 (메시지는 응답에 그대로 사용).
+    """
+
+
+class ChunkedUpload:
+    """
+    조각으로 나누어 올리는 파일 하나 (이어 올리기 지원).
+
+    - <root>/<upload_id>/meta.json: 소유자, 용도, 파일 이름, 전체 크기, 조각 크기, 용도별 추가 값
+    - <root>/<upload_id>/data: 조각을 위치(index * chunk_size)에 맞춰 바로 기록하는 파일
+    - <root>/<upload_id>/parts/<index>: 받은 조각 표시 (조각마다 별도 파일이므로 동시에 올려도 안전)
+
+    조각을 받은 목록은 parts 폴더로 확인하므로, 연결이 끊기면 빠진 조각만 다시 보내면 된다.
+    """
+
+    def __init__(self, upload_id, root=None):
+        if not upload_id or not str(upload_id).isalnum():
+            raise UploadError("올바르지 않은 업로드 ID입니다.")
+        self.upload_id = str(upload_id)
+        self.dir = os.path.join(root or upload_root(), self.upload_id)
+        self.meta_path = os.path.join(self.dir, 'meta.json')
+        self.data_path = os.path.join(self.dir, 'data')
+        self.parts_dir = os.path.join(self.dir, 'parts')
+        self._meta = None
+
+    @classmethod
+    def create(cls, owner, purpose, file_name, size, max_size, allowed_extensions, chunk_size=None, extra=None):
+        """
+        새 업로드를 만든다. 파일 이름(확장자)과 전체 크기는 조각을 받기 전에 확인한다.
+        """
+        extension = file_extension(file_name)
+        if extension not in allowed_extensions:
+            raise UploadError(
+                f"허용되지 않는 파일 확장자입니다: {extension}. 허용된 확장자는 {', '.join(allowed_extensions)}입니다."
+            )
+        try:
+            size = int(size)
+        except (TypeError, ValueError):
+            raise UploadError("파일 크기(size)가 필요합니다.")
+        if size <= 0:
+            raise UploadError("빈 파일은 업로드할 수 없습니다.")
+        if size > max_size:
+            raise UploadError(f"파일 크기가 너무 큽니다. 최대 허용 크기는 {max_size // (1024 * 1024)}MB입니다.")
+
+        try:
+            chunk_size = int(chunk_size) if chunk_size else DEFAULT_CHUNK_SIZE
+        except (TypeError, ValueError):
+            raise UploadError("조각 크기(chunk_size)가 올바르지 않습니다.")
+        chunk_size = min(max(chunk_size, MIN_CHUNK_SIZE), MAX_CHUNK_SIZE)
+
+        cleanup_expired()
+        upload = cls(uuid.uuid4().hex)
+        os.makedirs(upload.parts_dir)
+        # 전체 크기의 빈 파일을 만들어 두고 조각을 위치에 맞춰 기록
+        with open(upload.data_path, 'wb') as f:
+            f.truncate(size)
+        upload._meta = {
+            'owner': owner,
+            'purpose': purpose,
+            'file_name': os.path.basename(file_name),
+            'extension': extension,
+            'size': size,
+            'chunk_size': chunk_size,
+            'chunk_count': -(-size // chunk_size),
+            'extra': extra or {},
+            'created_at': time.time(),
+        }
+        upload._write_meta()
+        return upload
+
+    @property
+    def meta(self):
+        if self._meta is None:
+            try:
+                with open(self.meta_path, encoding='utf-8') as f:
+                    self._meta = json.load(f)
+            except (FileNotFoundError, ValueError):
+                raise UploadError("업로드 정보를 찾을 수 없습니다.")
+        return self._meta
+
+    def _write_meta(self):
+        with open(f'{self.meta_path}.part', 'w', encoding='utf-8') as f:
+            json.dump(self._meta, f, ensure_ascii=False)
+        os.replace(f'{self.meta_path}.part', self.meta_path)
+
+    def check_owner(self, owner):
+        if self.meta['owner'] != owner:
+            raise UploadError("업로드 정보를 찾을 수 없습니다.")
+
+    def received(self):
+        try:
+            return sorted(int(name) for name in os.listdir(self.parts_dir) if name.isdigit())
+        except FileNotFoundError:
+            return []
+
+    def status(self):
+        meta = self.meta
+        received = self.received()
+        return {
+            'upload_id': self.upload_id,
+            'file_name': meta['file_name'],
+            'size': meta['size'],
+            'chunk_size': meta['chunk_size'],
+            'chunk_count': meta['chunk_count'],
+            'received_chunks': received,
+            'missing_chunks': sorted(set(range(meta['chunk_count'])) - set(received)),
+        }
+
+    def chunk_length(self, index):
+        meta = self.meta
+        if not 0 <= index < meta['chunk_count']:
+            raise UploadError(f"조각 번호가 올바르지 않습니다: {index}")
+        return min(meta['chunk_size'], meta['size'] - index * meta['chunk_size'])
+
+    def write_chunk(self, index, stream, content_length=None, checksum=None):
+        """
+        stream에서 index번 조각을 읽어 파일의 해당 위치에 바로 기록 (메모리에 모으지 않음).
+        조각 길이가 맞지 않거나 checksum(sha256)이 다르면 UploadError. 0번 조각은 파일 형식을 확인한다.
+        """
+        expected = self.chunk_length(index)
+        if content_length is not None and int(content_length) != expected:
+            raise UploadError(f"{index}번 조각의 크기는 {expected}바이트여야 합니다.")
+
+        digest = hashlib.sha256()
+        written = 0
+        head = b''
+        with open(self.data_path, 'r+b') as f:
+            f.seek(index * self.meta['chunk_size'])
+            while written < expected:
+                block = stream.read(min(BLOCK_SIZE, expected - written))
+                if not block:
+                    break
+                if index == 0 and len(head) < SNIFF_LENGTH:
+                    head += block[:SNIFF_LENGTH - len(head)]
+                    # 첫 조각의 앞부분으로 파일 형식을 확인하여, 형식이 다르면 나머지를 받지 않고 중단
+                    if len(head) >= min(SNIFF_LENGTH, expected) and not matches_signature(self.meta['extension'], head):
+                        self.delete()
+                        raise UploadError("파일 내용이 확장자와 일치하지 않습니다.")
+                digest.update(block)
+                f.write(block)
+                written += len(block)
+
+        if written != expected:
+            raise UploadError(f"{index}번 조각의 크기는 {expected}바이트여야 합니다.")
+        if checksum and checksum.lower() != digest.hexdigest():
+            raise UploadError(f"{index}번 조각의 checksum이 일치하지 않습니다.")
+
+        open(os.path.join(self.parts_dir, str(index)), 'w').close()
+        return self.status()
+
+    def finalize(self, checksum):
+        """
+        모든 조각을 받았는지와 전체 파일의 sha256을 확인하고 완성된 파일 경로를 반환.
+        """
+        status = self.status()
+        if status['missing_chunks']:
+            raise UploadError(f"받지 못한 조각이 있습니다: {status['missing_chunks'][:20]}")
+        if not checksum:
+            raise UploadError("파일 전체의 checksum(sha256)이 필요합니다.")
+
+        digest = hashlib.sha256()
+        with open(self.data_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        if digest.hexdigest() != checksum.lower():
+            raise UploadError("파일 checksum이 일치하지 않습니다. 업로드를 다시 확인해 주세요.")
+        return self.data_path
+
+    def delete(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def upload_root():
+    return getattr(settings, 'CHUNKED_UPLOAD_DIR', DEFAULT_UPLOAD_DIR)
+
+
+def cleanup_expired(now=None):
+    """
+    마지막으로 조각을 받은 뒤 UPLOAD_EXPIRY가 지난 업로드를 삭제하고 삭제한 수를 반환.
+    """
+    root = upload_root()
+    now = now or time.time()
+    removed = 0
+    try:
+        names = os.listdir(root)
+    except FileNotFoundError:
+        return 0
+    for name in names:
+        path = os.path.join(root, name)
+        try:
+            parts_dir = os.path.join(path, 'parts')
+            last_activity = max(os.path.getmtime(path), os.path.getmtime(parts_dir))
+        except OSError:
+            continue
+        if now - last_activity > UPLOAD_EXPIRY:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    if removed:
+        logger.debug(f"만료된 업로드 {removed}개 삭제")
+    return removed
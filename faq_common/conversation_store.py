@@ -0,0 +1,571 @@
+import numpy as np
+import pandas as pd
+import os
+import re
+import sqlite3
+import time
+import hashlib
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import quote
+import logging
+from .merged_csv import (
+    DEFAULT_CHUNK_SIZE, MERGED_OUTPUT_PREFIX,
+    list_conversation_files, extract_questions, read_csv_file_chunks, parse_csv_files,
+)
+from .webhook_questions import fetch_webhook_questions
+
+logger = logging.getLogger('faq')
+
+# 사용자 폴더 안에 함께 저장되는 증분 저장소 파일 이름
+STORE_FILENAME = 'conversation_store.sqlite3'
+
+# 에이전트/날짜별로 나뉜 열 지향(columnar) 조각 파일이 저장되는 하위 폴더
+COLUMNAR_DIRNAME = 'columnar'
+
+# 같은 (에이전트, 날짜, 원본 파일)의 조각이 이 개수 이상이면 적재 후 하나로 압축
+COMPACT_THRESHOLD = 8
+
+# 새로 읽을 파일이 이 개수 이상일 때만 프로세스 풀을 사용 (풀 생성 비용 때문)
+PARALLEL_MIN_FILES = 4
+
+# 파일 이름에서 날짜(YYYY-MM-DD 또는 YYYYMMDD)를 추출하기 위한 패턴
+DATE_PATTERN = re.compile(r'(\d{4})-?(\d{2})-?(\d{2})')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    fingerprint TEXT
+);
+CREATE TABLE IF NOT EXISTS vocabulary (
+    agent_id TEXT NOT NULL,
+    code INTEGER NOT NULL,
+    utterance TEXT NOT NULL,
+    PRIMARY KEY (agent_id, code)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS vocabulary_lookup ON vocabulary (agent_id, utterance);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    agent_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    source TEXT NOT NULL,
+    path TEXT NOT NULL,
+    rows INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_agent_day ON segments (agent_id, day);
+CREATE INDEX IF NOT EXISTS segments_source ON segments (source);
+CREATE TABLE IF NOT EXISTS webhook_progress (
+    agent_id TEXT NOT NULL,
+    row_id INTEGER NOT NULL,
+    consumed INTEGER NOT NULL,
+    PRIMARY KEY (agent_id, row_id)
+);
+CREATE TABLE IF NOT EXISTS agent_summary (
+    agent_id TEXT PRIMARY KEY,
+    rows INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS utterance_daily_counts (
+    agent_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    utterance TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (agent_id, day, utterance)
+);
+CREATE TABLE IF NOT EXISTS utterance_totals (
+    agent_id TEXT NOT NULL,
+    utterance TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (agent_id, utterance)
+);
+CREATE INDEX IF NOT EXISTS utterance_totals_top ON utterance_totals (agent_id, count DESC);
+"""
+
+# 저장소 스키마 버전 (PRAGMA user_version)
+# 2: 발화 빈도 집계 테이블 추가, 3: 원본 행을 utterances 테이블 대신 열 지향 조각 파일로 저장
+# 4: 적재한 파일 앞부분의 fingerprint 저장
+SCHEMA_VERSION = 4
+
+# 이미 적재한 앞부분이 바뀌지 않았는지 확인할 때 읽는 처음/마지막 부분의 크기
+FINGERPRINT_SAMPLE = 64 * 1024
+
+
+def file_day(file_path, mtime):
+    """
+    파일 이름에 포함된 날짜를 일 단위 버킷으로 사용하고, 없으면 수정 시각의 날짜를 사용.
+    """
+    match = DATE_PATTERN.search(os.path.basename(file_path))
+    if match:
+        try:
+            return datetime(*map(int, match.groups())).strftime('%Y-%m-%d')
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(mtime).strftime('%Y-%m-%d')
+
+
+def prefix_fingerprint(file_path, length):
+    """
+    파일의 앞 length 바이트(이미 적재한 부분)를 나타내는 값: 길이와 그 구간의 처음/마지막
+    FINGERPRINT_SAMPLE 바이트의 sha256. 파일 뒤에 행만 추가되었다면 이전에 기록한 값과 같다.
+    """
+    digest = hashlib.sha256(str(length).encode())
+    with open(file_path, 'rb') as f:
+        digest.update(f.read(min(length, FINGERPRINT_SAMPLE)))
+        if length > FINGERPRINT_SAMPLE:
+            f.seek(max(length - FINGERPRINT_SAMPLE, FINGERPRINT_SAMPLE))
+            digest.update(f.read(length - f.tell()))
+    return digest.hexdigest()
+
+
+class ConversationStore:
+    """
+    conversation_history/<user_id> 폴더의 CSV 파일을 증분 방식으로 적재하는 저장소.
+    이미 적재한 파일은 (경로, 크기, 수정 시각)으로 추적하여 새로 추가된 행만 읽고,
+    통계는 매번 CSV를 다시 병합하지 않고 이 저장소에서 바로 조회한다.
+
+    발화 원본은 columnar/<agent_id>/<YYYY-MM-DD>/<segment_id>.npy 조각 파일에
+    에이전트별 사전(vocabulary) 코드 배열(int32)로 저장되며, 메모리 매핑으로 읽는다.
+    """
+
+    def __init__(self, folder_path, using=None, chunksize=DEFAULT_CHUNK_SIZE, workers=1):
+        self.folder_path = folder_path
+        self.using = using
+        self.chunksize = chunksize
+        self.workers = workers
+        self.timings = []  # 마지막 ingest에서 읽은 파일별 (파일 이름, 행 수, 소요 시간(초))
+        self._vocab = {}
+        self._garbage = []
+        self.store_path = os.path.join(folder_path, STORE_FILENAME)
+
+    @contextmanager
+    def connect(self):
+        """
+        저장소 연결. 블록이 끝나면 커밋(예외가 발생하면 롤백)하고 연결을 닫는다.
+        """
+        conn = sqlite3.connect(self.store_path, timeout=60)
+        try:
+            self._migrate(conn)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _migrate(self, conn):
+        conn.executescript(SCHEMA)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        with conn:
+            if version < 3:
+                # 이전 버전 저장소는 원본 행을 조각 파일로 옮기고 집계를 한 번 다시 만든다
+                if conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'utterances'"
+                ).fetchone():
+                    self._migrate_row_table(conn)
+                self._rebuild_aggregates(conn)
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(ingested_files)")]
+            if 'fingerprint' not in columns:
+                # fingerprint가 없는 파일은 다음에 변경될 때 처음부터 다시 읽는다
+                conn.execute("ALTER TABLE ingested_files ADD COLUMN fingerprint TEXT")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._collect_garbage()
+
+    def ingest(self, progress=None):
+        """
+        새로 추가되었거나 변경된 CSV 파일과 webhook 질문을 저장소에 적재.
+        새로 적재한 행 수를 반환한다 (0이면 저장소가 변경되지 않음).
+        progress가 주어지면 파일 하나를 처리할 때마다 progress(처리한 파일 수, 전체 파일 수, 파일 이름)를 호출한다.
+        """
+        added = 0
+        self._vocab = {}
+        self.timings = []
+        with self.connect() as conn:
+            # 같은 저장소를 동시에 적재하지 않도록 쓰기 잠금을 먼저 잡음
+            conn.execute("BEGIN IMMEDIATE")
+            manifest = {
+                path: (size, mtime_ns, rows, fingerprint)
+                for path, size, mtime_ns, rows, fingerprint in conn.execute(
+                    "SELECT path, size, mtime_ns, rows, fingerprint FROM ingested_files"
+                )
+            }
+
+            # 새로 읽어야 하는 파일과 건너뛸 행 수를 먼저 정리
+            tasks = []
+            for file in list_conversation_files(self.folder_path):
+                name = os.path.basename(file)
+                try:
+                    stat = os.stat(file)
+                except FileNotFoundError:
+                    logger.error(f"파일을 찾을 수 없습니다: {file}")
+                    continue
+
+                previous = manifest.get(name)
+                if previous and previous[0] == stat.st_size and previous[1] == stat.st_mtime_ns:
+                    continue  # 변경되지 않은 파일은 건너뜀
+
+                consumed = 0
+                if previous and stat.st_size > previous[0] and previous[3] == prefix_fingerprint(file, previous[0]):
+                    # 파일 뒤에 행이 추가된 경우(이미 읽은 앞부분이 그대로인 경우) 이미 읽은 행은 건너뜀
+                    consumed = previous[2]
+                elif previous:
+                    # 파일이 다시 작성된 경우 해당 파일에서 적재한 행을 지우고 처음부터 다시 읽음
+                    self._remove_source(conn, name)
+                tasks.append((file, stat, consumed))
+
+            # 파싱은 병렬로 할 수 있지만, 저장소 쓰기는 파일 순서대로 한 연결에서 처리
+            for index, ((file, stat, consumed), chunks, elapsed) in enumerate(self._parse(tasks)):
+                name = os.path.basename(file)
+                if progress:
+                    progress(index, len(tasks), name)
+                day = file_day(file, stat.st_mtime)
+                start = time.perf_counter()
+                read = None
+                for chunk in chunks:
+                    chunk.columns = ['agent_id', 'user_utterances']
+                    added += self._append_rows(conn, chunk, day, name)
+                    read = (read or 0) + len(chunk)
+                if read is None:
+                    continue
+
+                self.timings.append((name, read, elapsed + time.perf_counter() - start))
+                conn.execute(
+                    "INSERT OR REPLACE INTO ingested_files (path, size, mtime_ns, rows, fingerprint) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (name, stat.st_size, stat.st_mtime_ns, consumed + read, prefix_fingerprint(file, stat.st_size)),
+                )
+
+            for agent_id in self.agent_ids(conn):
+                added += self._ingest_webhook_questions(conn, agent_id)
+
+            self._compact(conn, COMPACT_THRESHOLD)
+
+        self._collect_garbage()
+        if added:
+            logger.debug(f"대화 기록 {added}행을 저장소에 적재했습니다: {self.store_path}")
+        return added
+
+    def _parse(self, tasks):
+        """
+        (작업, 청크 목록, 파싱 소요 시간)을 작업 순서대로 반환.
+        새 파일이 많으면(최초 적재 등) 프로세스 풀에서 파일별로 나누어 파싱하고,
+        그렇지 않으면 현재 프로세스에서 chunksize 단위로 스트리밍한다.
+        """
+        if self.workers > 1 and len(tasks) >= PARALLEL_MIN_FILES:
+            parsed = parse_csv_files(((file, consumed) for file, _, consumed in tasks), self.workers)
+            for task, (_, df, elapsed) in zip(tasks, parsed):
+                yield task, ([] if df is None else [df]), elapsed
+        else:
+            for task in tasks:
+                file, _, consumed = task
+                yield task, read_csv_file_chunks(file, self.chunksize, consumed), 0.0
+
+    def _append_rows(self, conn, df, day, source):
+        df = df.dropna(subset=['agent_id'])
+        agent_ids = df['agent_id'].astype(str)
+        utterances = df['user_utterances'].fillna('').astype(str)
+        added = 0
+        for agent_id, group in utterances.groupby(agent_ids, sort=False):
+            added += self._insert_utterances(conn, agent_id, day, source, group.to_numpy())
+        return added
+
+    def _insert_utterances(self, conn, agent_id, day, source, utterances):
+        """
+        한 에이전트의 발화 배열을 코드 배열로 변환하여 조각 파일로 저장하고 요약과 집계를 갱신.
+        """
+        if len(utterances) == 0:
+            return 0
+        codes = self._encode(conn, agent_id, utterances)
+        self._append_segment(conn, agent_id, day, source, codes)
+
+        conn.execute(
+            "INSERT INTO agent_summary (agent_id, rows, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(agent_id) DO UPDATE SET rows = rows + excluded.rows, updated_at = excluded.updated_at",
+            (agent_id, len(codes), datetime.now().isoformat(timespec='seconds')),
+        )
+        self._update_aggregates(conn, agent_id, day, codes, 1)
+        return len(codes)
+
+    def _load_vocab(self, conn, agent_id):
+        """
+        에이전트의 발화 사전을 (발화 -> 코드 dict, 코드 순서의 발화 list)로 반환.
+        """
+        if agent_id not in self._vocab:
+            words = [
+                utterance for (utterance,) in conn.execute(
+                    "SELECT utterance FROM vocabulary WHERE agent_id = ? ORDER BY code", (agent_id,)
+                )
+            ]
+            self._vocab[agent_id] = ({word: code for code, word in enumerate(words)}, words)
+        return self._vocab[agent_id]
+
+    def _encode(self, conn, agent_id, utterances):
+        """
+        발화 배열을 에이전트별 사전 코드(int32) 배열로 변환하고, 처음 나온 발화는 사전에 추가.
+        """
+        lookup, words = self._load_vocab(conn, agent_id)
+        uniques, inverse = np.unique(np.asarray(utterances, dtype=object), return_inverse=True)
+
+        new_words = [word for word in uniques if word not in lookup]
+        if new_words:
+            start = len(words)
+            conn.executemany(
+                "INSERT INTO vocabulary (agent_id, code, utterance) VALUES (?, ?, ?)",
+                [(agent_id, start + i, word) for i, word in enumerate(new_words)],
+            )
+            for i, word in enumerate(new_words):
+                lookup[word] = start + i
+                words.append(word)
+
+        mapped = np.fromiter((lookup[word] for word in uniques), dtype=np.int32, count=len(uniques))
+        return mapped[inverse]
+
+    def _append_segment(self, conn, agent_id, day, source, codes):
+        segment_id = conn.execute(
+            "INSERT INTO segments (agent_id, day, source, path, rows) VALUES (?, ?, ?, '', ?)",
+            (agent_id, day, source, len(codes)),
+        ).lastrowid
+        path = os.path.join(COLUMNAR_DIRNAME, quote(agent_id, safe=''), day, f'{segment_id}.npy')
+        full_path = os.path.join(self.folder_path, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+        # 완성된 파일만 보이도록 임시 파일에 쓴 뒤 이름 변경
+        with open(f"{full_path}.part", 'wb') as f:
+            np.save(f, np.ascontiguousarray(codes, dtype=np.int32))
+        os.replace(f"{full_path}.part", full_path)
+        conn.execute("UPDATE segments SET path = ? WHERE id = ?", (path, segment_id))
+
+    def _load_segment(self, path):
+        # 조각 파일은 복사 없이 메모리 매핑으로 읽음
+        return np.load(os.path.join(self.folder_path, path), mmap_mode='r')
+
+    def _collect_garbage(self):
+        # 트랜잭션이 커밋된 뒤에 더 이상 참조되지 않는 조각 파일을 삭제
+        for path in self._garbage:
+            try:
+                os.remove(os.path.join(self.folder_path, path))
+            except FileNotFoundError:
+                pass
+        self._garbage = []
+
+    def _update_aggregates(self, conn, agent_id, day, codes, sign):
+        """
+        발화 빈도 집계(일 단위 버킷, 전체 누적)를 코드 배열만큼 증가(sign=1) 또는 감소(sign=-1).
+        """
+        _, words = self._load_vocab(conn, agent_id)
+        counts = np.bincount(codes) if len(codes) else np.zeros(0, dtype=np.int64)
+        rows = [
+            (words[code], int(counts[code]) * sign)
+            for code in np.nonzero(counts)[0] if words[code]
+        ]
+
+        conn.executemany(
+            "INSERT INTO utterance_daily_counts (agent_id, day, utterance, count) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(agent_id, day, utterance) DO UPDATE SET count = count + excluded.count",
+            [(agent_id, day, utterance, count) for utterance, count in rows],
+        )
+        conn.executemany(
+            "INSERT INTO utterance_totals (agent_id, utterance, count) VALUES (?, ?, ?) "
+            "ON CONFLICT(agent_id, utterance) DO UPDATE SET count = count + excluded.count",
+            [(agent_id, utterance, count) for utterance, count in rows],
+        )
+        if sign < 0:
+            conn.execute("DELETE FROM utterance_daily_counts WHERE count <= 0")
+            conn.execute("DELETE FROM utterance_totals WHERE count <= 0")
+
+    def _rebuild_aggregates(self, conn):
+        conn.execute("DELETE FROM utterance_daily_counts")
+        conn.execute("DELETE FROM utterance_totals")
+        for agent_id, day, path in conn.execute(
+            "SELECT agent_id, day, path FROM segments ORDER BY id"
+        ).fetchall():
+            self._update_aggregates(conn, agent_id, day, self._load_segment(path), 1)
+
+    def _migrate_row_table(self, conn):
+        """
+        스키마 버전 3 이전의 utterances 테이블 행을 조각 파일로 옮긴 뒤 테이블을 삭제.
+        """
+        groups = conn.execute(
+            "SELECT agent_id, day, source FROM utterances GROUP BY agent_id, day, source ORDER BY MIN(id)"
+        ).fetchall()
+        for agent_id, day, source in groups:
+            utterances = [
+                utterance for (utterance,) in conn.execute(
+                    "SELECT utterance FROM utterances WHERE agent_id = ? AND day = ? AND source = ? ORDER BY id",
+                    (agent_id, day, source),
+                )
+            ]
+            self._append_segment(conn, agent_id, day, source, self._encode(conn, agent_id, utterances))
+        conn.execute("DROP TABLE utterances")
+
+    def _remove_source(self, conn, source):
+        removed = 0
+        for segment_id, agent_id, day, path, rows in conn.execute(
+            "SELECT id, agent_id, day, path, rows FROM segments WHERE source = ?", (source,)
+        ).fetchall():
+            self._update_aggregates(conn, agent_id, day, self._load_segment(path), -1)
+            conn.execute("UPDATE agent_summary SET rows = rows - ? WHERE agent_id = ?", (rows, agent_id))
+            conn.execute("DELETE FROM segments WHERE id = ?", (segment_id,))
+            self._garbage.append(path)
+            removed += rows
+        return removed
+
+    def _compact(self, conn, threshold):
+        """
+        같은 (에이전트, 날짜, 원본 파일)로 나뉘어 쌓인 조각 파일을 하나로 합침.
+        """
+        groups = conn.execute(
+            "SELECT agent_id, day, source FROM segments "
+            "GROUP BY agent_id, day, source HAVING COUNT(*) >= ?",
+            (threshold,),
+        ).fetchall()
+        for agent_id, day, source in groups:
+            segments = conn.execute(
+                "SELECT id, path FROM segments WHERE agent_id = ? AND day = ? AND source = ? ORDER BY id",
+                (agent_id, day, source),
+            ).fetchall()
+            codes = np.concatenate([self._load_segment(path) for _, path in segments])
+            conn.executemany("DELETE FROM segments WHERE id = ?", [(segment_id,) for segment_id, _ in segments])
+            self._append_segment(conn, agent_id, day, source, codes)
+            self._garbage.extend(path for _, path in segments)
+        return len(groups)
+
+    def compact(self, threshold=2):
+        """
+        조각 파일 압축 작업. 압축한 (에이전트, 날짜, 원본 파일) 그룹 수를 반환한다.
+        """
+        with self.connect() as conn:
+            compacted = self._compact(conn, threshold)
+        self._collect_garbage()
+        return compacted
+
+    def _ingest_webhook_questions(self, conn, agent_id):
+        """
+        webhook_questionlog에서 아직 적재하지 않은 질문만 추가.
+        같은 행의 questions 목록이 늘어나는 경우도 있으므로 행마다 적재한 개수를 기록한다.
+        """
+        webhook_rows = fetch_webhook_questions(agent_id, self.using)
+        if not webhook_rows:
+            return 0
+
+        progress = dict(conn.execute(
+            "SELECT row_id, consumed FROM webhook_progress WHERE agent_id = ?", (agent_id,)
+        ))
+        day = datetime.now().strftime('%Y-%m-%d')
+        questions_to_add = []
+        for row_id, questions_json in webhook_rows:
+            questions = extract_questions(questions_json)
+            consumed = progress.get(row_id, 0)
+            if len(questions) <= consumed:
+                continue
+            # CSV 발화(fillna('').astype(str))와 같이 None은 빈 문자열로, 그 밖의 값은 문자열로 맞춤
+            questions_to_add.extend('' if question is None else str(question) for question in questions[consumed:])
+            conn.execute(
+                "INSERT OR REPLACE INTO webhook_progress (agent_id, row_id, consumed) VALUES (?, ?, ?)",
+                (agent_id, row_id, len(questions)),
+            )
+
+        return self._insert_utterances(conn, agent_id, day, 'webhook', questions_to_add)
+
+    def agent_ids(self, conn=None):
+        if conn is None:
+            with self.connect() as conn:
+                return self.agent_ids(conn)
+        return [agent_id for (agent_id,) in conn.execute("SELECT agent_id FROM agent_summary ORDER BY agent_id")]
+
+    def top_utterances(self, agent_id, limit=10, start_date=None, end_date=None, conn=None):
+        """
+        에이전트의 가장 많이 등장한 발화 상위 N개를 반환.
+        기간이 없으면 누적 집계 테이블을, 기간이 있으면 해당 기간의 일 단위 버킷 합계를 사용한다.
+        start_date, end_date는 'YYYY-MM-DD' 형식이며 양 끝을 포함한다.
+        """
+        if conn is None:
+            with self.connect() as conn:
+                return self.top_utterances(agent_id, limit, start_date, end_date, conn)
+
+        if start_date is None and end_date is None:
+            top = conn.execute(
+                "SELECT utterance, count FROM utterance_totals "
+                "WHERE agent_id = ? ORDER BY count DESC, utterance LIMIT ?",
+                (agent_id, limit),
+            ).fetchall()
+        else:
+            top = conn.execute(
+                "SELECT utterance, SUM(count) AS total FROM utterance_daily_counts "
+                "WHERE agent_id = ? AND day BETWEEN ? AND ? "
+                "GROUP BY utterance ORDER BY total DESC, utterance LIMIT ?",
+                (agent_id, start_date or '0000-00-00', end_date or '9999-99-99', limit),
+            ).fetchall()
+
+        return [{'utterance': utterance, 'count': count} for utterance, count in top]
+
+    def statistics(self, limit=10, start_date=None, end_date=None):
+        """
+        저장소에 적재된 데이터로 에이전트별 통계를 반환.
+        """
+        with self.connect() as conn:
+            files = conn.execute("SELECT COUNT(*) FROM ingested_files").fetchone()[0]
+            agents = []
+            for agent_id, rows, updated_at in conn.execute(
+                "SELECT agent_id, rows, updated_at FROM agent_summary ORDER BY agent_id"
+            ).fetchall():
+                agents.append({
+                    'agent_id': agent_id,
+                    'rows': rows,
+                    'updated_at': updated_at,
+                    'most_common_utterances': self.top_utterances(
+                        agent_id, limit, start_date, end_date, conn
+                    ),
+                })
+
+        return {
+            'files': files,
+            'rows': sum(agent['rows'] for agent in agents),
+            'agents': agents,
+        }
+
+    def _segments(self, conn, agent_id=None, start_date=None, end_date=None):
+        query = "SELECT agent_id, path FROM segments WHERE day BETWEEN ? AND ?"
+        params = [start_date or '0000-00-00', end_date or '9999-99-99']
+        if agent_id is not None:
+            query += " AND agent_id = ?"
+            params.append(agent_id)
+        return conn.execute(query + " ORDER BY day, source, id", params).fetchall()
+
+    def read_utterances(self, agent_id, start_date=None, end_date=None):
+        """
+        에이전트의 발화 열만 조각 파일에서 메모리 매핑으로 읽어 Categorical Series로 반환.
+        CSV 텍스트를 다시 파싱하지 않으며, 코드 배열은 사전(vocabulary)을 범주로 그대로 사용한다.
+        """
+        with self.connect() as conn:
+            _, words = self._load_vocab(conn, agent_id)
+            paths = [path for _, path in self._segments(conn, agent_id, start_date, end_date)]
+
+        codes = [self._load_segment(path) for path in paths]
+        codes = np.concatenate(codes) if codes else np.zeros(0, dtype=np.int32)
+        return pd.Series(pd.Categorical.from_codes(codes, categories=words), name='user_utterances')
+
+    def export_merged_csv(self, output_path=None):
+        """
+        저장소의 데이터를 기존 merge_csv_files와 같은 형식(agent_id, user_utterances)의 CSV로 저장.
+        """
+        if output_path is None:
+            output_path = os.path.join(
+                self.folder_path, f"{MERGED_OUTPUT_PREFIX}{datetime.now().strftime('%Y-%m-%d')}.csv"
+            )
+        temp_path = f"{output_path}.part"
+        with self.connect() as conn, open(temp_path, 'w', encoding='utf-8-sig', newline='') as sink:
+            sink.write('agent_id,user_utterances\n')
+            for agent_id, path in self._segments(conn):
+                words = np.asarray(self._load_vocab(conn, agent_id)[1], dtype=object)
+                codes = self._load_segment(path)
+                for start in range(0, len(codes), self.chunksize):
+                    chunk = pd.DataFrame({
+                        'agent_id': agent_id,
+                        'user_utterances': words[codes[start:start + self.chunksize]],
+                    })
+                    chunk.to_csv(sink, index=False, header=False)
+        os.replace(temp_path, output_path)
+        return output_path
@@ -0,0 +1,50 @@
+import os
+
+# 확장자별 파일 앞부분의 시그니처 (magic bytes)
+ZIP_SIGNATURES = (b'PK\x03\x04', b'PK\x05\x06')
+OLE_SIGNATURES = (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',)  # doc, xls, ppt, hwp(5.0)
+
+SIGNATURES = {
+    'png': (b'\x89PNG\r\n\x1a\n',),
+    'jpg': (b'\xff\xd8\xff',),
+    'jpeg': (b'\xff\xd8\xff',),
+    'gif': (b'GIF87a', b'GIF89a'),
+    'pdf': (b'%PDF-',),
+    'zip': ZIP_SIGNATURES,
+    'docx': ZIP_SIGNATURES,
+    'xlsx': ZIP_SIGNATURES,
+    'pptx': ZIP_SIGNATURES,
+    'doc': OLE_SIGNATURES,
+    'xls': OLE_SIGNATURES,
+    'ppt': OLE_SIGNATURES,
+    'hwp': OLE_SIGNATURES,
+}
+
+# 시그니처 확인에 필요한 파일 앞부분의 길이
+SNIFF_LENGTH = 16
+
+# 업로드 파일의 Content-Type으로 허용하는 값 (확장자별)
+CONTENT_TYPES = {
+    'png': ('image/png',),
+    'jpg': ('image/jpeg', 'image/pjpeg'),
+    'jpeg': ('image/jpeg', 'image/pjpeg'),
+    'gif': ('image/gif',),
+}
+
+
+def file_extension(name):
+    return os.path.splitext(name or '')[1].lstrip('.').lower()
+
+
+def matches_signature(extension, head):
+    """
+    파일 앞부분(head)이 확장자에 맞는 형식인지 확인.
+    시그니처가 없는 텍스트 형식(txt, csv 등)은 바이너리(NUL 문자 포함)가 아니면 허용한다.
+    """
+    extension = extension.lower()
+    if extension == 'webp':
+        return head[:4] == b'RIFF' and head[8:12] == b'WEBP'
+    signatures = SIGNATURES.get(extension)
+    if signatures is None:
+        return b'\x00' not in head
+    return any(head.startswith(signature) for signature in signatures)
@@ -0,0 +1,66 @@
+import hashlib
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def make_etag(*parts):
+    """
+    버전 값(ID, 수정 시각 등)으로 만든 강한 ETag. 응답 본문을 직렬화하지 않고 계산한다.
+    """
+    return '"%s"' % '-'.join(str(part) for part in parts)
+
+
+def digest_etag(prefix, values):
+    """
+    버전 필드가 없는 작은 목록(부서 이름 등)의 값으로 만든 ETag.
+    """
+    digest = hashlib.sha1('\x1f'.join(str(value) for value in values).encode('utf-8')).hexdigest()
+    return make_etag(prefix, digest)
+
+
+def epoch(value):
+    """
+    Last-Modified에 사용할 epoch 초 (값이 없으면 None).
+    """
+    return int(value.timestamp()) if value else None
+
+
+def not_modified(request, etag=None, last_modified=None, private=False):
+    """
+    GET/HEAD 요청의 If-None-Match/If-Modified-Since가 현재 값과 같으면 304 응답을, 아니면 None을 반환.
+    last_modified는 epoch 초. POST 조회 요청은 조건부 요청을 적용하지 않는다.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified, private)
+    return response
+
+
+def set_validators(response, etag=None, last_modified=None, private=False):
+    """
+    응답에 ETag/Last-Modified를 추가. 브라우저와 CDN이 응답을 보관하되 사용할 때마다 서버에 확인하도록 한다.
+    """
+    if etag:
+        response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    if private:
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+def conditional_response(request, build, etag=None, last_modified=None, private=False):
+    """
+    변경이 없으면 304를, 아니면 build()로 만든 응답에 ETag/Last-Modified를 추가하여 반환.
+    ETag와 Last-Modified는 응답을 만들기 전에 계산되어 있어야 하며, 200이 아닌 응답에는 추가하지 않는다.
+    """
+    response = not_modified(request, etag, last_modified, private)
+    if response is None:
+        response = build()
+        if response.status_code == 200:
+            set_validators(response, etag, last_modified, private)
+    return response
@@ -0,0 +1,209 @@
+import os
+import glob
+import json
+import logging
+from django.conf import settings
+from django.core.cache import cache
+from django.dispatch import Signal
+from PIL import Image, ImageOps
+from redis.exceptions import RedisError
+from .jobs import enqueue
+
+logger = logging.getLogger('faq')
+
+# 원본보다 작은 너비만 만들며 (확대하지 않음), 너비마다 WebP와 JPEG를 저장
+VARIANT_WIDTHS = tuple(getattr(settings, 'IMAGE_VARIANT_WIDTHS', (160, 480, 960)))
+VARIANT_FORMATS = (('webp', 'WEBP'), ('jpg', 'JPEG'))
+VARIANT_QUALITY = getattr(settings, 'IMAGE_VARIANT_QUALITY', 80)
+
+# 변형 이미지를 만드는 원본 확장자
+VARIANT_SOURCE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp')
+
+# 변형 목록(manifest)을 캐시에 보관하는 시간(초)
+MANIFEST_TIMEOUT = 60 * 60 * 24
+
+# 변형 목록 파일이 없다는 결과를 캐시에 보관하는 시간(초). 작업이 끝나면 generate_variants가 바로 덮어쓴다.
+MISSING_MANIFEST_TIMEOUT = 60 * 10
+
+# 변형 이미지를 만든 뒤 보내는 signal (source_name, base, manifest, context 인자).
+# 이미지를 사용하는 앱이 받아서 캐시된 응답을 갱신한다. context는 enqueue_image_variants에 넘긴 값.
+variants_generated = Signal()
+
+
+def variant_base(name):
+    """
+    원본 옆에 저장되는 변형 이미지 이름의 앞부분 (menu_images/ab/<해시>.png → menu_images/ab/<해시>).
+    """
+    return os.path.splitext(name)[0]
+
+
+def feed_variant_base(store_id, image_uuid):
+    # 피드 파일은 이름을 바꿀 수 있으므로 변하지 않는 UUID로 변형 이미지 이름을 만듦
+    return f'uploads/store_{store_id}/feed/variants/{image_uuid}'
+
+
+def _media_path(name):
+    return os.path.join(settings.MEDIA_ROOT, name)
+
+
+def _manifest_name(base):
+    return f'{base}_variants.json'
+
+
+def _cache_key(base):
+    return f'image_variants:{base}'
+
+
+def _save_atomic(image, name, fmt):
+    path = _media_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f'{path}.{os.getpid()}.part'
+    try:
+        image.save(temp_path, format=fmt, quality=VARIANT_QUALITY, optimize=True)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _prepare(image):
+    # 사진의 회전 정보를 적용하고, GIF 등은 첫 프레임을 RGB(A)로 변환
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    return image.convert('RGBA' if has_alpha else 'RGB')
+
+
+def _flatten(image):
+    # JPEG은 투명도를 지원하지 않으므로 흰 배경에 합성
+    if image.mode != 'RGBA':
+        return image
+    background = Image.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def generate_variants(source_name, base, widths=VARIANT_WIDTHS):
+    """
+    MEDIA_ROOT 기준 source_name 이미지로 너비별 변형 이미지(<base>_w<너비>.webp/.jpg)와 변형 목록을 만든다.
+    변형 목록 {'<너비>': {'webp': 이름, 'jpg': 이름}}을 반환 (원본이 가장 작은 너비보다 작으면 빈 목록).
+    """
+    manifest = {}
+    with Image.open(_media_path(source_name)) as source:
+        image = _prepare(source)
+        for width in sorted(set(widths)):
+            if width >= image.width:
+                break
+            height = max(round(image.height * width / image.width), 1)
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+            entry = {}
+            for ext, fmt in VARIANT_FORMATS:
+                name = f'{base}_w{width}.{ext}'
+                _save_atomic(resized if fmt == 'WEBP' else _flatten(resized), name, fmt)
+                entry[ext] = name
+            manifest[str(width)] = entry
+
+    manifest_path = _media_path(_manifest_name(base))
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    with open(f'{manifest_path}.part', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(f'{manifest_path}.part', manifest_path)
+    cache.set(_cache_key(base), manifest, timeout=MANIFEST_TIMEOUT)
+    return manifest
+
+
+def build_variants(source_name, base, context=None):
+    """
+    변형 이미지를 만들고 variants_generated signal을 보낸 뒤 변형 목록을 반환.
+    """
+    manifest = generate_variants(source_name, base)
+    variants_generated.send(
+        sender=None, source_name=source_name, base=base, manifest=manifest, context=context or {}
+    )
+    return manifest
+
+
+def _read_manifest(base):
+    try:
+        with open(_media_path(_manifest_name(base)), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _manifest_urls(manifest):
+    return {
+        width: {ext: f"{settings.MEDIA_URL}{name}" for ext, name in entry.items()}
+        for width, entry in manifest.items()
+    }
+
+
+def variant_urls_many(bases):
+    """
+    여러 이미지의 변형 이미지 URL {base: {'<너비>': {'webp': URL, 'jpg': URL}}}.
+    캐시는 한 번의 get_many로 조회하고, 캐시에 없는 것만 변형 목록 파일을 읽는다.
+    변형 목록이 없는 이미지(이전 파일, 작업이 실행되지 않은 경우)도 빈 dict로 캐시하여 파일을 매번 열지 않는다.
+    """
+    bases = list(dict.fromkeys(bases))
+    if not bases:
+        return {}
+    keys = {_cache_key(base): base for base in bases}
+    cached = cache.get_many(list(keys))
+    manifests = {keys[key]: manifest for key, manifest in cached.items()}
+
+    found, missing = {}, {}
+    for base in bases:
+        if base not in manifests:
+            manifest = _read_manifest(base)
+            manifests[base] = manifest
+            (found if manifest else missing)[_cache_key(base)] = manifest
+    if found:
+        cache.set_many(found, timeout=MANIFEST_TIMEOUT)
+    if missing:
+        cache.set_many(missing, timeout=MISSING_MANIFEST_TIMEOUT)
+    return {base: _manifest_urls(manifest) for base, manifest in manifests.items()}
+
+
+def variant_urls(base):
+    """
+    변형 이미지 URL {'<너비>': {'webp': URL, 'jpg': URL}}. 아직 만들어지지 않았으면 빈 dict (원본을 사용).
+    """
+    return variant_urls_many([base])[base]
+
+
+def has_variants(base):
+    """
+    변형 이미지 생성 작업이 끝났는지 여부 (변형 목록 파일이 있으면 True).
+    """
+    return os.path.exists(_media_path(_manifest_name(base)))
+
+
+def delete_variants(base):
+    """
+    원본이 삭제될 때 변형 이미지와 변형 목록을 함께 삭제.
+    """
+    paths = glob.glob(f'{glob.escape(_media_path(base))}_w*') + [_media_path(_manifest_name(base))]
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    cache.delete(_cache_key(base))
+
+
+def enqueue_image_variants(source_name, base, context=None):
+    """
+    변형 이미지 생성 작업을 images 큐에 넣고 작업 ID를 반환.
+    context(JSON으로 저장할 수 있는 dict)는 작업이 끝난 뒤 variants_generated signal로 그대로 전달된다.
+    작업 큐를 사용할 수 없으면 변형 이미지 없이 원본만 제공하고 None을 반환한다.
+    """
+    if not source_name.lower().endswith(VARIANT_SOURCE_EXTENSIONS):
+        return None
+    try:
+        return enqueue(
+            'faq_common.tasks.generate_image_variants_job',
+            {'source_name': source_name, 'base': base, 'context': context},
+            queue='images', dedupe_key=f'image_variants:{base}',
+        )
+    except RedisError as e:
+        logger.warning(f"작업 큐를 사용할 수 없어 변형 이미지를 만들지 않습니다: {source_name} ({e})")
+        return None
@@ -0,0 +1,226 @@
+import json
+import uuid
+import logging
+import threading
+import traceback
+from datetime import datetime
+
+import redis
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger('faq')
+
+# 작업 상태 값
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# 작업 정보가 redis에 유지되는 시간(초)
+JOB_TTL = 60 * 60 * 24
+
+# 실행 중인 작업은 JOB_HEARTBEAT_INTERVAL초마다 updated_at과 중복 방지 키의 만료 시간을 갱신한다.
+# JOB_STALE_AFTER초 동안 갱신되지 않으면 워커가 중단된 것으로 보고 실패로 처리한다.
+JOB_HEARTBEAT_INTERVAL = getattr(settings, 'JOB_HEARTBEAT_INTERVAL', 15)
+JOB_STALE_AFTER = getattr(settings, 'JOB_STALE_AFTER', 60)
+
+_client = None
+
+
+def get_redis():
+    """
+    작업 큐가 사용하는 redis 클라이언트 (JOB_REDIS_URL, 기본값은 로컬 인스턴스).
+    """
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(
+            getattr(settings, 'JOB_REDIS_URL', 'redis://localhost:6379/0'), decode_responses=True
+        )
+    return _client
+
+
+def _job_key(job_id):
+    return f'jobs:{job_id}'
+
+
+def _queue_key(queue):
+    return f'jobs:queue:{queue}'
+
+
+def _active_key(dedupe_key):
+    return f'jobs:active:{dedupe_key}'
+
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def _is_stale(job):
+    # 실행 중인데 마지막 갱신 후 JOB_STALE_AFTER가 지났으면 워커가 중단된 작업
+    if job.get('status') != RUNNING:
+        return False
+    try:
+        updated_at = datetime.fromisoformat(job['updated_at'])
+    except (KeyError, TypeError, ValueError):
+        return True
+    return (datetime.now() - updated_at).total_seconds() > JOB_STALE_AFTER
+
+
+def enqueue(task, kwargs=None, owner=None, queue='default', dedupe_key=None):
+    """
+    task(점으로 구분된 함수 경로)를 kwargs와 함께 큐에 넣고 작업 ID를 반환.
+    dedupe_key가 같은 작업이 이미 대기 중이거나 실행 중이면 새로 만들지 않고 그 작업 ID를 반환한다.
+    """
+    client = get_redis()
+    job_id = uuid.uuid4().hex
+
+    if dedupe_key:
+        active_key = _active_key(dedupe_key)
+        if not client.set(active_key, job_id, nx=True, ex=JOB_TTL):
+            active_id = client.get(active_key)
+            # 중단된 워커의 작업은 get_job에서 실패로 표시되므로 새 작업을 만든다
+            active = get_job(active_id) if active_id else None
+            if active and active['status'] in (QUEUED, RUNNING):
+                return active_id
+            client.set(active_key, job_id, ex=JOB_TTL)
+
+    pipe = client.pipeline()
+    pipe.hset(_job_key(job_id), mapping={
+        'id': job_id,
+        'task': task,
+        'kwargs': json.dumps(kwargs or {}, ensure_ascii=False),
+        'owner': owner or '',
+        'queue': queue,
+        'dedupe_key': dedupe_key or '',
+        'status': QUEUED,
+        'progress': 0,
+        'current': 0,
+        'total': 0,
+        'message': '',
+        'result': '',
+        'error': '',
+        'created_at': _now(),
+        'updated_at': _now(),
+    })
+    pipe.expire(_job_key(job_id), JOB_TTL)
+    pipe.lpush(_queue_key(queue), job_id)
+    pipe.execute()
+    return job_id
+
+
+def get_job(job_id, owner=None):
+    """
+    작업 정보를 dict로 반환 (없거나 만료되었으면 None).
+    owner가 주어지면 해당 소유자의 작업이 아닐 때도 None을 반환한다.
+    실행 중 워커가 중단되어 갱신이 멈춘 작업은 실패(failed)로 반환한다.
+    """
+    data = get_redis().hgetall(_job_key(job_id))
+    if not data or (owner is not None and data.get('owner') != owner):
+        return None
+    if _is_stale(data):
+        data['status'] = FAILED
+        data['error'] = data.get('error') or '작업을 실행하던 워커가 중단되었습니다. 다시 요청해 주세요.'
+    for field in ('progress', 'current', 'total'):
+        data[field] = int(data.get(field) or 0)
+    data['kwargs'] = json.loads(data['kwargs']) if data.get('kwargs') else {}
+    data['result'] = json.loads(data['result']) if data.get('result') else None
+    return data
+
+
+def update_job(job_id, **fields):
+    if 'result' in fields:
+        fields['result'] = json.dumps(fields['result'], ensure_ascii=False)
+    fields['updated_at'] = _now()
+    get_redis().hset(_job_key(job_id), mapping=fields)
+
+
+class JobContext:
+    """
+    작업 함수에 첫 번째 인자로 전달되는 객체. 진행 상황을 작업 정보에 기록한다.
+    """
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+
+    def progress(self, current, total, message=''):
+        percent = int(current * 100 / total) if total else 100
+        update_job(self.job_id, progress=min(percent, 99), current=current, total=total, message=message)
+
+
+class Heartbeat(threading.Thread):
+    """
+    작업이 실행되는 동안 JOB_HEARTBEAT_INTERVAL마다 updated_at을 갱신하고,
+    중복 방지 키의 만료 시간을 JOB_STALE_AFTER로 늘리는 스레드.
+    워커가 중단되면 갱신이 멈추므로 중복 방지 키는 곧 만료되고 작업은 실패로 표시된다.
+    """
+
+    def __init__(self, job_id, dedupe_key):
+        super().__init__(name=f'job-heartbeat-{job_id}', daemon=True)
+        self.job_id = job_id
+        self.active_key = _active_key(dedupe_key) if dedupe_key else None
+        self.stopped = threading.Event()
+
+    def beat(self):
+        client = get_redis()
+        client.hset(_job_key(self.job_id), 'updated_at', _now())
+        if self.active_key and client.get(self.active_key) == self.job_id:
+            client.expire(self.active_key, JOB_STALE_AFTER)
+
+    def run(self):
+        while not self.stopped.wait(JOB_HEARTBEAT_INTERVAL):
+            try:
+                self.beat()
+            except redis.RedisError as e:
+                logger.warning(f"작업 상태를 갱신하지 못했습니다: {self.job_id} ({e})")
+
+    def stop(self):
+        self.stopped.set()
+
+
+def run_job(job_id):
+    """
+    작업 하나를 실행하고 결과 또는 오류를 기록.
+    """
+    job = get_job(job_id)
+    if job is None:
+        logger.warning(f"작업 정보를 찾을 수 없습니다: {job_id}")
+        return
+
+    update_job(job_id, status=RUNNING)
+    heartbeat = Heartbeat(job_id, job['dedupe_key'])
+    heartbeat.beat()
+    heartbeat.start()
+    try:
+        func = import_string(job['task'])
+        result = func(JobContext(job_id), **job['kwargs'])
+        update_job(job_id, status=DONE, progress=100, result=result)
+    except Exception as e:
+        logger.error(f"작업 실행 중 오류 발생: {job['task']} ({job_id}), 오류 메시지: {e}")
+        update_job(job_id, status=FAILED, error=str(e), message=traceback.format_exc(limit=5))
+    finally:
+        heartbeat.stop()
+        active_key = _active_key(job['dedupe_key'])
+        if job['dedupe_key'] and get_redis().get(active_key) == job_id:
+            get_redis().delete(active_key)
+
+
+def run_worker(queues=('default',), burst=False, timeout=5):
+    """
+    큐에서 작업을 꺼내 순서대로 실행하는 워커 루프.
+    burst가 True이면 큐가 비었을 때 종료한다.
+    """
+    client = get_redis()
+    keys = [_queue_key(queue) for queue in queues]
+    while True:
+        item = client.brpop(keys, timeout=timeout)
+        if item is None:
+            if burst:
+                return
+            continue
+        _, job_id = item
+        # 요청 처리와 마찬가지로 작업마다 CONN_MAX_AGE가 지난 데이터베이스 연결만 정리하고 나머지는 재사용
+        close_old_connections()
+        run_job(job_id)
+        close_old_connections()
@@ -0,0 +1,116 @@
+import os
+import hashlib
+import logging
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.utils.deconstruct import deconstructible
+from .image_variants import variant_base, enqueue_image_variants, delete_variants
+
+logger = logging.getLogger('faq')
+
+# 파일을 해시할 때 한 번에 읽는 크기
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# 내용 해시로 저장되는 파일 필드 (이 필드들의 값이 blob의 참조로 집계됨)
+REFERENCE_FIELDS = (
+    ('faq', 'Menu', 'image'),
+    ('faq', 'Store', 'banner'),
+)
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    업로드된 파일을 내용 해시 이름(<업로드 폴더>/<해시 앞 2자리>/<sha256><확장자>)으로 저장하는 storage.
+    같은 내용의 파일은 메뉴나 매장이 달라도 한 번만 기록되고, 이미 있으면 쓰지 않고 기존 이름을 반환한다.
+    """
+
+    def _blob_name(self, name, digest):
+        directory = os.path.dirname(name)
+        ext = os.path.splitext(name)[1].lower()
+        return os.path.join(directory, digest[:2], f'{digest}{ext}').replace('\\', '/')
+
+    def is_blob(self, name):
+        parts = str(name or '').split('/')
+        return len(parts) >= 3 and len(parts[-1].split('.')[0]) == 64 and parts[-2] == parts[-1][:2]
+
+    def _save(self, name, content):
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+
+        blob_name = self._blob_name(name, digest.hexdigest())
+        if self.exists(blob_name):
+            return blob_name
+
+        saved_name = super()._save(blob_name, content)
+        if saved_name != blob_name:
+            # 같은 내용이 동시에 저장된 경우 먼저 저장된 파일을 사용
+            super().delete(saved_name)
+        self._queue_variants(blob_name)
+        return blob_name
+
+    def _queue_variants(self, name):
+        # 새 파일은 저장이 커밋된 뒤 작업 큐에서 변형 이미지(썸네일 등)를 만듦 (같은 내용은 이미 만들어져 있음)
+        transaction.on_commit(lambda: enqueue_image_variants(name, variant_base(name)))
+
+    def save_local_file(self, path, directory):
+        """
+        로컬 파일을 복사하지 않고 저장. 같은 파일 시스템이면 하드 링크를 만들고, 아니면 한 번만 복사한다.
+        하드 링크는 원본과 내용을 공유하므로 원본 파일을 그 자리에서 수정하지 않는 경우에 사용한다.
+        """
+        blob_name = self._blob_name(os.path.join(directory, os.path.basename(path)), file_digest(path))
+        if self.exists(blob_name):
+            return blob_name
+
+        blob_path = self.path(blob_name)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        temp_path = f'{blob_path}.{os.getpid()}.part'
+        try:
+            try:
+                os.link(path, temp_path)
+            except OSError:
+                with open(path, 'rb') as src, open(temp_path, 'wb') as dst:
+                    for block in iter(lambda: src.read(HASH_BLOCK_SIZE), b''):
+                        dst.write(block)
+            os.replace(temp_path, blob_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self._queue_variants(blob_name)
+        return blob_name
+
+    def references(self, name):
+        """
+        blob을 참조하는 메뉴 이미지/매장 배너 수.
+        """
+        return sum(
+            apps.get_model(app_label, model_name).objects.filter(**{field: name}).count()
+            for app_label, model_name, field in REFERENCE_FIELDS
+        )
+
+    def release(self, name):
+        """
+        더 이상 참조하는 행이 없는 blob과 변형 이미지를 삭제. 삭제했으면 True를 반환한다.
+        내용 해시 이름이 아닌 기존 파일은 다른 곳에서 사용할 수 있으므로 삭제하지 않는다.
+        """
+        if not self.is_blob(name) or self.references(name):
+            return False
+        super().delete(name)
+        delete_variants(variant_base(name))
+        logger.debug(f"참조가 없는 미디어 파일 삭제: {name}")
+        return True
+
+
+media_storage = ContentAddressedStorage()
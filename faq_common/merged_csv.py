@@ -0,0 +1,214 @@
+import pandas as pd
+import glob
+import os
+import json
+import time
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+import logging
+from .webhook_questions import fetch_webhook_questions
+
+logger = logging.getLogger('faq')
+
+# 한 번에 메모리에 올리는 CSV 행 수 (스트리밍 병합 시 최대 메모리 사용량을 결정)
+DEFAULT_CHUNK_SIZE = 10000
+
+# merge_csv_files가 만든 결과 파일은 다시 읽지 않도록 제외
+MERGED_OUTPUT_PREFIX = 'public_merged_output_'
+
+
+# 폴더 내 대화 기록 CSV 파일 목록을 반환하는 함수 (병합 결과 파일은 제외)
+def list_conversation_files(folder_path):
+    csv_files = glob.glob(os.path.join(folder_path, '*.csv'))
+    return sorted(
+        file for file in csv_files
+        if not os.path.basename(file).startswith(MERGED_OUTPUT_PREFIX)
+    )
+
+
+# questions 필드에서 JSON 데이터를 파싱하고, question 값만 추출하는 함수
+def extract_questions(questions_json):
+    try:
+        questions_list = json.loads(questions_json)
+        # questions_list가 리스트일 경우, 각 항목에서 question 키 추출
+        if isinstance(questions_list, list):
+            return [item.get("question", "") for item in questions_list if isinstance(item, dict)]
+        return []
+    except (json.JSONDecodeError, TypeError):
+        logger.warning(f"JSON 형식이 올바르지 않거나 데이터가 누락되었습니다: {questions_json}")
+        return []
+
+
+# CSV 파일 하나를 청크 단위로 읽는 제너레이터 (skip_rows만큼의 앞쪽 데이터 행은 건너뜀)
+def read_csv_file_chunks(file, chunksize=DEFAULT_CHUNK_SIZE, skip_rows=0):
+    try:
+        # 필요한 열(2, 6번째 열)만 선택하여 청크 단위로 읽기
+        reader = pd.read_csv(
+            file, encoding='utf-8', usecols=[1, 5], chunksize=chunksize,  # 2열(agent_id), 6열(user_utterances)
+            skiprows=range(1, skip_rows + 1) if skip_rows else None,
+        )
+        with reader:
+            for chunk in reader:
+                yield chunk
+    except FileNotFoundError:
+        logger.error(f"파일을 찾을 수 없습니다: {file}")
+    except pd.errors.EmptyDataError:
+        logger.warning(f"빈 파일입니다: {file}")
+    except ValueError as ve:
+        logger.error(f"열 인덱스가 잘못되었습니다. 파일을 확인해주세요: {file}, 오류 메시지: {ve}")
+    except Exception as e:
+        logger.error(f"파일을 읽는 중 오류 발생: {file}, 오류 메시지: {e}")
+
+
+# CSV 파일을 청크 단위로 읽어 순서대로 반환하는 제너레이터
+def read_csv_chunks(csv_files, chunksize=DEFAULT_CHUNK_SIZE):
+    for file in csv_files:
+        yield from read_csv_file_chunks(file, chunksize)
+
+
+# 프로세스 풀에서 실행되는 파일 단위 파싱 작업
+def parse_csv_file(task):
+    """
+    (파일 경로, 건너뛸 행 수)를 받아 (파일 경로, DataFrame 또는 None, 소요 시간(초))을 반환.
+    """
+    file, skip_rows = task
+    start = time.perf_counter()
+    chunks = list(read_csv_file_chunks(file, DEFAULT_CHUNK_SIZE, skip_rows))
+    df = pd.concat(chunks, ignore_index=True) if chunks else None
+    return file, df, time.perf_counter() - start
+
+
+# faq와 faq_public의 통계 작업이 함께 사용하는 파싱용 프로세스 풀 (프로세스마다 하나)
+_parse_pool = None
+_parse_pool_workers = 0
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool(workers):
+    """
+    workers개의 프로세스를 가진 공용 프로세스 풀을 반환. 처음 호출될 때 생성하고 이후에는 재사용한다.
+    """
+    global _parse_pool, _parse_pool_workers
+    with _parse_pool_lock:
+        if _parse_pool is None or _parse_pool_workers != workers:
+            if _parse_pool is not None:
+                _parse_pool.shutdown(wait=False)
+            _parse_pool = ProcessPoolExecutor(max_workers=workers)
+            _parse_pool_workers = workers
+        return _parse_pool
+
+
+def _reset_parse_pool(pool):
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is pool:
+            _parse_pool = None
+    pool.shutdown(wait=False)
+
+
+# 여러 CSV 파일을 프로세스 풀에서 병렬로 파싱하는 제너레이터
+def parse_csv_files(tasks, workers):
+    """
+    tasks의 (파일 경로, 건너뛸 행 수)를 workers개의 프로세스에서 파싱하여 입력 순서대로 반환.
+    한 번에 workers * 2개까지만 제출하여 완료된 결과가 메모리에 무한정 쌓이지 않도록 한다.
+    """
+    tasks = iter(tasks)
+    executor = get_parse_pool(workers)
+    pending = deque(executor.submit(parse_csv_file, task) for task in itertools.islice(tasks, workers * 2))
+    try:
+        while pending:
+            file, df, elapsed = pending.popleft().result()
+            for task in itertools.islice(tasks, 1):
+                pending.append(executor.submit(parse_csv_file, task))
+            logger.debug(f"CSV 파싱 완료: {file}, {0 if df is None else len(df)}행, {elapsed:.3f}초")
+            yield file, df, elapsed
+    except BrokenProcessPool:
+        # 작업 프로세스가 비정상 종료되면 다음 호출에서 풀을 새로 만들도록 정리
+        _reset_parse_pool(executor)
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+# webhook_questionlog 데이터에서 질문 행을 한 번에 만드는 함수
+def build_question_rows(webhook_data, agent_id, columns=('agent_id', 'user_utterances')):
+    """
+    webhook_questionlog의 모든 행에서 question 값을 추출하여 (agent_id, user_utterances) DataFrame으로 반환.
+    질문마다 DataFrame을 이어 붙이지 않고 한 번에 생성하므로 질문 수에 선형으로 비례한다.
+    """
+    if webhook_data.empty:
+        return pd.DataFrame(columns=list(columns))
+
+    # questions 필드에서 JSON 데이터를 파싱하고, 행별 질문 목록을 하나의 열로 펼침
+    questions = webhook_data['questions'].map(extract_questions).explode().dropna()
+    return pd.DataFrame({columns[0]: agent_id, columns[1]: questions.to_numpy()})
+
+
+# CSV 파일 병합 함수
+def merge_csv_files(folder_path, using=None, chunksize=DEFAULT_CHUNK_SIZE, workers=1):
+    """
+    폴더 내 CSV 파일을 chunksize 행 단위로 스트리밍하여 하나의 CSV로 병합.
+    전체 데이터를 메모리에 올리지 않으므로 파일 수나 행 수와 관계없이 메모리 사용량이 일정하다.
+    workers가 2 이상이면 파일 파싱을 프로세스 풀로 분산하고, 결과는 파일 순서대로 병합한다.
+    """
+    # 폴더 내 모든 CSV 파일 경로 가져오기 (이전 병합 결과 파일은 제외)
+    csv_files = list_conversation_files(folder_path)
+
+    if not csv_files:
+        logger.debug("CSV 파일을 찾을 수 없습니다. 경로를 확인해주세요.")
+        return None
+
+    # 병합 중인 파일이 다른 요청에 노출되지 않도록 임시 파일에 먼저 기록
+    output_path = os.path.join(folder_path, f"public_merged_output_{datetime.now().strftime('%Y-%m-%d')}.csv")
+    temp_path = f"{output_path}.part"
+
+    if workers > 1 and len(csv_files) > 1:
+        chunks = (
+            df for _, df, _ in parse_csv_files(((file, 0) for file in csv_files), workers)
+            if df is not None
+        )
+    else:
+        chunks = read_csv_chunks(csv_files, chunksize)
+
+    first_agent_id = None
+    columns = None
+    rows = 0
+    try:
+        with open(temp_path, 'w', encoding='utf-8-sig', newline='') as sink:
+            for chunk in chunks:
+                if chunk.empty:
+                    continue
+                if columns is None:
+                    # 병합된 데이터의 첫 번째 agent_id 가져오기
+                    columns = list(chunk.columns)
+                    first_agent_id = chunk.iloc[0, 0]
+                chunk.columns = columns
+                chunk.to_csv(sink, index=False, header=(rows == 0))
+                rows += len(chunk)
+
+            if rows == 0:
+                logger.debug("병합할 데이터가 없습니다. 모든 파일이 비어있거나 오류가 발생했습니다.")
+                return None
+
+            # 특정 agent_id의 webhook_questionlog 테이블 데이터 가져오기 (Django 데이터베이스 연결 재사용)
+            webhook_data = pd.DataFrame(
+                fetch_webhook_questions(first_agent_id, using), columns=['id', 'questions']
+            )
+
+            # 모든 행의 question 값을 한 번에 추출하여 새로운 행으로 추가
+            question_df = build_question_rows(webhook_data, first_agent_id, columns)
+            if not question_df.empty:
+                question_df.to_csv(sink, index=False, header=False)
+
+        # 병합된 데이터를 지정된 폴더에 CSV로 저장
+        os.replace(temp_path, output_path)
+        logger.debug("병합된 파일이 성공적으로 저장되었습니다.")
+        return output_path
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
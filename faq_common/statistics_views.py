@@ -0,0 +1,114 @@
+import os
+import logging
+from redis.exceptions import RedisError
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .jobs import DONE, FAILED
+from .tasks import build_statistics, enqueue_statistics, get_statistics_job
+
+logger = logging.getLogger('faq')
+
+# 통계 요청에서 받을 수 있는 상위 발화 개수의 최대값
+MAX_STATISTICS_LIMIT = 100
+
+
+class StatisticsRequestSerializer(serializers.Serializer):
+    limit = serializers.IntegerField(min_value=1, max_value=MAX_STATISTICS_LIMIT, default=10)
+
+
+class StatisticsViewMixin:
+    """
+    faq와 faq_public의 통계 API 공통 설정. 각 앱은 authentication_classes와 tenant(TENANT_TYPES 중 하나)를
+    지정하고, 사용자 폴더 위치가 다르면 folder_path를 바꾼다.
+    """
+    permission_classes = [IsAuthenticated]  # 인증된 사용자만 접근 가능
+    tenant = None
+
+    def folder_path(self, user):
+        # 사용자별 CSV 파일 폴더 경로
+        return f'conversation_history/{user.user_id}'
+
+
+class BaseStatisticsView(StatisticsViewMixin, APIView):
+    status_url = None  # 작업 상태 조회 경로 ({job_id}에 작업 ID가 들어감)
+
+    def post(self, request, *args, **kwargs):
+        try:
+            folder_path = self.folder_path(request.user)
+
+            # 사용자 폴더가 존재하는지 확인
+            if not os.path.exists(folder_path):
+                return Response({"status": "no folder", "message": "사용자 데이터 폴더가 존재하지 않습니다."})
+
+            # 상위 발화 개수(limit)는 정수만 허용 (잘못된 값은 작업을 만들지 않고 400)
+            serializer = StatisticsRequestSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            params = {
+                'folder_path': folder_path,
+                'user_id': request.user.user_id,
+                'limit': serializer.validated_data['limit'],
+                'start_date': request.data.get('start_date'),
+                'end_date': request.data.get('end_date'),
+            }
+
+            # 통계 생성은 작업 큐에 넣고 작업 ID를 바로 반환 (진행 상황은 상태 조회 API에서 확인)
+            try:
+                job_id = enqueue_statistics(self.tenant, params)
+            except RedisError as e:
+                # 작업 큐를 사용할 수 없으면 요청 안에서 바로 생성
+                # (웹 서버 프로세스마다 프로세스 풀이 남지 않도록 파싱은 현재 프로세스에서 처리)
+                logger.warning(f"작업 큐를 사용할 수 없어 통계를 바로 생성합니다: {e}")
+                result = build_statistics(tenant=self.tenant, workers=1, **params)
+
+                # 적재된 데이터가 없으면 파일 없음 메시지 반환
+                if result is None:
+                    return Response({"status": "no file", "message": "해당 파일이 존재하지 않습니다."}, status=status.HTTP_404_NOT_FOUND)
+
+                return Response({"status": "success", **result}, status=status.HTTP_200_OK)
+
+            return Response({
+                "status": "queued",
+                "job_id": job_id,
+                "status_url": self.status_url.format(job_id=job_id),
+            }, status=status.HTTP_202_ACCEPTED)
+
+        except Exception as e:
+            # 오류 메시지 로그 출력
+            logger.error(f"오류 발생: {str(e)}")
+            return Response({"status": "error", "message": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# 통계 생성 작업의 진행 상황과 결과를 조회하는 API
+class BaseStatisticsStatusView(StatisticsViewMixin, APIView):
+
+    def get(self, request, job_id, *args, **kwargs):
+        try:
+            job = get_statistics_job(self.tenant, request.user.user_id, job_id)
+        except RedisError as e:
+            logger.error(f"작업 큐 조회 중 오류 발생: {e}")
+            return Response({"status": "error", "message": "작업 상태를 조회할 수 없습니다."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        # 다른 사용자의 작업은 조회할 수 없음
+        if job is None:
+            return Response({"status": "not found", "message": "작업을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+
+        response_data = {
+            "status": job['status'],
+            "job_id": job_id,
+            "progress": job['progress'],
+            "message": job['message'],
+        }
+
+        if job['status'] == FAILED:
+            response_data['message'] = job['error']
+        elif job['status'] == DONE:
+            if job['result'] is None:
+                return Response({"status": "no file", "message": "해당 파일이 존재하지 않습니다."}, status=status.HTTP_404_NOT_FOUND)
+            response_data.update(job['result'])
+            response_data['status'] = "success"
+
+        return Response(response_data, status=status.HTTP_200_OK)
@@ -0,0 +1,105 @@
+import os
+import logging
+from datetime import datetime
+from django.conf import settings
+from .conversation_store import ConversationStore
+from .artifact_cache import ArtifactCache
+from .image_variants import build_variants
+from .jobs import enqueue, get_job
+
+logger = logging.getLogger('faq')
+
+# 통계 기능을 사용하는 테넌트 종류 (작업 소유자와 캐시 네임스페이스 구분에 사용)
+TENANT_TYPES = ('faq', 'faq_public')
+
+
+def build_statistics(folder_path, user_id, tenant='faq', limit=10, start_date=None, end_date=None, progress=None,
+                     workers=None):
+    """
+    사용자 폴더의 대화 기록을 저장소에 적재하고 통계 응답 데이터를 만든다.
+    적재된 데이터가 없으면 None을 반환한다.
+    입력 파일과 webhook 데이터가 이전 호출과 같으면 캐시된 결과와 산출물을 그대로 사용한다.
+    workers: 파일 파싱 프로세스 수 (None이면 STATISTICS_INGEST_WORKERS). 웹 요청 안에서는 1을 사용한다.
+    """
+    merged_file_path = os.path.join(folder_path, f"public_merged_output_{datetime.now().strftime('%Y-%m-%d')}.csv")
+    chart_path = os.path.join(settings.MEDIA_ROOT, 'statistics', str(user_id), 'most_common_utterances.png')
+
+    # 최초 적재처럼 새 파일이 많을 때는 STATISTICS_INGEST_WORKERS개의 프로세스로 나누어 파싱 (작업 워커에서만)
+    if workers is None:
+        workers = getattr(settings, 'STATISTICS_INGEST_WORKERS', os.cpu_count() or 1)
+    store = ConversationStore(folder_path, workers=workers)
+
+    # webhook 질문은 이 사용자의 에이전트 것만 캐시 키에 반영 (새 에이전트는 CSV 파일 변경으로 반영됨)
+    cache = ArtifactCache(namespace=tenant)
+    cache_key = cache.fingerprint(
+        folder_path, agent_ids=store.agent_ids(),
+        user_id=str(user_id), limit=limit, start_date=start_date, end_date=end_date
+    )
+    entry = cache.get(cache_key)
+    if entry is not None:
+        logger.debug(f"통계 캐시 적중: {folder_path} ({cache_key})")
+        if not os.path.exists(merged_file_path):
+            cache.restore(entry, 'merged', merged_file_path)
+        if not os.path.exists(chart_path):
+            cache.restore(entry, 'chart', chart_path)
+        return entry['result']
+
+    added = store.ingest(progress=progress)
+    for name, rows, elapsed in store.timings:
+        logger.debug(f"대화 기록 적재: {name}, {rows}행, {elapsed:.3f}초")
+
+    # 조회 기간(YYYY-MM-DD)과 상위 발화 개수는 선택 항목
+    statistics = store.statistics(limit=limit, start_date=start_date, end_date=end_date)
+    if not statistics['rows']:
+        cache.put(cache_key, None)
+        return None
+
+    # 새 데이터가 있을 때만 병합 결과 파일을 갱신
+    if added or not os.path.exists(merged_file_path):
+        store.export_merged_csv(merged_file_path)
+
+    most_common_utterances = [
+        item for agent in statistics['agents'] for item in agent['most_common_utterances']
+    ]
+    result = {
+        "data": most_common_utterances,
+        "image_url": f"/media/statistics/{user_id}/most_common_utterances.png",
+    }
+    cache.put(cache_key, result, {'merged': merged_file_path, 'chart': chart_path})
+    return result
+
+
+def build_statistics_job(job, **kwargs):
+    """
+    작업 큐에서 실행되는 통계 생성 작업 (jobs.run_worker가 호출).
+    """
+    return build_statistics(progress=job.progress, **kwargs)
+
+
+def enqueue_statistics(tenant, params):
+    """
+    통계 생성 작업을 공용 statistics 큐에 넣고 작업 ID를 반환.
+    같은 사용자가 같은 조건으로 요청한 작업이 진행 중이면 그 작업 ID를 반환한다.
+    """
+    user_id = params['user_id']
+    return enqueue(
+        'faq_common.tasks.build_statistics_job', {**params, 'tenant': tenant},
+        owner=f'{tenant}:{user_id}', queue='statistics',
+        dedupe_key=f"statistics:{tenant}:{user_id}:{params['limit']}:{params['start_date']}:{params['end_date']}",
+    )
+
+
+def get_statistics_job(tenant, user_id, job_id):
+    """
+    사용자의 통계 작업 정보를 반환 (없거나 다른 사용자의 작업이면 None).
+    """
+    return get_job(job_id, owner=f'{tenant}:{user_id}')
+
+
+def generate_image_variants_job(job, source_name, base, context=None):
+    """
+    작업 큐에서 실행되는 변형 이미지 생성 작업 (메뉴 사진/배너/피드 이미지 저장 시 등록).
+    만든 뒤 variants_generated signal을 보내, 이미지를 사용하는 앱이 캐시된 응답을 갱신하도록 한다.
+    """
+    manifest = build_variants(source_name, base, context)
+    return {'variants': sorted(manifest, key=int)}
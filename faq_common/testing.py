@@ -0,0 +1,49 @@
+"""
+faq / faq_public 테스트에서 함께 사용하는 테스트 도구.
+"""
+import io
+import shutil
+import tempfile
+from django.core.cache import cache
+from django.test import override_settings
+from PIL import Image
+from rest_framework.test import APIRequestFactory
+
+
+def png_bytes(size=(40, 30)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (200, 100, 50)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def temp_dir_setting(testcase, name):
+    """
+    설정 name을 임시 폴더로 바꾸고, 테스트가 끝나면 설정을 되돌리고 폴더를 삭제.
+    """
+    path = tempfile.mkdtemp()
+    temp_settings = override_settings(**{name: path})
+    temp_settings.enable()
+    testcase.addCleanup(temp_settings.disable)
+    testcase.addCleanup(shutil.rmtree, path, ignore_errors=True)
+    return path
+
+
+class MediaRootMixin:
+    """
+    테스트마다 임시 MEDIA_ROOT를 사용하고 끝나면 삭제.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = temp_dir_setting(self, 'MEDIA_ROOT')
+
+
+class APIViewTestMixin:
+    """
+    테스트마다 캐시를 비우고 self.factory(APIRequestFactory)를 준비.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.factory = APIRequestFactory()
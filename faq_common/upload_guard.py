@@ -0,0 +1,189 @@
+import re
+import logging
+from django.conf import settings
+from django.core import checks
+from django.core.files.uploadhandler import FileUploadHandler
+from django.http import JsonResponse
+from rest_framework.exceptions import APIException
+from .chunked_upload import MAX_CHUNK_SIZE
+from .file_signatures import SNIFF_LENGTH, CONTENT_TYPES, file_extension, matches_signature
+
+logger = logging.getLogger('faq')
+
+# settings.py에 다음과 같이 등록해야 동작한다 (DEBUG가 꺼져 있으면 등록하지 않은 경우 시스템 검사 오류).
+#
+#   MIDDLEWARE = [
+#       'django.middleware.security.SecurityMiddleware',
+#       'faq_common.upload_guard.UploadGuardMiddleware',  # 요청 본문을 읽는 미들웨어(CSRF 등)보다 앞에 둔다
+#       ...
+#   ]
+#
+#   # UploadGuardHandler는 미들웨어가 요청마다 맨 앞에 추가하며 파일을 직접 저장하지 않으므로,
+#   # 파일을 저장하는 기본 핸들러는 그대로 두어야 한다 (FILE_UPLOAD_HANDLERS를 바꾸는 경우에도 포함).
+#   FILE_UPLOAD_HANDLERS = [
+#       'django.core.files.uploadhandler.MemoryFileUploadHandler',
+#       'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+#   ]
+MIDDLEWARE_PATH = 'faq_common.upload_guard.UploadGuardMiddleware'
+
+MB = 1024 * 1024
+
+# 업로드 파일 종류별 허용 확장자와 최대 크기 (serializer 검증과 업로드 중 검사에서 함께 사용)
+IMAGE_EXTENSIONS = ['png', 'jpg', 'jpeg']
+FEED_UPLOAD_EXTENSIONS = ['png', 'jpg', 'jpeg', 'gif']
+EDIT_FILE_EXTENSIONS = [
+    'pdf', 'docx', 'doc', 'txt', 'xlsx', 'xls', 'csv', 'hwp', 'pptx', 'ppt',
+    'jpg', 'jpeg', 'png', 'gif', 'zip'
+]
+IMAGE_MAX_FILE_SIZE = getattr(settings, 'IMAGE_MAX_FILE_SIZE', 10 * MB)  # 프로필 사진, 배너
+MENU_IMAGE_MAX_FILE_SIZE = getattr(settings, 'MENU_IMAGE_MAX_FILE_SIZE', 5 * MB)
+FEED_MAX_FILE_SIZE = getattr(settings, 'FEED_MAX_FILE_SIZE', 20 * MB)
+EDIT_MAX_FILE_SIZE = getattr(settings, 'EDIT_MAX_FILE_SIZE', 50 * MB)  # 수정 요청 첨부 파일 (문서, 압축 파일)
+
+# 여러 메뉴를 한 번에 등록/수정하는 요청의 전체 크기
+MENU_UPLOAD_MAX_BODY_SIZE = getattr(settings, 'MENU_UPLOAD_MAX_BODY_SIZE', 100 * MB)
+
+# multipart 요청에서 파일 외의 필드와 경계 문자열에 허용하는 크기
+FORM_OVERHEAD = MB
+
+
+def _rule(extensions, max_file_size, max_body_size=None):
+    return {
+        'extensions': extensions,
+        'max_file_size': max_file_size,
+        'max_body_size': max_body_size or max_file_size + FORM_OVERHEAD,
+    }
+
+
+# 경로(정규식)별 업로드 제한. extensions가 None이면 본문 크기(Content-Length)만 확인한다.
+DEFAULT_RULES = (
+    (r'^/api/feed-upload/$', _rule(FEED_UPLOAD_EXTENSIONS, FEED_MAX_FILE_SIZE)),
+    (r'^/api/menu-details/$', _rule(IMAGE_EXTENSIONS, MENU_IMAGE_MAX_FILE_SIZE, MENU_UPLOAD_MAX_BODY_SIZE)),
+    (r'^/(api|public)/edit/$', _rule(EDIT_FILE_EXTENSIONS, EDIT_MAX_FILE_SIZE)),
+    (r'^/(api|public)/(signup|user-profile|update-profile-photo)/$', _rule(IMAGE_EXTENSIONS, IMAGE_MAX_FILE_SIZE)),
+    (r'^/api/user-stores/\d+/$', _rule(IMAGE_EXTENSIONS, IMAGE_MAX_FILE_SIZE)),
+    (r'^/public/public-register/$', _rule(IMAGE_EXTENSIONS, IMAGE_MAX_FILE_SIZE)),
+    (r'^/api/uploads/[^/]+/chunks/\d+/$', {'extensions': None, 'max_body_size': MAX_CHUNK_SIZE}),
+)
+
+
+class UploadRejected(APIException):
+    """
+    업로드 제한을 넘은 요청. 본문을 끝까지 읽지 않고 {'error': 메시지} 응답으로 중단한다.
+    """
+    status_code = 413
+    default_code = 'upload_rejected'
+
+    def __init__(self, message, status_code=413):
+        super().__init__({'error': message})
+        self.status_code = status_code
+
+
+def _size_message(max_size):
+    return f"파일 크기가 너무 큽니다. 최대 허용 크기는 {max_size // MB}MB입니다."
+
+
+class UploadGuardHandler(FileUploadHandler):
+    """
+    multipart 본문을 읽는 동안 파일마다 확장자, 파일 앞부분의 시그니처, 크기를 확인하는 업로드 핸들러.
+    다음 핸들러(메모리/임시 파일)보다 먼저 실행되므로, 제한을 넘는 파일은 임시 파일로 저장되기 전에 중단된다.
+    """
+
+    def __init__(self, request, rule):
+        super().__init__(request)
+        self.rule = rule
+        self.received = 0
+
+    def new_file(self, field_name, file_name, content_type, *args, **kwargs):
+        super().new_file(field_name, file_name, content_type, *args, **kwargs)
+        self.received = 0
+        extension = file_extension(file_name)
+        if extension not in self.rule['extensions']:
+            raise UploadRejected(
+                f"허용되지 않는 파일 형식입니다: {extension or file_name}. "
+                f"허용된 확장자는 {', '.join(self.rule['extensions'])}입니다.", status_code=415
+            )
+        # 이미지는 Content-Type도 확장자에 맞아야 함 (Content-Type 목록이 없는 문서 형식은 시그니처로만 확인)
+        allowed_types = CONTENT_TYPES.get(extension)
+        if allowed_types and (content_type or '').lower() not in allowed_types:
+            raise UploadRejected(
+                f"파일의 Content-Type({content_type})이 확장자({extension})와 일치하지 않습니다.", status_code=415
+            )
+
+    def receive_data_chunk(self, raw_data, start):
+        if start == 0 and not matches_signature(file_extension(self.file_name), raw_data[:SNIFF_LENGTH]):
+            raise UploadRejected("파일 내용이 확장자와 일치하지 않습니다.", status_code=415)
+        self.received += len(raw_data)
+        if self.received > self.rule['max_file_size']:
+            raise UploadRejected(_size_message(self.rule['max_file_size']))
+        return raw_data
+
+    def file_complete(self, file_size):
+        # 파일 객체는 다음 핸들러가 만듦
+        return None
+
+
+class UploadGuardMiddleware:
+    """
+    업로드 경로의 요청을 본문을 읽기 전에 Content-Length로 확인하고, 파일 검사 핸들러를 추가하는 미들웨어.
+    settings.UPLOAD_GUARD_RULES로 (경로 정규식, 제한) 목록을 바꿀 수 있다.
+    본문을 읽는 다른 미들웨어보다 앞에 두어야 한다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.rules = [
+            (re.compile(pattern), rule)
+            for pattern, rule in getattr(settings, 'UPLOAD_GUARD_RULES', DEFAULT_RULES)
+        ]
+
+    def match(self, path):
+        for pattern, rule in self.rules:
+            if pattern.match(path):
+                return rule
+        return None
+
+    def __call__(self, request):
+        rule = self.match(request.path_info) if request.method in ('POST', 'PUT', 'PATCH') else None
+        if rule is not None:
+            try:
+                content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+            except ValueError:
+                return JsonResponse(
+                    {'error': '요청 크기(Content-Length)가 올바르지 않습니다.'},
+                    status=400, json_dumps_params={'ensure_ascii': False}
+                )
+
+            if content_length > rule['max_body_size']:
+                logger.warning(f"업로드 크기 제한 초과로 요청 거부: {request.path_info} ({content_length}바이트)")
+                return JsonResponse(
+                    {'error': _size_message(rule.get('max_file_size', rule['max_body_size']))},
+                    status=413, json_dumps_params={'ensure_ascii': False}
+                )
+
+            if rule.get('extensions'):
+                request.upload_handlers.insert(0, UploadGuardHandler(request, rule))
+
+        return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        # DRF 뷰가 아닌 곳에서 본문을 읽다가 중단된 경우에도 같은 형식으로 응답
+        if isinstance(exception, UploadRejected):
+            return JsonResponse(exception.detail, status=exception.status_code, json_dumps_params={'ensure_ascii': False})
+        return None
+
+
+def check_middleware(app_configs, **kwargs):
+    """
+    UploadGuardMiddleware가 MIDDLEWARE에 없으면 업로드 제한은 본문을 모두 받은 뒤 serializer에서만 확인된다.
+    운영 환경(DEBUG가 꺼진 경우)에서는 오류, 개발 환경에서는 경고로 알린다.
+    """
+    if MIDDLEWARE_PATH in getattr(settings, 'MIDDLEWARE', []):
+        return []
+    level = checks.Warning if settings.DEBUG else checks.Error
+    return [level(
+        f"{MIDDLEWARE_PATH}가 MIDDLEWARE에 등록되어 있지 않습니다.",
+        hint="업로드 크기/형식을 본문을 받기 전에 확인하려면 SecurityMiddleware 다음에 추가하세요 "
+             "(faq_common/upload_guard.py 상단의 설정 예시 참고).",
+        id='faq_common.W001' if settings.DEBUG else 'faq_common.E001',
+    )]
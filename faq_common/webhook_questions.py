@@ -0,0 +1,58 @@
+import logging
+from django.conf import settings
+from django.db import connections, DatabaseError
+
+logger = logging.getLogger('faq')
+
+# agent_id별 조회에 사용하는 인덱스. webhook 앱의 테이블이므로 이 프로젝트의 마이그레이션으로 만들 수 없어
+# 배포할 때 `python manage.py create_webhook_indexes`로 한 번 생성한다 (요청/작업 중에는 DDL을 실행하지 않음).
+AGENT_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS webhook_questionlog_agent_id_id "
+    "ON webhook_questionlog (agent_id, id)"
+)
+QUESTIONS_BY_AGENT_SQL = "SELECT id, questions FROM webhook_questionlog WHERE agent_id = %s ORDER BY id"
+LATEST_ROW_ID_SQL = "SELECT MAX(id) FROM webhook_questionlog WHERE agent_id = %s"
+
+
+def webhook_db_alias(using=None):
+    """
+    webhook_questionlog가 있는 데이터베이스 별칭 (WEBHOOK_DB_ALIAS, 기본값은 default).
+    """
+    return using or getattr(settings, 'WEBHOOK_DB_ALIAS', 'default')
+
+
+def create_agent_index(using=None):
+    """
+    webhook_questionlog의 (agent_id, id) 인덱스를 생성 (이미 있으면 그대로 둠). 오류는 그대로 발생한다.
+    """
+    with connections[webhook_db_alias(using)].cursor() as cursor:
+        cursor.execute(AGENT_INDEX_SQL)
+
+
+def fetch_webhook_questions(agent_id, using=None):
+    """
+    agent_id의 webhook_questionlog 행을 (id, questions) 목록으로 반환 (조회에 실패하면 빈 목록).
+    Django의 연결(CONN_MAX_AGE 설정 시 재사용)을 사용하며, (agent_id, id) 인덱스로 조회한다.
+    """
+    try:
+        with connections[webhook_db_alias(using)].cursor() as cursor:
+            cursor.execute(QUESTIONS_BY_AGENT_SQL, [agent_id])
+            return cursor.fetchall()
+    except DatabaseError as e:
+        logger.warning(f"webhook_questionlog 조회 중 오류 발생: {e}")
+        return []
+
+
+def latest_webhook_row_id(agent_id, using=None):
+    """
+    agent_id의 webhook_questionlog 가장 최근 행 id (행이 없거나, 테이블이 없거나, 조회에 실패하면 0).
+    다른 에이전트의 질문이 추가되어도 값이 바뀌지 않으며, (agent_id, id) 인덱스로 조회한다.
+    """
+    try:
+        with connections[webhook_db_alias(using)].cursor() as cursor:
+            cursor.execute(LATEST_ROW_ID_SQL, [agent_id])
+            row = cursor.fetchone()
+    except DatabaseError as e:
+        logger.warning(f"webhook_questionlog 조회 중 오류 발생: {e}")
+        return 0
+    return row[0] or 0
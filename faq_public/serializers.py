@@ -2,6 +2,7 @@ from rest_framework import serializers
 from .models import Public_User, Public, Public_Edit, Public_Complaint, Public_Department
 from rest_framework.exceptions import ValidationError
 from django.contrib.auth.hashers import make_password
+from faq_common.upload_guard import IMAGE_EXTENSIONS, IMAGE_MAX_FILE_SIZE, EDIT_FILE_EXTENSIONS, EDIT_MAX_FILE_SIZE
 import re
 
 # 파일 검증 유틸리티 함수
@@ -11,7 +12,7 @@ def validate_file(value, allowed_extensions, max_file_size, error_message_prefix
         return f"{error_message_prefix} 유효하지 않은 파일 형식입니다. " \
                f".{', .'.join(allowed_extensions)} 파일만 허용됩니다."
     if value.size > max_file_size:
-        return f"{error_message_prefix} 파일 크기는 {max_file_size // (1000 * 1024 * 1024)}MB 이하이어야 합니다."
+        return f"{error_message_prefix} 파일 크기는 {max_file_size // (1024 * 1024)}MB 이하이어야 합니다."
     return None
 
 
@@ -46,7 +47,7 @@ class PublicUserSerializer(serializers.ModelSerializer):
         return value
     
     def validate_profile_photo(self, value):
-        error_message = validate_file(value, ['png', 'jpg', 'jpeg'], 1000 * 1024 * 1024, "프로필 사진")
+        error_message = validate_file(value, IMAGE_EXTENSIONS, IMAGE_MAX_FILE_SIZE, "프로필 사진")
         if error_message:
             raise serializers.ValidationError(error_message)
         return value
@@ -79,7 +80,7 @@ class PublicSerializer(serializers.ModelSerializer):
     def validate_banner(self, value):
         if value in [None, '']:
             return value
-        error_message = validate_file(value, ['png', 'jpg', 'jpeg'], 1000 * 1024 * 1024, "배너 사진")
+        error_message = validate_file(value, IMAGE_EXTENSIONS, IMAGE_MAX_FILE_SIZE, "배너 사진")
         if error_message:
             raise serializers.ValidationError({"banner": error_message})
         return value
@@ -140,10 +141,8 @@ class PublicEditSerializer(serializers.ModelSerializer):
     def validate_file(self, value):
         if value is None:
             return value
-        allowed_extensions = ['pdf', 'docx', 'doc', 'txt', 'xlsx', 'xls', 'csv', 'hwp', 'pptx', 'ppt', 'jpg', 'jpeg', 'png', 'gif', 'zip']
-        max_file_size = 1000 * 1024 * 1024
-        if value.name.split('.')[-1].lower() in ['zip']:
-            max_file_size = 1000 * 1024 * 1024
+        allowed_extensions = EDIT_FILE_EXTENSIONS
+        max_file_size = EDIT_MAX_FILE_SIZE
         file_extension = value.name.split('.')[-1].lower()
         if file_extension not in allowed_extensions:
             raise serializers.ValidationError(f"허용되지 않는 파일 확장자입니다: {file_extension}. 허용된 확장자는 {', '.join(allowed_extensions)}입니다.")
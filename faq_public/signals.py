@@ -4,7 +4,7 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 from .models import User, Edit
 import requests, logging
-from .excel_processor import process_excel_and_save_to_db  # 엑셀 처리 함수 import
+from faq.excel_processor import process_excel_and_save_to_db  # 엑셀 처리 함수 import
 
 # 디버깅을 위한 로거 설정
 logger = logging.getLogger('faq')
@@ -1,3 +1,63 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from rest_framework.test import force_authenticate
+from faq_common.testing import APIViewTestMixin, MediaRootMixin
+from faq_common.upload_guard import UploadGuardMiddleware, EDIT_MAX_FILE_SIZE
+from .models import Public, Public_User, Public_Edit
+from .views import EditView
 
-# Create your tests here.
+
+class EditUploadTests(MediaRootMixin, APIViewTestMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.public = Public.objects.create(public_name='기관')
+        cls.user = Public_User.objects.create_user(
+            username='public', password='password1!', phone='010-0000-0001', public=cls.public
+        )
+
+    def edit_view(self, request):
+        force_authenticate(request, user=self.user)
+        return EditView.as_view()(request)
+
+    def post(self, name, content, content_type='application/octet-stream', guard=True):
+        request = self.factory.post('/public/edit/', {
+            'title': '수정 요청', 'files': SimpleUploadedFile(name, content, content_type=content_type),
+        }, format='multipart')
+        response = UploadGuardMiddleware(self.edit_view)(request) if guard else self.edit_view(request)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def test_document_is_saved(self):
+        response = self.post('요청.pdf', b'%PDF-1.4\n' + b'0' * 100, content_type='application/pdf')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Public_Edit.objects.get().title, '수정 요청')
+
+    def test_guard_rejects_file_over_edit_limit(self):
+        request = self.factory.post('/public/edit/', {'title': '수정 요청'}, format='multipart')
+        request.META['CONTENT_LENGTH'] = str(EDIT_MAX_FILE_SIZE * 2)
+        with self.assertLogs('faq', 'WARNING'):
+            response = UploadGuardMiddleware(self.edit_view)(request)
+
+        self.assertEqual(response.status_code, 413)
+
+    def test_guard_rejects_wrong_extension(self):
+        response = self.post('설치.exe', b'MZ' + b'\0' * 100)
+
+        self.assertEqual(response.status_code, 415)
+        self.assertFalse(Public_Edit.objects.exists())
+
+    def test_guard_rejects_content_not_matching_extension(self):
+        response = self.post('요청.pdf', b'MZ' + b'\0' * 100, content_type='application/pdf')
+
+        self.assertEqual(response.status_code, 415)
+        self.assertFalse(Public_Edit.objects.exists())
+
+    def test_serializer_rejects_wrong_extension_without_guard(self):
+        response = self.post('설치.exe', b'MZ' + b'\0' * 100, guard=False)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('file', response.data)
+        self.assertFalse(Public_Edit.objects.exists())
@@ -9,7 +9,7 @@ from .views import (
     PublicCreateView, PublicListView, PublicDetailView,
     GenerateQrCodeView, QrCodeImageView,
     UserProfileView, UserProfilePhotoUpdateView,
-    EditView, StatisticsView, 
+    EditView, StatisticsView, StatisticsStatusView,
     ComplaintsView, ComplaintsRegisterView, ComplaintTransferView,
     ComplaintUpdateStatusView, ComplaintsCustomerView, ComplaintAnswerView,
     DepartmentListView, DepartmentCreateAPIView, DepartmentUpdateView,
@@ -43,6 +43,7 @@ urlpatterns = [
     path('department-update/', DepartmentUpdateView.as_view(), name='update-department'),
 
     path('statistics/', StatisticsView.as_view(), name='statistics'),
+    path('statistics/status/<str:job_id>/', StatisticsStatusView.as_view(), name='statistics_status'),
         
     path('reset-password/', PasswordResetView.as_view(), name='reset_password'),
     path('deactivate-account/', DeactivateAccountView.as_view(), name='deactivate_account'),
@@ -1,6 +1,7 @@
 from django.contrib.auth.hashers import check_password, make_password
 from django.core.cache import cache
 from django.db import transaction
+from django.db.models import Count, Max
 from django.conf import settings
 from django.shortcuts import get_object_or_404 
 from django.utils.text import slugify
@@ -14,7 +15,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 import requests, random, logging, json, os, shutil
-from .merged_csv import merge_csv_files
+from faq_common.statistics_views import BaseStatisticsView, BaseStatisticsStatusView
+from faq_common.http_cache import make_etag, digest_etag, epoch, conditional_response
 
 
 # QR 코드 생성에 필요한 라이브러리
@@ -519,10 +521,9 @@ class PublicInfoView(APIView):
     permission_classes = [AllowAny]  # 기본적으로 인증 없이 접근 가능
 
     def dispatch(self, request, *args, **kwargs):
-        data = json.loads(request.body)
-        user_type = data.get('type')  # JSON 본문에서 'type'을 추출합니다.
-        #logger.debug(f"Received type: {user_type}, slug: {slug}")
-
+        # 요청 값은 여기서 한 번만 파싱하여 get/post에서 사용
+        self.params = self.parse_params(request)
+        user_type = self.params.get('type')  # 'type' 값을 추출합니다.
 
         if user_type == 'owner':
             self.authentication_classes = [PublicUserJWTAuthentication]
@@ -530,25 +531,47 @@ class PublicInfoView(APIView):
 
         return super().dispatch(request, *args, **kwargs)
 
+    def parse_params(self, request):
+        """
+        GET은 쿼리 파라미터, POST는 JSON 본문에서 'type'과 'slug'를 가져옴
+        """
+        if request.method in ('GET', 'HEAD'):
+            return request.GET
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, request):
+        return self.public_info(request, self.params.get('slug'))
+
     def post(self, request):
-        # 요청에서 'type'과 'slug' 가져오기
-        data = json.loads(request.body)
-        slug = data.get('slug')
-        #logger.debug(f"Post method - Received type: {user_type}, slug: {slug}")
+        return self.public_info(request, self.params.get('slug'))
 
+    def public_info(self, request, slug):
         try:
-            # slug에 해당하는 공공기관 정보 가져오기
-            public = Public.objects.get(slug=slug)
-            #logger.debug(f"Public institution found: {public}")
-
-            # 공공기관 데이터 직렬화
-            public_data = PublicSerializer(public).data
+            # 수정 시각으로 변경 여부를 먼저 확인하고, 바뀐 경우에만 공공기관 정보를 가져옴
+            validators = Public.objects.filter(slug=slug).values_list('public_id', 'updated_at').first()
+            if validators is None:
+                raise Public.DoesNotExist
+            public_id, updated_at = validators
+            updated = int(updated_at.timestamp() * 1000000) if updated_at else 0
+
+            def build():
+                # 공공기관 데이터 직렬화
+                public_data = PublicSerializer(Public.objects.get(slug=slug)).data
+
+                # 응답 데이터 생성
+                response_data = {
+                    "public": public_data
+                }
+                return Response(response_data, status=status.HTTP_200_OK)
 
-            # 응답 데이터 생성
-            response_data = {
-                "public": public_data
-            }
-            return Response(response_data, status=status.HTTP_200_OK)
+            return conditional_response(
+                request, build, make_etag('public', public_id, updated), epoch(updated_at),
+                private=self.params.get('type') == 'owner'
+            )
 
         except Public.DoesNotExist:
             logger.error(f"No public institution found for slug: {slug}")
@@ -565,9 +588,20 @@ class PublicListView(APIView):
 
     def get(self, request, *args, **kwargs):
         try:
-            public_list = Public.objects.all()
-            serializer = PublicSerializer(public_list, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            # 기관 수와 마지막 수정 시각으로 목록의 변경 여부를 확인 (추가/삭제/수정 시 바뀜)
+            summary = Public.objects.aggregate(count=Count('public_id'), last_id=Max('public_id'), updated_at=Max('updated_at'))
+            updated_at = summary['updated_at']
+            etag = make_etag(
+                'publics', summary['count'], summary['last_id'] or 0,
+                int(updated_at.timestamp() * 1000000) if updated_at else 0
+            )
+
+            def build():
+                public_list = Public.objects.all()
+                serializer = PublicSerializer(public_list, many=True)
+                return Response(serializer.data, status=status.HTTP_200_OK)
+
+            return conditional_response(request, build, etag, epoch(updated_at))
         except Exception as e:
             logger.error(f"PublicListView 오류 발생: {str(e)}")
             return Response({"error": "기관 목록을 불러오는 중 오류가 발생했습니다."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -610,10 +644,17 @@ class PublicDetailView(APIView):
 class DepartmentListView(APIView):
     permission_classes = [AllowAny]
 
+    def get(self, request):
+        # POST 조회와 같은 응답을 쿼리 파라미터로 조회 (브라우저/CDN 캐시 가능)
+        return self.department_list(request, request.query_params)
+
     def post(self, request):
+        return self.department_list(request, request.data)
+
+    def department_list(self, request, data):
         try:
-            slug = request.data.get('slug')
-            public_id = request.data.get('publicID')
+            slug = data.get('slug')
+            public_id = data.get('publicID')
 
             if not slug and not public_id:
                 return Response({'error': 'slug 또는 publicID 중 하나를 제공해야 합니다.'}, status=400)
@@ -644,7 +685,11 @@ class DepartmentListView(APIView):
 
             # 부서가 존재할 경우와 없는 경우 응답 구분
             if departments:
-                return Response({'departments': list(departments)}, status=200)
+                # 부서에는 수정 시각이 없으므로 부서 이름 목록으로 ETag 계산
+                return conditional_response(
+                    request, lambda: Response({'departments': list(departments)}, status=200),
+                    digest_etag('departments', departments)
+                )
             else:
                 return Response({'message': '해당 public_id 또는 slug에 대한 부서가 없습니다.'}, status=404)
 
@@ -899,41 +944,15 @@ class QrCodeImageView(APIView):
             return Response({'error': 'An unexpected error occurred.'}, status=500)
 
 
-class StatisticsView(APIView):
-    authentication_classes = [PublicUserJWTAuthentication]  # 커스텀 인증 클래스 사용
-    permission_classes = [IsAuthenticated]  # 인증된 사용자만 접근 가능
-
-    def post(self, request, *args, **kwargs):
-        try:
-            # 사용자별 CSV 파일 폴더 경로 지정
-            folder_path = f'conversation_history/{request.user.user_id}'
-
-            # 사용자 폴더가 존재하는지 확인
-            if not os.path.exists(folder_path):
-                #logger.debug(f"{folder_path} 경로가 존재하지 않습니다.")
-                return Response({"status": "no folder", "message": "사용자 데이터 폴더가 존재하지 않습니다."})
-            
-            # CSV 파일 병합 함수 호출
-            merged_file_path = merge_csv_files(folder_path)
-            
-            # 병합된 파일이 없으면 파일 없음 메시지 반환
-            if not merged_file_path or not os.path.exists(merged_file_path):
-                #logger.debug("병합된 파일이 존재하지 않습니다.")
-                return Response({"status": "no file", "message": "해당 파일이 존재하지 않습니다."}, status=status.HTTP_404_NOT_FOUND)
-
-            # 이미지 URL을 응답에 포함
-            response_data = {
-                "status": "success",
-                "data": most_common_utterances,
-                "image_url": f"/media/statistics/{request.user.user_id}/most_common_utterances.png"
-            }
+class StatisticsView(BaseStatisticsView):
+    authentication_classes = [PublicUserJWTAuthentication]
+    tenant = 'faq_public'
+    status_url = '/public/statistics/status/{job_id}/'
 
-            return Response(response_data, status=status.HTTP_200_OK)
 
-        except Exception as e:
-            # 오류 메시지 로그 출력
-            logger.error(f"오류 발생: {str(e)}")
-            return Response({"status": "error", "message": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+class StatisticsStatusView(BaseStatisticsStatusView):
+    authentication_classes = [PublicUserJWTAuthentication]
+    tenant = 'faq_public'
 
 
 # 요청 사항 등록 API
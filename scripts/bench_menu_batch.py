@@ -0,0 +1,136 @@
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 모듈 경로에 추가하고 Django 설정 (DJANGO_SETTINGS_MODULE, 기본값 faq_backend.settings)
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'faq_backend.settings')
+
+import django
+django.setup()
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from faq.models import Menu, Store
+from faq.serializers import MenuSerializer
+from faq.views import MenuListView
+
+
+# 기존 MenuListView의 방식: 메뉴마다 스토어와 메뉴를 조회하고 저장한 뒤 menu_price 전체를 다시 생성
+def legacy_update_menu_price_field(store):
+    menus = Menu.objects.filter(store=store)
+    store.menu_price = json.dumps([
+        {
+            'name': menu.name, 'price': float(menu.price), 'category': menu.category,
+            'image': str(menu.image.url) if menu.image else None,
+            'allergy': menu.allergy if menu.allergy is not None else "",
+        }
+        for menu in menus
+    ], ensure_ascii=False)
+    store.save()
+
+
+def legacy_create(user, menus):
+    for menu_data in menus:
+        store = Store.objects.get(slug=menu_data['slug'], user=user)
+        last_menu = Menu.objects.filter(store=store).order_by('-menu_number').first()
+        menu_data = dict(menu_data, store=store.store_id, menu_number=last_menu.menu_number + 1 if last_menu else 1)
+        serializer = MenuSerializer(data=menu_data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+    legacy_update_menu_price_field(store)
+
+
+def legacy_update(user, menus):
+    for menu_data in menus:
+        store = Store.objects.get(slug=menu_data['slug'], user=user)
+        menu = Menu.objects.get(store=store, menu_number=menu_data['menu_number'])
+        serializer = MenuSerializer(menu, data=menu_data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+    legacy_update_menu_price_field(store)
+
+
+def legacy_delete(user, menus):
+    for menu_data in menus:
+        store = Store.objects.get(slug=menu_data['slug'], user=user)
+        Menu.objects.get(store=store, menu_number=menu_data['menu_number']).delete()
+    legacy_update_menu_price_field(store)
+
+
+# 200개 메뉴의 menus[i][필드]는 기본 DATA_UPLOAD_MAX_NUMBER_FIELDS(1000)를 넘을 수 있으므로 측정 중에는 제한 해제
+@override_settings(DATA_UPLOAD_MAX_NUMBER_FIELDS=None)
+def batched(user, action, menus):
+    # 다중 메뉴 요청과 같은 menus[i][필드] 형식으로 MenuListView 호출
+    data = {'action': action}
+    if action == 'delete':
+        data['menus'] = menus
+        request = APIRequestFactory().post('/api/menu-details/', data, format='json')
+    else:
+        for index, menu_data in enumerate(menus):
+            for key, value in menu_data.items():
+                data[f'menus[{index}][{key}]'] = value
+        request = APIRequestFactory().post('/api/menu-details/', data)
+    force_authenticate(request, user=user)
+    response = MenuListView.as_view()(request)
+    assert response.status_code < 300, response.data
+
+
+def measure(func, *args):
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+    return elapsed, len(queries)
+
+
+def run(store, count, legacy):
+    user = store.user
+    new_menus = [
+        {'slug': store.slug, 'name': f'메뉴 {i}', 'price': 1000 + i, 'category': f'카테고리 {i % 8}'}
+        for i in range(count)
+    ]
+    results = []
+    # 측정 후 롤백하여 데이터베이스에 메뉴가 남지 않도록 함
+    with transaction.atomic():
+        before = set(Menu.objects.filter(store=store).values_list('menu_number', flat=True))
+        if legacy:
+            results.append(('create',) + measure(legacy_create, user, [dict(m) for m in new_menus]))
+        else:
+            results.append(('create',) + measure(batched, user, 'create', new_menus))
+
+        numbers = sorted(set(Menu.objects.filter(store=store).values_list('menu_number', flat=True)) - before)
+        updates = [
+            {'slug': store.slug, 'menu_number': n, 'name': f'수정 {n}', 'price': 2000, 'category': '수정'}
+            for n in numbers
+        ]
+        deletes = [{'slug': store.slug, 'menu_number': n} for n in numbers]
+        if legacy:
+            results.append(('update',) + measure(legacy_update, user, updates))
+            results.append(('delete',) + measure(legacy_delete, user, deletes))
+        else:
+            results.append(('update',) + measure(batched, user, 'update', updates))
+            results.append(('delete',) + measure(batched, user, 'delete', deletes))
+        transaction.set_rollback(True)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='메뉴 일괄 생성/수정/삭제 성능 측정')
+    parser.add_argument('--count', type=int, default=200, help='한 번에 요청하는 메뉴 수')
+    parser.add_argument('--store-id', type=int, help='측정에 사용할 매장 ID (기본값: 첫 번째 매장)')
+    args = parser.parse_args()
+
+    store = Store.objects.get(store_id=args.store_id) if args.store_id else Store.objects.first()
+    if store is None:
+        sys.exit("측정에 사용할 매장이 없습니다.")
+
+    print(f"{'방식':<10}{'작업':<8}{'메뉴 수':>8}{'쿼리 수':>10}{'소요 시간(s)':>15}")
+    for name, legacy in (('legacy', True), ('batched', False)):
+        for action, elapsed, queries in run(store, args.count, legacy):
+            print(f"{name:<10}{action:<8}{args.count:>8}{queries:>10}{elapsed:>15.3f}")
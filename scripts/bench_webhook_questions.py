@@ -0,0 +1,55 @@
+import sys
+import json
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# 프로젝트 루트를 모듈 경로에 추가 (faq_common.merged_csv는 Django 설정 없이 import 가능)
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+
+from faq_common.merged_csv import build_question_rows, extract_questions
+
+# 측정할 질문 수와 webhook_questionlog 행당 질문 수
+SIZES = [1000, 10000, 100000]
+LEGACY_SIZES = [1000, 2000, 4000]  # 기존 방식은 이차 시간이 걸리므로 작은 크기만 측정
+QUESTIONS_PER_ROW = 100
+
+
+def make_webhook_data(total_questions):
+    rows = []
+    for start in range(0, total_questions, QUESTIONS_PER_ROW):
+        count = min(QUESTIONS_PER_ROW, total_questions - start)
+        questions = [{"question": f"질문 {start + i}"} for i in range(count)]
+        rows.append({"id": len(rows) + 1, "questions": json.dumps(questions, ensure_ascii=False)})
+    return pd.DataFrame(rows)
+
+
+# 기존 merge_csv_files의 방식: 질문마다 전체 DataFrame을 복사하여 이어 붙임
+def legacy_question_rows(webhook_data, agent_id):
+    merged_df = pd.DataFrame(columns=['agent_id', 'user_utterances'])
+    for questions_json in webhook_data['questions']:
+        for question in extract_questions(questions_json):
+            new_row = {'agent_id': agent_id, 'user_utterances': question}
+            merged_df = pd.concat([merged_df, pd.DataFrame([new_row])], ignore_index=True)
+    return merged_df
+
+
+def measure(func, webhook_data):
+    start = time.perf_counter()
+    result = func(webhook_data, 'agent')
+    return time.perf_counter() - start, len(result)
+
+
+if __name__ == '__main__':
+    # 질문당 소요 시간이 크기와 관계없이 일정하면 선형 확장
+    print(f"{'방식':<10}{'질문 수':>10}{'소요 시간(s)':>15}{'질문당(us)':>12}")
+
+    for size in LEGACY_SIZES:
+        elapsed, rows = measure(legacy_question_rows, make_webhook_data(size))
+        print(f"{'legacy':<10}{rows:>10}{elapsed:>15.4f}{elapsed / rows * 1e6:>12.2f}")
+
+    for size in SIZES:
+        elapsed, rows = measure(build_question_rows, make_webhook_data(size))
+        print(f"{'batched':<10}{rows:>10}{elapsed:>15.4f}{elapsed / rows * 1e6:>12.2f}")